@@ -0,0 +1,51 @@
+"""add llm usage
+
+Revision ID: 7c1d4e2a9b53
+Revises: 3f9c2b7d1e4a
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1d4e2a9b53'
+down_revision: Union[str, Sequence[str], None] = '3f9c2b7d1e4a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('llm_usage',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('message_id', sa.String(length=255), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('session_id', sa.UUID(), nullable=True),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('schema', sa.String(length=100), nullable=False),
+    sa.Column('model', sa.String(length=100), nullable=False),
+    sa.Column('calls', sa.Integer(), nullable=False),
+    sa.Column('input_tokens', sa.BigInteger(), nullable=False),
+    sa.Column('output_tokens', sa.BigInteger(), nullable=False),
+    sa.Column('cached_tokens', sa.BigInteger(), nullable=False),
+    sa.Column('images', sa.Integer(), nullable=False),
+    sa.Column('latency_ms', sa.Numeric(precision=12, scale=1), nullable=False),
+    sa.Column('cost_usd', sa.Numeric(precision=12, scale=6), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['session_id'], ['sessions.id'], name=op.f('fk_llm_usage_session_id_sessions')),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('fk_llm_usage_user_id_users')),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_llm_usage'))
+    )
+    op.create_index('ix_llm_usage_day', 'llm_usage', ['day'], unique=False)
+    op.create_index('ix_llm_usage_session_id', 'llm_usage', ['session_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_llm_usage_session_id', table_name='llm_usage')
+    op.drop_index('ix_llm_usage_day', table_name='llm_usage')
+    op.drop_table('llm_usage')
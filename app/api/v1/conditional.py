@@ -0,0 +1,70 @@
+"""Conditional GET support for session-scoped endpoints.
+
+Responses carry an ``ETag`` derived from the session change version (see
+``app.database.versioning``). Clients that send it back in ``If-None-Match``
+get ``304 Not Modified`` after a single version lookup, before the endpoint
+runs its queries.
+"""
+
+import uuid
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.versioning import get_session_version
+from app.routers.deps import get_read_db
+
+
+def session_etag(session_id: uuid.UUID, version: int) -> str:
+    """Build the ETag of a session at a given change version."""
+    return f'W/"{session_id}-{version}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    # Weak comparison: W/"x" and "x" match
+    return "*" in candidates or etag in candidates or etag.removeprefix("W/") in candidates
+
+
+async def check_session_etag(
+    session_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+) -> None:
+    """Answer with 304 if the client already has the current session version.
+
+    Use as a route dependency on endpoints whose response only depends on the
+    state of one session.
+
+    Args:
+        session_id: Session UUID from the path
+        request: Incoming request
+        response: Response, used for the ETag header
+        db: Database session
+
+    Raises:
+        HTTPException: 404 if the session does not exist, 304 if not modified
+
+    Example:
+        ```python
+        @router.get("/{session_id}", dependencies=[Depends(check_session_etag)])
+        async def get_session(session_id: uuid.UUID, ...):
+            ...
+        ```
+    """
+    try:
+        session_uuid = uuid.UUID(session_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid session ID format")
+
+    version = await get_session_version(db, session_uuid)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    etag = session_etag(session_uuid, version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
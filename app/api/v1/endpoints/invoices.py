@@ -2,39 +2,42 @@
 
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.crud import invoice_crud
-from app.routers.deps import get_db
+from app.api.v1.conditional import check_session_etag
+from app.api.v1.pagination import PaginationParams, paginated
+from app.api.v1.schemas import InvoiceOut
+from app.routers.deps import get_read_db
 
 router = APIRouter()
 
 
-@router.get("/")
+@router.get("/", response_model=list[InvoiceOut])
 async def get_invoices(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all invoices with pagination.
 
     Args:
-        skip: Number of records to skip
-        limit: Maximum number of records to return
+        response: Response, used for pagination headers
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of invoices
     """
-    invoices = await invoice_crud.get_multi(db, skip=skip, limit=limit)
-    return invoices
+    invoices = await invoice_crud.get_page(db, **pagination.as_kwargs())
+    return paginated(response, invoices)
 
 
-@router.get("/{invoice_id}")
+@router.get("/{invoice_id}", response_model=InvoiceOut)
 async def get_invoice(
     invoice_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get an invoice by ID.
 
@@ -54,54 +57,70 @@ async def get_invoice(
     return invoice
 
 
-@router.get("/payer/{payer_id}")
+@router.get("/payer/{payer_id}", response_model=list[InvoiceOut])
 async def get_invoices_by_payer(
+    response: Response,
     payer_id: int,
-    db: AsyncSession = Depends(get_db),
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get invoices by payer ID.
 
     Args:
+        response: Response, used for pagination headers
         payer_id: Payer's user ID
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of invoices paid by the user
     """
-    invoices = await invoice_crud.get_by_payer(db, payer_id)
-    return invoices
+    invoices = await invoice_crud.get_by_payer(db, payer_id, **pagination.as_kwargs())
+    return paginated(response, invoices)
 
 
-@router.get("/session/{session_id}")
+@router.get(
+    "/session/{session_id}",
+    response_model=list[InvoiceOut],
+    dependencies=[Depends(check_session_etag)],
+)
 async def get_invoices_by_session(
+    response: Response,
     session_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get invoices by session ID.
 
     Args:
+        response: Response, used for pagination headers
         session_id: Session UUID
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of invoices for the session
     """
-    invoices = await invoice_crud.get_by_session(db, session_id)
-    return invoices
+    invoices = await invoice_crud.get_by_session(db, session_id, **pagination.as_kwargs())
+    return paginated(response, invoices)
 
 
-@router.get("/pending/all")
+@router.get("/pending/all", response_model=list[InvoiceOut])
 async def get_pending_invoices(
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all invoices with pending amounts.
 
     Args:
+        response: Response, used for pagination headers
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of invoices with pending_amount > 0
     """
-    invoices = await invoice_crud.get_pending_invoices(db)
-    return invoices
+    invoices = await invoice_crud.get_pending_invoices(db, **pagination.as_kwargs())
+    return paginated(response, invoices)
 
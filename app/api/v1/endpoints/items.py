@@ -1,73 +1,43 @@
 """Item endpoints."""
 
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from decimal import Decimal
 
 from app.database.crud import item_crud
-from app.routers.deps import get_db
+from app.api.v1.conditional import check_session_etag
+from app.api.v1.pagination import PaginationParams, paginated
+from app.api.v1.schemas import ItemOut
+from app.routers.deps import get_read_db
 
 router = APIRouter()
 
 
-def serialize_item(item) -> dict:
-    """Serialize an Item model to a dictionary.
-    
-    Args:
-        item: Item SQLAlchemy model instance
-        
-    Returns:
-        Dictionary representation of the item
-    """
-    result = {
-        "id": item.id,
-        "invoice_id": item.invoice_id,
-        "debtor_id": item.debtor_id,
-        "unit_price": float(item.unit_price) if isinstance(item.unit_price, Decimal) else item.unit_price,
-        "paid_amount": float(item.paid_amount) if isinstance(item.paid_amount, Decimal) else item.paid_amount,
-        "tip": float(item.tip) if isinstance(item.tip, Decimal) else item.tip,
-        "total": float(item.total) if isinstance(item.total, Decimal) else item.total,
-        "is_paid": item.is_paid,
-        "payment_id": item.payment_id,
-        "description": getattr(item, "description", None),
-    }
-    
-    # Include debtor if loaded, but only basic fields to avoid circular references
-    if hasattr(item, "debtor") and item.debtor:
-        result["debtor"] = {
-            "id": item.debtor.id,
-            "name": item.debtor.name,
-            "phone_number": item.debtor.phone_number,
-        }
-    
-    return result
-
 
-@router.get("/")
+@router.get("/", response_model=list[ItemOut])
 async def get_items(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all items with pagination.
 
     Args:
-        skip: Number of records to skip
-        limit: Maximum number of records to return
+        response: Response, used for pagination headers
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of items
     """
-    items = await item_crud.get_multi(db, skip=skip, limit=limit)
-    return items
+    items = await item_crud.get_page(db, **pagination.as_kwargs())
+    return paginated(response, items)
 
 
-@router.get("/{item_id}")
+@router.get("/{item_id}", response_model=ItemOut)
 async def get_item(
     item_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get an item by ID.
 
@@ -87,85 +57,109 @@ async def get_item(
     return item
 
 
-@router.get("/invoice/{invoice_id}")
+@router.get("/invoice/{invoice_id}", response_model=list[ItemOut])
 async def get_items_by_invoice(
+    response: Response,
     invoice_id: int,
-    db: AsyncSession = Depends(get_db),
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get items by invoice ID.
 
     Args:
+        response: Response, used for pagination headers
         invoice_id: Invoice ID
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of items for the invoice
     """
-    items = await item_crud.get_by_invoice(db, invoice_id)
-    return [serialize_item(item) for item in items]
+    items = await item_crud.get_by_invoice(db, invoice_id, **pagination.as_kwargs())
+    return paginated(response, items)
 
 
-@router.get("/debtor/{debtor_id}")
+@router.get("/debtor/{debtor_id}", response_model=list[ItemOut])
 async def get_items_by_debtor(
+    response: Response,
     debtor_id: int,
-    db: AsyncSession = Depends(get_db),
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get items by debtor ID.
 
     Args:
+        response: Response, used for pagination headers
         debtor_id: Debtor's user ID
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of items where the user is the debtor
     """
-    items = await item_crud.get_by_debtor(db, debtor_id)
-    return items
+    items = await item_crud.get_by_debtor(db, debtor_id, **pagination.as_kwargs())
+    return paginated(response, items)
 
 
-@router.get("/unpaid/all")
+@router.get("/unpaid/all", response_model=list[ItemOut])
 async def get_unpaid_items(
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all unpaid items.
 
     Args:
+        response: Response, used for pagination headers
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of unpaid items
     """
-    items = await item_crud.get_unpaid_items(db)
-    return items
+    items = await item_crud.get_unpaid_items(db, **pagination.as_kwargs())
+    return paginated(response, items)
 
 
-@router.get("/payment/{payment_id}")
+@router.get("/payment/{payment_id}", response_model=list[ItemOut])
 async def get_items_by_payment(
+    response: Response,
     payment_id: int,
-    db: AsyncSession = Depends(get_db),
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get items by payment ID.
 
     Args:
+        response: Response, used for pagination headers
         payment_id: Payment ID
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of items associated with the payment
     """
-    items = await item_crud.get_by_payment(db, payment_id)
-    return items
+    items = await item_crud.get_by_payment(db, payment_id, **pagination.as_kwargs())
+    return paginated(response, items)
 
 
-@router.get("/session/{session_id}")
+@router.get(
+    "/session/{session_id}",
+    response_model=list[ItemOut],
+    dependencies=[Depends(check_session_etag)],
+)
 async def get_items_by_session(
+    response: Response,
     session_id: str,
-    db: AsyncSession = Depends(get_db),
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get items by session ID.
 
     Args:
+        response: Response, used for pagination headers
         session_id: Session UUID
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
@@ -176,6 +170,6 @@ async def get_items_by_session(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid session ID format")
     
-    items = await item_crud.get_by_session(db, session_uuid)
-    return [serialize_item(item) for item in items]
+    items = await item_crud.get_by_session(db, session_uuid, **pagination.as_kwargs())
+    return paginated(response, items)
 
@@ -0,0 +1,64 @@
+"""LLM usage endpoints."""
+
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.schemas import LLMUsageOut
+from app.database.sql.llm_usage import get_daily_llm_usage, get_session_llm_usage
+from app.database.versioning import get_session_version
+from app.routers.deps import get_read_db
+
+router = APIRouter()
+
+MAX_DAILY_RANGE_DAYS = 366
+
+
+@router.get("/daily", response_model=list[LLMUsageOut])
+async def get_daily_usage(
+    start: date | None = None,
+    end: date | None = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get LLM usage per day, output schema and model.
+
+    Args:
+        start: First day, inclusive (default: 30 days before ``end``)
+        end: Last day, inclusive (default: today, UTC)
+        db: Database session
+
+    Returns:
+        Daily usage rollups
+
+    Raises:
+        HTTPException: If the range is reversed or longer than a year
+    """
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=30)
+    if start > end or (end - start).days > MAX_DAILY_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Invalid range, at most {MAX_DAILY_RANGE_DAYS} days")
+    return await get_daily_llm_usage(db, start, end)
+
+
+@router.get("/sessions/{session_id}", response_model=list[LLMUsageOut])
+async def get_session_usage(
+    session_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get the LLM usage of a session per output schema and model.
+
+    Args:
+        session_id: Session UUID
+        db: Database session
+
+    Returns:
+        Session usage rollups
+
+    Raises:
+        HTTPException: If session not found
+    """
+    if await get_session_version(db, session_id) is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return await get_session_llm_usage(db, session_id)
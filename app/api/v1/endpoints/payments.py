@@ -1,38 +1,40 @@
 """Payment endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.crud import payment_crud
-from app.routers.deps import get_db
+from app.api.v1.pagination import PaginationParams, paginated
+from app.api.v1.schemas import PaymentOut
+from app.routers.deps import get_read_db
 
 router = APIRouter()
 
 
-@router.get("/")
+@router.get("/", response_model=list[PaymentOut])
 async def get_payments(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all payments with pagination.
 
     Args:
-        skip: Number of records to skip
-        limit: Maximum number of records to return
+        response: Response, used for pagination headers
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of payments
     """
-    payments = await payment_crud.get_multi(db, skip=skip, limit=limit)
-    return payments
+    payments = await payment_crud.get_page(db, **pagination.as_kwargs())
+    return paginated(response, payments)
 
 
-@router.get("/{payment_id}")
+@router.get("/{payment_id}", response_model=PaymentOut)
 async def get_payment(
     payment_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a payment by ID.
 
@@ -52,58 +54,70 @@ async def get_payment(
     return payment
 
 
-@router.get("/payer/{payer_id}")
+@router.get("/payer/{payer_id}", response_model=list[PaymentOut])
 async def get_payments_by_payer(
+    response: Response,
     payer_id: int,
-    db: AsyncSession = Depends(get_db),
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get payments by payer ID.
 
     Args:
+        response: Response, used for pagination headers
         payer_id: Payer's user ID
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of payments made by the user
     """
-    payments = await payment_crud.get_by_payer(db, payer_id)
-    return payments
+    payments = await payment_crud.get_by_payer(db, payer_id, **pagination.as_kwargs())
+    return paginated(response, payments)
 
 
-@router.get("/receiver/{receiver_id}")
+@router.get("/receiver/{receiver_id}", response_model=list[PaymentOut])
 async def get_payments_by_receiver(
+    response: Response,
     receiver_id: int,
-    db: AsyncSession = Depends(get_db),
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get payments by receiver ID.
 
     Args:
+        response: Response, used for pagination headers
         receiver_id: Receiver's user ID
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of payments received by the user
     """
-    payments = await payment_crud.get_by_receiver(db, receiver_id)
-    return payments
+    payments = await payment_crud.get_by_receiver(db, receiver_id, **pagination.as_kwargs())
+    return paginated(response, payments)
 
 
-@router.get("/between/{payer_id}/{receiver_id}")
+@router.get("/between/{payer_id}/{receiver_id}", response_model=list[PaymentOut])
 async def get_payments_between_users(
+    response: Response,
     payer_id: int,
     receiver_id: int,
-    db: AsyncSession = Depends(get_db),
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get payments between two users.
 
     Args:
+        response: Response, used for pagination headers
         payer_id: Payer's user ID
         receiver_id: Receiver's user ID
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of payments between the two users
     """
-    payments = await payment_crud.get_between_users(db, payer_id, receiver_id)
-    return payments
+    payments = await payment_crud.get_between_users(db, payer_id, receiver_id, **pagination.as_kwargs())
+    return paginated(response, payments)
 
@@ -1,41 +1,57 @@
 """Session endpoints."""
 
 import uuid
+from collections.abc import AsyncGenerator
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.core.events import event_broker
+from app.database import db_manager
 from app.database.crud import session_crud
 from app.database.models.session import SessionStatus
-from app.routers.deps import get_db
+from app.api.v1.conditional import check_session_etag
+from app.api.v1.export import ExportFormat, export_response
+from app.api.v1.pagination import PaginationParams, paginated
+from app.api.v1.schemas import SessionOut, SessionOverviewOut
+from app.database.sql.export import session_export_statement
+from app.database.sql.session_overview import get_session_overview
+from app.database.versioning import get_session_version
+from app.routers.deps import get_read_db
 
 router = APIRouter()
 
 
-@router.get("/")
+@router.get("/", response_model=list[SessionOut])
 async def get_sessions(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all sessions with pagination.
 
     Args:
-        skip: Number of records to skip
-        limit: Maximum number of records to return
+        response: Response, used for pagination headers
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of sessions
     """
-    sessions = await session_crud.get_multi(db, skip=skip, limit=limit)
-    return sessions
+    sessions = await session_crud.get_page(db, **pagination.as_kwargs())
+    return paginated(response, sessions)
 
 
-@router.get("/{session_id}")
+@router.get(
+    "/{session_id}",
+    response_model=SessionOut,
+    dependencies=[Depends(check_session_etag)],
+)
 async def get_session(
     session_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a session by ID.
 
@@ -55,54 +71,177 @@ async def get_session(
     return session
 
 
-@router.get("/owner/{owner_id}")
+@router.get(
+    "/{session_id}/overview",
+    response_model=SessionOverviewOut,
+    dependencies=[Depends(check_session_etag)],
+)
+async def get_overview(
+    session_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get a session with its participants, invoices, items, payments and balances.
+
+    Replaces the separate session, invoices, items and users calls a session
+    page needs, using a fixed number of queries.
+
+    Args:
+        session_id: Session UUID
+        db: Database session
+
+    Returns:
+        Session overview
+
+    Raises:
+        HTTPException: If session not found
+    """
+    overview = await get_session_overview(db, session_id)
+    if overview is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return overview
+
+
+@router.get("/{session_id}/events", response_class=StreamingResponse)
+async def stream_session_events(
+    session_id: uuid.UUID,
+    request: Request,
+):
+    """Stream live session updates as Server-Sent Events.
+
+    Emits ``invoice_created``, ``item_assigned``, ``payment_processed``,
+    ``member_joined`` and ``session_closed`` events, plus ``resync`` when the
+    client fell behind and should refetch. A comment line is sent every
+    ``EVENTS_HEARTBEAT_SECONDS`` to keep idle connections open.
+
+    Args:
+        session_id: Session UUID
+        request: Incoming request
+
+    Returns:
+        ``text/event-stream`` response
+
+    Raises:
+        HTTPException: If session not found
+    """
+    # Short-lived session: a request-scoped one would hold a pooled
+    # connection for as long as the stream stays open
+    async with db_manager.read_sessionmaker(request.headers.get("X-User-Phone"), session_id)() as db:
+        if await get_session_version(db, session_id) is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+
+    return StreamingResponse(
+        _session_event_stream(request, session_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _session_event_stream(request: Request, session_id: uuid.UUID) -> AsyncGenerator[str]:
+    subscription = event_broker.subscribe(session_id)
+    try:
+        yield "retry: 5000\n\n"
+        while not await request.is_disconnected():
+            event = await subscription.get(timeout=settings.EVENTS_HEARTBEAT_SECONDS)
+            if event is None:
+                yield ": heartbeat\n\n"
+                continue
+            yield f"event: {event.type}\ndata: {event.model_dump_json()}\n\n"
+    finally:
+        event_broker.unsubscribe(subscription)
+
+
+@router.get("/{session_id}/export", response_class=StreamingResponse)
+async def export_session(
+    session_id: uuid.UUID,
+    request: Request,
+    format: ExportFormat = "ndjson",
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Export every item of a session with its invoice and debtor.
+
+    Args:
+        session_id: Session UUID
+        request: Incoming request
+        format: ``ndjson`` (default) or ``csv``
+        db: Database session
+
+    Returns:
+        Streaming NDJSON or CSV response
+
+    Raises:
+        HTTPException: If session not found
+    """
+    if await get_session_version(db, session_id) is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return export_response(
+        session_export_statement(session_id),
+        format,
+        filename=f"session-{session_id}",
+        user_key=request.headers.get("X-User-Phone"),
+        session_id=session_id,
+    )
+
+
+@router.get("/owner/{owner_id}", response_model=list[SessionOut])
 async def get_sessions_by_owner(
+    response: Response,
     owner_id: int,
-    db: AsyncSession = Depends(get_db),
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get sessions by owner ID.
 
     Args:
+        response: Response, used for pagination headers
         owner_id: Owner's user ID
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of sessions owned by the user
     """
-    sessions = await session_crud.get_by_owner(db, owner_id)
-    return sessions
+    sessions = await session_crud.get_by_owner(db, owner_id, **pagination.as_kwargs())
+    return paginated(response, sessions)
 
 
-@router.get("/status/{status}")
+@router.get("/status/{status}", response_model=list[SessionOut])
 async def get_sessions_by_status(
+    response: Response,
     status: SessionStatus,
-    db: AsyncSession = Depends(get_db),
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get sessions by status.
 
     Args:
+        response: Response, used for pagination headers
         status: Session status (active or closed)
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of sessions with the specified status
     """
-    sessions = await session_crud.get_by_status(db, status)
-    return sessions
+    sessions = await session_crud.get_by_status(db, status, **pagination.as_kwargs())
+    return paginated(response, sessions)
 
 
-@router.get("/active/all")
+@router.get("/active/all", response_model=list[SessionOut])
 async def get_active_sessions(
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all active sessions.
 
     Args:
+        response: Response, used for pagination headers
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of active sessions
     """
-    sessions = await session_crud.get_active_sessions(db)
-    return sessions
+    sessions = await session_crud.get_active_sessions(db, **pagination.as_kwargs())
+    return paginated(response, sessions)
 
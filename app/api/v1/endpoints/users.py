@@ -1,38 +1,43 @@
 """User endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.crud import user_crud
-from app.routers.deps import get_db
+from app.database.sql.export import user_export_statement
+from app.api.v1.export import ExportFormat, export_response
+from app.api.v1.pagination import PaginationParams, paginated
+from app.api.v1.schemas import UserOut
+from app.routers.deps import get_read_db
 
 router = APIRouter()
 
 
-@router.get("/")
+@router.get("/", response_model=list[UserOut])
 async def get_users(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all users with pagination.
 
     Args:
-        skip: Number of records to skip
-        limit: Maximum number of records to return
+        response: Response, used for pagination headers
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of users
     """
-    users = await user_crud.get_multi(db, skip=skip, limit=limit)
-    return users
+    users = await user_crud.get_page(db, **pagination.as_kwargs())
+    return paginated(response, users)
 
 
-@router.get("/{user_id}")
+@router.get("/{user_id}", response_model=UserOut)
 async def get_user(
     user_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a user by ID.
 
@@ -52,10 +57,42 @@ async def get_user(
     return user
 
 
-@router.get("/phone/{phone_number}")
+@router.get("/{user_id}/export", response_class=StreamingResponse)
+async def export_user(
+    user_id: int,
+    request: Request,
+    format: ExportFormat = "ndjson",
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Export every item a user consumed or paid for, across all sessions.
+
+    Args:
+        user_id: User ID
+        request: Incoming request
+        format: ``ndjson`` (default) or ``csv``
+        db: Database session
+
+    Returns:
+        Streaming NDJSON or CSV response
+
+    Raises:
+        HTTPException: If user not found
+    """
+    user = await user_crud.get(db, id=user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return export_response(
+        user_export_statement(user_id),
+        format,
+        filename=f"user-{user_id}",
+        user_key=request.headers.get("X-User-Phone"),
+    )
+
+
+@router.get("/phone/{phone_number}", response_model=UserOut)
 async def get_user_by_phone(
     phone_number: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a user by phone number.
 
@@ -75,20 +112,24 @@ async def get_user_by_phone(
     return user
 
 
-@router.get("/search/name/{name}")
+@router.get("/search/name/{name}", response_model=list[UserOut])
 async def get_users_by_name(
+    response: Response,
     name: str,
-    db: AsyncSession = Depends(get_db),
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get users by name (partial match).
 
     Args:
+        response: Response, used for pagination headers
         name: User's name (partial match)
+        pagination: Cursor, page size and total count options
         db: Database session
 
     Returns:
         List of users matching the name
     """
-    users = await user_crud.get_by_name(db, name)
-    return users
+    users = await user_crud.get_by_name(db, name, **pagination.as_kwargs())
+    return paginated(response, users)
 
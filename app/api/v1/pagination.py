@@ -0,0 +1,69 @@
+"""Keyset pagination helpers for list endpoints.
+
+List endpoints keep returning a JSON array; pagination metadata travels in
+response headers so existing clients keep working:
+
+- ``X-Next-Cursor``: pass it back as ``?cursor=`` to get the next page (absent on the last page)
+- ``X-Total-Count``: number of matching records, when requested with ``?total=exact|estimate``
+- ``X-Total-Count-Estimated``: ``true`` when ``X-Total-Count`` is an estimate
+"""
+
+from typing import Any
+
+from fastapi import Query, Response
+
+from app.config import settings
+from app.database.crud.base import Page, TotalMode
+
+PAGINATION_HEADERS = ["X-Next-Cursor", "X-Total-Count", "X-Total-Count-Estimated"]
+
+
+class PaginationParams:
+    """Query parameters shared by all list endpoints.
+
+    Example:
+        ```python
+        @router.get("/")
+        async def get_items(response: Response, pagination: PaginationParams = Depends(), ...):
+            items = await item_crud.get_page(db, **pagination.as_kwargs())
+            return paginated(response, items)
+        ```
+    """
+
+    def __init__(
+        self,
+        cursor: str | None = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+        limit: int = Query(
+            settings.API_DEFAULT_PAGE_SIZE,
+            ge=1,
+            le=settings.API_MAX_PAGE_SIZE,
+            description="Maximum number of records to return",
+        ),
+        total: TotalMode | None = Query(None, description="Return the number of matching records in X-Total-Count"),
+    ) -> None:
+        """Initialize pagination parameters from the query string."""
+        self.cursor = cursor
+        self.limit = limit
+        self.total = total
+
+    def as_kwargs(self) -> dict[str, Any]:
+        """Get the parameters as keyword arguments for CRUD list methods."""
+        return {"cursor": self.cursor, "limit": self.limit, "total": self.total}
+
+
+def paginated(response: Response, page: Page) -> Page:
+    """Set pagination headers for a page and return it.
+
+    Args:
+        response: Response of the current request
+        page: Page returned by a CRUD list method
+
+    Returns:
+        The same page, to be returned by the endpoint
+    """
+    if page.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    if page.total is not None:
+        response.headers["X-Total-Count"] = str(page.total)
+        response.headers["X-Total-Count-Estimated"] = "true" if page.total_is_estimate else "false"
+    return page
@@ -5,6 +5,7 @@ from fastapi import APIRouter
 from app.api.v1.endpoints import (
     invoices,
     items,
+    llm_usage,
     payments,
     sessions,
     users,
@@ -17,4 +18,4 @@ api_router.include_router(sessions.router, prefix="/sessions", tags=["Sessions"]
 api_router.include_router(invoices.router, prefix="/invoices", tags=["Invoices"])
 api_router.include_router(items.router, prefix="/items", tags=["Items"])
 api_router.include_router(payments.router, prefix="/payments", tags=["Payments"])
-
+api_router.include_router(llm_usage.router, prefix="/llm-usage", tags=["LLM Usage"])
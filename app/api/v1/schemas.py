@@ -0,0 +1,132 @@
+"""Response schemas for the REST API.
+
+Endpoints declare these as ``response_model`` so FastAPI validates ORM objects
+with ``from_attributes`` and serializes them straight to JSON bytes in
+pydantic-core, instead of walking them with ``jsonable_encoder``.
+
+Monetary ``Numeric`` columns are exposed as floats, as the API always did.
+"""
+
+import uuid
+from datetime import date
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.database.models.item import Item
+from app.database.models.session import SessionStatus
+
+
+class APIModel(BaseModel):
+    """Base class for response schemas built from ORM objects."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UserOut(APIModel):
+    """User as returned by the API."""
+
+    id: int
+    name: str
+    phone_number: str
+
+
+class SessionOut(APIModel):
+    """Session as returned by the API."""
+
+    id: uuid.UUID
+    description: str | None
+    owner_id: int
+    status: SessionStatus
+
+
+class InvoiceOut(APIModel):
+    """Invoice as returned by the API."""
+
+    id: int
+    description: str | None
+    total: float
+    pending_amount: float
+    payer_id: int
+    session_id: uuid.UUID
+
+
+class ItemOut(APIModel):
+    """Item as returned by the API.
+
+    ``debtor`` is only included when the query eagerly loaded it.
+    """
+
+    id: int
+    invoice_id: int
+    debtor_id: int | None
+    unit_price: float
+    paid_amount: float
+    tip: float
+    total: float
+    is_paid: bool
+    payment_id: int | None
+    description: str | None
+    debtor: UserOut | None = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def _skip_unloaded_debtor(cls, data: Any) -> Any:
+        # Touching an unloaded relationship would trigger a lazy load, which
+        # fails outside the async session greenlet. Loaded attributes live in
+        # the instance __dict__, which is much cheaper to check than inspect().
+        if isinstance(data, Item) and "debtor" not in data.__dict__:
+            return {name: getattr(data, name) for name in cls.model_fields if name != "debtor"}
+        return data
+
+
+class PaymentOut(APIModel):
+    """Payment as returned by the API."""
+
+    id: int
+    payer_id: int
+    receiver_id: int
+    amount: float
+
+
+class InvoiceWithItemsOut(InvoiceOut):
+    """Invoice with its items, as returned by the session overview."""
+
+    items: list[ItemOut]
+
+
+class BalanceOut(BaseModel):
+    """Net position of a participant within a session."""
+
+    user_id: int
+    name: str
+    owes: float
+    owed: float
+    balance: float
+
+
+class SessionOverviewOut(BaseModel):
+    """Everything needed to render a session page in a single response."""
+
+    session: SessionOut
+    participants: list[UserOut]
+    invoices: list[InvoiceWithItemsOut]
+    payments: list[PaymentOut]
+    balances: list[BalanceOut]
+
+
+class LLMUsageOut(BaseModel):
+    """LLM usage summed per output schema and model."""
+
+    day: date | None = None
+    session_id: uuid.UUID | None = None
+    schema_name: str = Field(validation_alias="schema", serialization_alias="schema")
+    model: str
+    messages: int
+    calls: int
+    input_tokens: int
+    output_tokens: int
+    cached_tokens: int
+    images: int
+    latency_ms: float
+    cost_usd: float
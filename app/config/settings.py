@@ -1,6 +1,7 @@
 """Application settings using Pydantic Settings."""
 
 import json
+from typing import Literal
 
 from pydantic import PostgresDsn, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -37,6 +38,32 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: PostgresDsn
     DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a pooled connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100  # per connection, 0 disables it
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # 0 disables it
+    DB_APPLICATION_NAME: str = "platanus-api"
+    DB_POOL_CHECKOUT_WARNING_SECONDS: float = 1.0
+    DB_SLOW_QUERY_MS: float = 500.0  # statements slower than this are logged, 0 disables it
+    DB_QUERY_COUNT_WARNING: int = 30  # requests running more statements are flagged as possible N+1, 0 disables it
+    # Optional read replica for read-only API endpoints
+    DATABASE_REPLICA_URL: PostgresDsn | None = None
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0  # reads go to the primary this long after a user's write
+
+    # Caching
+    SESSION_ROSTER_CACHE_TTL: float = 30.0  # seconds, 0 disables the cache
+    SESSION_ROSTER_CACHE_SIZE: int = 1024
+    AGENT_COMMAND_CACHE_TTL: float = 3600.0  # seconds an agent decision is reused for the same command, 0 disables it
+    AGENT_COMMAND_CACHE_SIZE: int = 4096
+
+    # Live session events (Server-Sent Events)
+    EVENTS_BACKEND: Literal["memory", "postgres"] = "memory"  # postgres fans out across workers with LISTEN/NOTIFY
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    EVENTS_QUEUE_SIZE: int = 100  # events buffered per connection before it is asked to resync
+    EVENTS_RECONNECT_MIN_SECONDS: float = 1.0  # first wait before reconnecting a lost LISTEN connection
+    EVENTS_RECONNECT_MAX_SECONDS: float = 30.0  # the wait doubles after each failed attempt up to this
 
     # Security
     SECRET_KEY: str
@@ -46,8 +73,42 @@ class Settings(BaseSettings):
     # Google Gemini API
     GEMINI_API_KEY: str | None = None
 
+    # Outbound HTTP (shared pooled client) and image downloads
+    HTTP_CLIENT_TIMEOUT: float = 30.0  # seconds
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    IMAGE_MAX_BYTES: int = 10 * 1024 * 1024  # larger images are rejected without being fully downloaded
+
+    # Worker pool for CPU-bound work (local OCR), see app/core/executor.py
+    CPU_POOL_KIND: Literal["process", "thread"] = "process"
+    CPU_POOL_WORKERS: int = 2
+    CPU_POOL_MAX_QUEUE: int = 32  # tasks waiting for a worker
+    CPU_POOL_QUEUE_TIMEOUT: float = 10.0  # seconds a task waits for room in the queue
+
+    # Local OCR pre-pass with Tesseract (pip install .[ocr]), see app/services/local_ocr.py
+    LOCAL_OCR_ENABLED: bool = False
+    LOCAL_OCR_LANGUAGE: str = "spa"
+    LOCAL_OCR_TIMEOUT: float = 10.0  # seconds before falling back to the vision model
+
     # OpenAI API
     OPENAI_API_KEY: str | None = None
+    OPENAI_BASE_URL: str | None = None  # OpenAI-compatible endpoint, e.g. the load test's fake LLM server
+
+    # LLM cost accounting: USD per million tokens as [input, output, cached input]
+    LLM_PRICES_PER_MILLION_TOKENS: dict[str, list[float]] = {"gpt-4o-mini": [0.15, 0.60, 0.075]}
+
+    # LLM record/replay: "off", "record", "replay" (no network) or "auto" (replay, record missing)
+    LLM_FIXTURES_MODE: Literal["off", "record", "replay", "auto"] = "off"
+    LLM_FIXTURES_DIR: str = "tests/fixtures/llm"
+
+    # LLM call gate, per model and worker process (app/services/llm_gate.py)
+    LLM_MAX_CONCURRENT_CALLS: int = 16  # in-flight calls per model, 0 disables the limit
+    LLM_QUEUE_TIMEOUT: float = 10.0  # seconds a call may wait for a slot before failing
+    LLM_REQUESTS_PER_MINUTE: dict[str, float] = {"gpt-4o-mini": 500.0}  # models not listed are not rate limited
+    LLM_CIRCUIT_FAILURE_RATIO: float = 0.5  # provider failures that open the circuit, 0 disables it
+    LLM_CIRCUIT_MIN_CALLS: int = 10  # calls in the window before the ratio is considered
+    LLM_CIRCUIT_WINDOW: float = 60.0  # seconds of calls the failure ratio is computed over
+    LLM_CIRCUIT_COOLDOWN: float = 30.0  # seconds the circuit stays open before a probe call
 
     # CORS
     BACKEND_CORS_ORIGINS: list[str] | str = []
@@ -64,6 +125,27 @@ class Settings(BaseSettings):
             return v
         raise ValueError(v)
 
+    # API pagination
+    API_DEFAULT_PAGE_SIZE: int = 100
+    API_MAX_PAGE_SIZE: int = 500
+    API_COUNT_ESTIMATE_CAP: int = 10000  # estimated counts stop counting past this many rows
+    EXPORT_BATCH_SIZE: int = 1000  # rows fetched per round trip by streaming exports
+
+    # Response compression (Brotli needs the optional "compression" extra)
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Metrics
+    METRICS_ENABLED: bool = True  # expose Prometheus metrics at /metrics
+
+    # Request profiling (requests signed with X-Profile-Token or sampled)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0  # fraction of unsigned requests profiled
+    PROFILING_INTERVAL_MS: float = 5.0  # milliseconds between stack samples
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_FILES: int = 200  # oldest profiles are deleted beyond this
+
     # API Documentation
     DOCS_URL: str = "/docs"
     REDOC_URL: str = "/redoc"
@@ -82,5 +164,20 @@ class Settings(BaseSettings):
         # If already has a driver specified, return as is
         return url
 
+    @property
+    def database_replica_url_async(self) -> str | None:
+        """Get async read replica URL as string, if configured."""
+        if self.DATABASE_REPLICA_URL is None:
+            return None
+        url = str(self.DATABASE_REPLICA_URL)
+        if url.startswith("postgresql://"):
+            return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+        return url
+
+    @property
+    def database_url_sync(self) -> str:
+        """Get sync (psycopg2) database URL as string."""
+        return str(self.DATABASE_URL).replace("postgresql+asyncpg://", "postgresql://", 1)
+
 
 settings = Settings()  # type: ignore
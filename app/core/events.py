@@ -0,0 +1,238 @@
+"""Publish/subscribe broker for live session events.
+
+Write paths publish a ``SessionEvent`` after committing; every open
+``/api/v1/sessions/{id}/events`` stream subscribed to that session receives it.
+
+Two backends, selected with ``EVENTS_BACKEND``:
+- ``memory``: events are delivered within the current process only
+- ``postgres``: events are sent with ``NOTIFY`` and every worker ``LISTEN``s,
+  so subscribers connected to any worker receive them. If the listening
+  connection drops, the worker delivers events to its own subscribers only
+  and reconnects in the background, waiting ``EVENTS_RECONNECT_MIN_SECONDS``
+  doubling up to ``EVENTS_RECONNECT_MAX_SECONDS`` between attempts; once
+  reconnected, every subscriber gets a ``resync`` event to refetch what it
+  missed meanwhile
+
+Each subscription buffers at most ``EVENTS_QUEUE_SIZE`` events. A subscriber
+that falls behind does not slow down publishers: its buffer is dropped and
+replaced with a single ``resync`` event telling the client to refetch.
+
+Example:
+    ```python
+    await db_session.commit()
+    await publish_session_event(SessionEventType.SESSION_CLOSED, session.id)
+    ```
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import defaultdict
+from typing import Any
+
+import asyncpg
+
+from app.config import settings
+from app.models.events import SessionEvent, SessionEventType
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "session_events"
+
+
+class Subscription:
+    """Bounded queue of events for a single subscriber.
+
+    Args:
+        session_id: Session whose events are delivered
+        maxsize: Maximum number of buffered events
+    """
+
+    def __init__(self, session_id: uuid.UUID, maxsize: int) -> None:
+        """Initialize an empty subscription.
+
+        Args:
+            session_id: Session whose events are delivered
+            maxsize: Maximum number of buffered events
+        """
+        self.session_id = session_id
+        self.dropped = 0
+        self._queue: asyncio.Queue[SessionEvent] = asyncio.Queue(maxsize=max(1, maxsize))
+
+    def deliver(self, event: SessionEvent) -> None:
+        """Buffer an event without blocking the publisher.
+
+        When the buffer is full, the pending events are discarded and replaced
+        with a single ``resync`` event.
+
+        Args:
+            event: Event to deliver
+        """
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += self._queue.qsize() + 1
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(SessionEvent(type=SessionEventType.RESYNC, session_id=self.session_id))
+            logger.warning(f"Subscriber of session {self.session_id} fell behind, {self.dropped} events dropped")
+
+    async def get(self, timeout: float) -> SessionEvent | None:
+        """Wait for the next event.
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            Next event, or None if none arrived within ``timeout``
+        """
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+
+class EventBroker:
+    """Fan-out of session events to subscribers.
+
+    Call ``start()`` on application startup and ``stop()`` on shutdown.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a broker without subscribers."""
+        self._subscribers: dict[uuid.UUID, set[Subscription]] = defaultdict(set)
+        self._connection: asyncpg.Connection | None = None
+        self._connection_lock = asyncio.Lock()
+        self._reconnect_task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Start listening for events of other workers when using the Postgres backend."""
+        if settings.EVENTS_BACKEND != "postgres":
+            return
+        await self._listen()
+
+    async def stop(self) -> None:
+        """Stop listening and close the Postgres connection, if any."""
+        reconnect_task, self._reconnect_task = self._reconnect_task, None
+        if reconnect_task is not None:
+            reconnect_task.cancel()
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            await connection.close()
+
+    async def _listen(self) -> None:
+        connection = await asyncpg.connect(
+            settings.database_url_sync,
+            server_settings={"application_name": f"{settings.DB_APPLICATION_NAME}-events"},
+        )
+        try:
+            await connection.add_listener(NOTIFY_CHANNEL, self._on_notify)
+            connection.add_termination_listener(self._on_terminate)
+        except BaseException:
+            await connection.close()
+            raise
+        self._connection = connection
+        logger.info(f"Listening for session events on channel {NOTIFY_CHANNEL}")
+
+    async def _reconnect(self) -> None:
+        delay = settings.EVENTS_RECONNECT_MIN_SECONDS
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self._listen()
+                break
+            except Exception as e:
+                delay = min(delay * 2, settings.EVENTS_RECONNECT_MAX_SECONDS)
+                logger.warning(f"Could not reconnect session events, retrying in {delay:g}s: {e}")
+        self._reconnect_task = None
+        # Events of other workers published while disconnected were missed
+        for subscribers in list(self._subscribers.values()):
+            for subscription in list(subscribers):
+                subscription.deliver(SessionEvent(type=SessionEventType.RESYNC, session_id=subscription.session_id))
+
+    def subscribe(self, session_id: uuid.UUID) -> Subscription:
+        """Subscribe to the events of a session.
+
+        Args:
+            session_id: Session UUID
+
+        Returns:
+            Subscription; pass it to ``unsubscribe`` when done
+        """
+        subscription = Subscription(session_id, settings.EVENTS_QUEUE_SIZE)
+        self._subscribers[session_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering events to a subscription.
+
+        Args:
+            subscription: Subscription returned by ``subscribe``
+        """
+        subscribers = self._subscribers.get(subscription.session_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.session_id]
+
+    def subscriber_count(self, session_id: uuid.UUID | None = None) -> int:
+        """Number of open subscriptions, optionally for a single session."""
+        if session_id is not None:
+            return len(self._subscribers.get(session_id, ()))
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    async def publish(self, event: SessionEvent) -> None:
+        """Publish an event to every subscriber of its session.
+
+        Args:
+            event: Event to publish
+        """
+        if self._connection is None:
+            self._dispatch(event)
+            return
+        # Delivered back to this worker through the listener, like to all others
+        async with self._connection_lock:
+            await self._connection.execute("SELECT pg_notify($1, $2)", NOTIFY_CHANNEL, event.model_dump_json())
+
+    def _dispatch(self, event: SessionEvent) -> None:
+        for subscription in list(self._subscribers.get(event.session_id, ())):
+            subscription.deliver(event)
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = SessionEvent.model_validate_json(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed session event: {payload[:200]}")
+            return
+        self._dispatch(event)
+
+    def _on_terminate(self, connection: Any) -> None:
+        if connection is not self._connection:
+            return  # closed by stop()
+        # Degrade to in-process delivery rather than failing every publish
+        logger.error("Session events connection lost, delivering events within this worker only until reconnected")
+        self._connection = None
+        if self._reconnect_task is None:
+            self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+
+async def publish_session_event(event_type: SessionEventType, session_id: uuid.UUID, **data: Any) -> None:
+    """Publish a session event, logging instead of raising on failure.
+
+    Live updates are best effort: a failure must never undo or fail the write
+    that triggered them. Call it after committing.
+
+    Args:
+        event_type: Type of the event
+        session_id: Session UUID
+        **data: Event payload (identifiers and amounts)
+    """
+    try:
+        await event_broker.publish(SessionEvent(type=event_type, session_id=session_id, data=data))
+    except Exception as e:
+        logger.error(f"Error publishing {event_type} event for session {session_id}: {e}")
+
+
+# Global event broker instance
+event_broker = EventBroker()
@@ -0,0 +1,205 @@
+"""Shared worker pool for CPU-bound work.
+
+Long CPU-bound steps of the image pipeline (local OCR) run in one pool per
+worker instead of on the event loop, so other webhooks keep being served
+while a receipt is processed. Short steps such as base64 encoding stay
+inline: shipping the image to a worker process costs more than the work.
+The pool:
+
+- Runs tasks in worker processes (``CPU_POOL_KIND="process"``, the default,
+  as these steps hold the GIL) or threads, ``CPU_POOL_WORKERS`` at a time.
+  Processes are started by a fork server, never forked from the
+  (multi-threaded) app process, where a child could inherit a held lock.
+- Bounds its queue: at most ``CPU_POOL_MAX_QUEUE`` tasks wait for a worker;
+  further callers wait up to ``CPU_POOL_QUEUE_TIMEOUT`` seconds for room and
+  then fail with ``WorkerPoolBusyError``.
+- Records how long each task waited for a worker and how long it ran
+  (``worker_pool_task_seconds``), and adds the total to the message's stage
+  breakdown under the task name.
+
+It is created on first use and stopped with the application.
+
+Example:
+    ```python
+    text = await cpu_pool.run("ocr.local", extract_text, image_content, "spa")
+    ```
+"""
+
+import asyncio
+import concurrent.futures
+import multiprocessing
+import time
+from collections.abc import Callable, Iterator
+from typing import Any, Literal, TypeVar
+
+from app.config import settings
+from app.core.metrics import WORKER_POOL_REJECTIONS, WORKER_POOL_TASK_DURATION, MetricSamples, registry
+from app.core.timing import span
+
+T = TypeVar("T")
+
+PoolKind = Literal["process", "thread"]
+
+
+class WorkerPoolBusyError(RuntimeError):
+    """Raised when a task waited too long for room in the pool's queue.
+
+    Args:
+        pool: Name of the pool
+        task: Name of the rejected task
+    """
+
+    def __init__(self, pool: str, task: str) -> None:
+        """Initialize the error.
+
+        Args:
+            pool: Name of the pool
+            task: Name of the rejected task
+        """
+        super().__init__(f"Worker pool {pool!r} is busy, rejected {task!r}")
+        self.pool = pool
+        self.task = task
+
+
+def _timed_call(fn: Callable[..., T], *args: Any) -> tuple[T, float, float]:
+    """Call a function in a worker, returning its result, start time and duration.
+
+    The start is wall-clock time, comparable across processes.
+    """
+    started_at = time.time()
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, started_at, time.perf_counter() - started
+
+
+class WorkerPool:
+    """Lazily created executor with a bounded queue and per-task timing.
+
+    Args:
+        name: Pool name, used in metrics
+        kind: "process" or "thread" workers
+        max_workers: Number of workers
+        max_queue: Tasks allowed to wait for a worker
+        queue_timeout: Seconds a caller waits for room in the queue
+    """
+
+    def __init__(self, name: str, kind: PoolKind, max_workers: int, max_queue: int, queue_timeout: float) -> None:
+        """Initialize the pool without starting any worker.
+
+        Args:
+            name: Pool name, used in metrics
+            kind: "process" or "thread" workers
+            max_workers: Number of workers
+            max_queue: Tasks allowed to wait for a worker
+            queue_timeout: Seconds a caller waits for room in the queue
+        """
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._executor: concurrent.futures.Executor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self.in_flight = 0  # submitted, running or waiting for a worker
+        self.waiting = 0  # waiting for room in the queue
+
+    @property
+    def executor(self) -> concurrent.futures.Executor:
+        """The executor, started on first use."""
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("forkserver")
+                )
+            else:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=self.name
+                )
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_queue)
+        return self._executor
+
+    async def run(self, task: str, fn: Callable[..., T], *args: Any) -> T:
+        """Run a function in the pool.
+
+        With process workers, the function must be defined at module level
+        and its arguments and result picklable.
+
+        Args:
+            task: Task name, used in metrics and as the stage name
+            fn: Function to run
+            *args: Positional arguments of the function
+
+        Returns:
+            The function's result
+
+        Raises:
+            WorkerPoolBusyError: If the queue stayed full for ``queue_timeout``
+        """
+        executor = self.executor
+        slots = self._slots
+        with span(task):
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(slots.acquire(), self.queue_timeout)
+            except TimeoutError:
+                WORKER_POOL_REJECTIONS.inc(self.name, task)
+                raise WorkerPoolBusyError(self.name, task) from None
+            finally:
+                self.waiting -= 1
+
+            self.in_flight += 1
+            loop = asyncio.get_running_loop()
+            submitted_at = time.time()
+            try:
+                future = executor.submit(_timed_call, fn, *args)
+            except BaseException:
+                self._release(slots)
+                raise
+            # The slot is freed when the worker is done, even if the caller stops
+            # waiting, so the bound holds for tasks still running after a timeout
+            future.add_done_callback(lambda _: self._release_threadsafe(loop, slots))
+
+            result, started_at, duration = await asyncio.wrap_future(future)
+            WORKER_POOL_TASK_DURATION.observe(max(started_at - submitted_at, 0.0), self.name, task, "queue")
+            WORKER_POOL_TASK_DURATION.observe(duration, self.name, task, "run")
+            return result
+
+    def _release(self, slots: asyncio.Semaphore) -> None:
+        if slots is self._slots:  # not a task of a stopped executor
+            self.in_flight -= 1
+        slots.release()
+
+    def _release_threadsafe(self, loop: asyncio.AbstractEventLoop, slots: asyncio.Semaphore) -> None:
+        try:
+            loop.call_soon_threadsafe(self._release, slots)
+        except RuntimeError:  # loop closed on shutdown
+            pass
+
+    def stop(self) -> None:
+        """Stop the workers, cancelling queued tasks."""
+        executor, self._executor, self._slots = self._executor, None, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.in_flight = 0
+
+
+cpu_pool = WorkerPool(
+    "cpu",
+    settings.CPU_POOL_KIND,
+    settings.CPU_POOL_WORKERS,
+    settings.CPU_POOL_MAX_QUEUE,
+    settings.CPU_POOL_QUEUE_TIMEOUT,
+)
+
+
+def _collect_pools() -> Iterator[MetricSamples]:
+    labels = {"pool": cpu_pool.name}
+    yield "worker_pool_in_flight", "gauge", "Tasks running or queued in the worker pool", [
+        (labels, cpu_pool.in_flight)
+    ]
+    yield "worker_pool_waiting", "gauge", "Tasks waiting for room in the worker pool queue", [
+        (labels, cpu_pool.waiting)
+    ]
+
+
+registry.add_collector(_collect_pools)
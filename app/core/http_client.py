@@ -0,0 +1,54 @@
+"""Shared outbound HTTP client.
+
+One pooled ``httpx.AsyncClient`` per worker, so downloads reuse keep-alive
+connections (and TLS sessions) instead of opening a new client per request.
+
+Example:
+    ```python
+    async with http_client.client.stream("GET", url) as response:
+        async for chunk in response.aiter_bytes():
+            ...
+    ```
+"""
+
+import logging
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPClient:
+    """Lazily created, pooled HTTP client.
+
+    Call ``stop()`` on application shutdown to close its connections.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without opening any connection."""
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared client, created on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=settings.HTTP_CLIENT_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+                follow_redirects=True,
+            )
+        return self._client
+
+    async def stop(self) -> None:
+        """Close the client and its pooled connections."""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+
+http_client = HTTPClient()
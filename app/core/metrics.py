@@ -0,0 +1,260 @@
+"""Prometheus-compatible application metrics.
+
+Metrics are kept in process and rendered in the Prometheus text exposition
+format by the ``/metrics`` endpoint. Each worker process exposes its own
+values; scrape every worker (or aggregate in Prometheus) when running several.
+
+Recording is lock-free, so it must happen on the event loop: a metric keeps
+one child per label combination in a plain dict, and updating it is a couple
+of unlocked attribute writes. Work run in worker threads is recorded after
+the thread returns (see ``send_text_messages_concurrently``).
+Values that are cheaper to read than to track (pool utilization, cache sizes)
+are collected at scrape time by registered collector functions.
+
+Example:
+    ```python
+    KAPSO_REQUESTS.inc("messages", "200")
+    KAPSO_REQUEST_DURATION.observe(0.12, "messages")
+    ```
+"""
+
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from app.core.timing import DEFAULT_BUCKETS, Histogram, stage_histograms
+
+# Collector functions return (name, type, help, samples) tuples, where samples
+# are (labels, value) pairs
+MetricSamples = tuple[str, str, str, list[tuple[dict[str, str], float]]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with labels.
+
+    Args:
+        name: Metric name
+        help: Metric description
+        labelnames: Names of the labels, in the order values are passed
+    """
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        """Initialize a counter without samples.
+
+        Args:
+            name: Metric name
+            help: Metric description
+            labelnames: Names of the labels, in the order values are passed
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        """Increment the counter.
+
+        Args:
+            *labelvalues: Label values, in ``labelnames`` order
+            amount: Amount to add
+        """
+        self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        """Current value for a label combination."""
+        return self._values.get(labelvalues, 0.0)
+
+    def render(self) -> list[str]:
+        """Render the counter in the text exposition format."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labelvalues, value in list(self._values.items()):
+            labels = dict(zip(self.labelnames, labelvalues))
+            lines.append(f"{self.name}_total{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class HistogramMetric:
+    """Histogram with labels, by default of latencies in seconds.
+
+    Args:
+        name: Metric name
+        help: Metric description
+        labelnames: Names of the labels, in the order values are passed
+        buckets: Sorted bucket upper bounds
+    """
+
+    def __init__(
+        self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> None:
+        """Initialize a histogram without samples.
+
+        Args:
+            name: Metric name
+            help: Metric description
+            labelnames: Names of the labels, in the order values are passed
+            buckets: Sorted bucket upper bounds
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._children: dict[tuple[str, ...], Histogram] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """Record a value.
+
+        Args:
+            value: Observed value, such as a duration in seconds
+            *labelvalues: Label values, in ``labelnames`` order
+        """
+        histogram = self._children.get(labelvalues)
+        if histogram is None:
+            histogram = self._children.setdefault(labelvalues, Histogram(self.buckets))
+        histogram.observe(value)
+
+    def child(self, *labelvalues: str) -> Histogram | None:
+        """Histogram of a label combination, if anything was observed."""
+        return self._children.get(labelvalues)
+
+    def render(self) -> list[str]:
+        """Render the histogram in the text exposition format."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labelvalues, histogram in list(self._children.items()):
+            lines.extend(render_histogram(self.name, dict(zip(self.labelnames, labelvalues)), histogram))
+        return lines
+
+
+def render_histogram(name: str, labels: dict[str, str], histogram: Histogram) -> list[str]:
+    """Render the samples of a single histogram.
+
+    Args:
+        name: Metric name
+        labels: Labels of the histogram
+        histogram: Histogram to render
+
+    Returns:
+        Bucket, sum and count sample lines
+    """
+    lines = [
+        f"{name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {count}"
+        for bound, count in histogram.cumulative_counts()
+    ]
+    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+    return lines
+
+
+class MetricsRegistry:
+    """Set of metrics and scrape-time collectors rendered together."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._metrics: list[Counter | HistogramMetric] = []
+        self._collectors: list[Callable[[], Iterable[MetricSamples]]] = []
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """Create and register a counter."""
+        metric = Counter(name, help, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> HistogramMetric:
+        """Create and register a histogram."""
+        metric = HistogramMetric(name, help, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[MetricSamples]]) -> None:
+        """Register a function called on every scrape.
+
+        Args:
+            collector: Function returning (name, type, help, samples) tuples
+        """
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, metric_type, help, samples in collector():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples)
+        lines.extend(_render_stage_histograms())
+        return "\n".join(lines) + "\n"
+
+
+def _render_stage_histograms() -> list[str]:
+    name = "message_stage_duration_seconds"
+    lines = [
+        f"# HELP {name} Duration of each stage of the WhatsApp message pipeline",
+        f"# TYPE {name} histogram",
+    ]
+    for stage, histogram in list(stage_histograms.items()):
+        lines.extend(render_histogram(name, {"stage": stage}, histogram))
+    return lines
+
+
+def gauge_samples(values: Iterable[tuple[dict[str, str], Any]]) -> list[tuple[dict[str, str], float]]:
+    """Convert collected values to gauge samples, skipping missing ones."""
+    return [(labels, float(value)) for labels, value in values if value is not None]
+
+
+# Global registry instance
+registry = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "Duration of HTTP requests by route template", ("method", "route", "status")
+)
+WEBHOOK_MESSAGES = registry.counter("webhook_messages", "Kapso webhook messages received by type", ("type",))
+LLM_REQUESTS = registry.counter("llm_requests", "LLM calls by output schema", ("schema", "model", "status"))
+LLM_REQUEST_DURATION = registry.histogram("llm_request_duration_seconds", "Duration of LLM calls", ("schema",))
+LLM_TOKENS = registry.counter("llm_tokens", "LLM tokens used by output schema", ("schema", "model", "kind"))
+LLM_GATE_WAIT = registry.histogram("llm_gate_wait_seconds", "Time LLM calls waited for a slot", ("model",))
+LLM_GATE_REJECTIONS = registry.counter(
+    "llm_gate_rejections", "LLM calls rejected without reaching the provider", ("model", "reason")
+)
+LOCAL_OCR_RESULTS = registry.counter(
+    "local_ocr_results", "Outcome of the local OCR pre-pass on document images", ("outcome",)
+)
+WORKER_POOL_TASK_DURATION = registry.histogram(
+    "worker_pool_task_seconds", "Time worker pool tasks spent queued and running", ("pool", "task", "phase")
+)
+WORKER_POOL_REJECTIONS = registry.counter(
+    "worker_pool_rejections", "Tasks rejected because the worker pool queue was full", ("pool", "task")
+)
+KAPSO_REQUESTS = registry.counter("kapso_requests", "Kapso API requests by outcome", ("endpoint", "status"))
+KAPSO_REQUEST_DURATION = registry.histogram(
+    "kapso_request_duration_seconds", "Duration of Kapso API requests", ("endpoint",)
+)
+DB_QUERY_DURATION = registry.histogram("db_query_duration_seconds", "Duration of SQL statements", ("operation",))
+DB_SLOW_QUERIES = registry.counter(
+    "db_slow_queries", "SQL statements slower than DB_SLOW_QUERY_MS", ("operation",)
+)
+DB_QUERIES_PER_REQUEST = registry.histogram(
+    "db_queries_per_request",
+    "SQL statements run per HTTP request",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+DB_QUERY_HEAVY_REQUESTS = registry.counter(
+    "db_query_heavy_requests", "Requests running more than DB_QUERY_COUNT_WARNING statements", ("route",)
+)
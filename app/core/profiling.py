@@ -0,0 +1,219 @@
+"""Opt-in sampling profiler for production requests.
+
+When ``PROFILING_ENABLED`` is set, a request is profiled if it carries a valid
+``X-Profile-Token`` header (a JWT for the ``profiler`` subject, see
+``create_profile_token``) or is picked by ``PROFILING_SAMPLE_RATE``. While it
+runs, a background thread samples the event loop thread's stack every
+``PROFILING_INTERVAL_MS`` and the stacks are written in collapsed format
+(``frame;frame;frame count`` per line) under ``PROFILING_DIR``, ready for
+speedscope or flamegraph.pl.
+
+The event loop serves every request, so samples show whatever the loop was
+running while the profiled request was in flight. Only one request is profiled
+at a time per process.
+
+Example:
+    ```python
+    response = await profile_call(request.method, request.url.path, call_next(request))
+    ```
+"""
+
+import asyncio
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Awaitable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, TypeVar
+
+from app.config import settings
+from app.core.security import create_access_token, verify_token
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+PROFILE_TOKEN_SUBJECT = "profiler"
+PROFILE_SUFFIX = ".collapsed"
+
+
+class SamplingProfiler:
+    """Periodically samples the stack of a thread from a background thread.
+
+    Args:
+        thread_id: Identifier of the thread to sample
+        interval: Seconds between samples
+    """
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        """Initialize a stopped profiler.
+
+        Args:
+            thread_id: Identifier of the thread to sample
+            interval: Seconds between samples
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+
+    def collapsed(self) -> str:
+        """Samples in collapsed stack format, one ``stack count`` line per distinct stack."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    for marker in ("site-packages" + os.sep, os.getcwd() + os.sep):
+        index = filename.find(marker)
+        if index != -1:
+            filename = filename[index + len(marker) :]
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _collapse(frame: Any) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def create_profile_token(expires_minutes: int = 60) -> str:
+    """Create a token that enables profiling of the requests sending it.
+
+    Args:
+        expires_minutes: Minutes until the token expires
+
+    Returns:
+        Value for the ``X-Profile-Token`` header
+    """
+    return create_access_token(PROFILE_TOKEN_SUBJECT, timedelta(minutes=expires_minutes))
+
+
+def is_valid_profile_token(token: str | None) -> bool:
+    """Check a ``X-Profile-Token`` header value."""
+    return bool(token) and verify_token(token) == PROFILE_TOKEN_SUBJECT
+
+
+def should_profile(token: str | None) -> bool:
+    """Whether to profile a request.
+
+    Args:
+        token: Value of its ``X-Profile-Token`` header, if any
+
+    Returns:
+        True if profiling is enabled and the request is signed or sampled
+    """
+    if not settings.PROFILING_ENABLED:
+        return False
+    if token is not None:
+        return is_valid_profile_token(token)
+    return settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+_profiling_lock = threading.Lock()
+
+
+async def profile_call(method: str, path: str, awaitable: Awaitable[T]) -> T:
+    """Await a request handler while sampling the event loop, then save the profile.
+
+    Runs the handler unprofiled if another request is already being profiled.
+
+    Args:
+        method: HTTP method, used in the file name
+        path: Request path, used in the file name
+        awaitable: Request handler to profile
+
+    Returns:
+        Result of the handler
+    """
+    if not _profiling_lock.acquire(blocking=False):
+        return await awaitable
+    profiler = SamplingProfiler(threading.get_ident(), settings.PROFILING_INTERVAL_MS / 1000)
+    started_at = time.perf_counter()
+    profiler.start()
+    try:
+        return await awaitable
+    finally:
+        profiler.stop()
+        _profiling_lock.release()
+        duration_ms = (time.perf_counter() - started_at) * 1000
+        try:
+            saved = await asyncio.to_thread(save_profile, profiler.collapsed(), method, path, duration_ms)
+            logger.info(f"Saved profile of {method} {path} ({duration_ms:.0f}ms) to {saved}")
+        except OSError as e:
+            logger.error(f"Error saving profile of {method} {path}: {e}")
+
+
+def save_profile(collapsed: str, method: str, path: str, duration_ms: float) -> Path:
+    """Write a profile and drop the oldest ones beyond ``PROFILING_MAX_FILES``.
+
+    Args:
+        collapsed: Samples in collapsed stack format
+        method: HTTP method
+        path: Request path
+        duration_ms: Duration of the request
+
+    Returns:
+        Path of the written file
+    """
+    directory = Path(settings.PROFILING_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", path).strip("-")[:80] or "root"
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    profile_path = directory / f"{timestamp}_{method}_{slug}_{duration_ms:.0f}ms{PROFILE_SUFFIX}"
+    profile_path.write_text(collapsed)
+
+    for old in list_profiles()[settings.PROFILING_MAX_FILES :]:
+        (directory / old["name"]).unlink(missing_ok=True)
+    return profile_path
+
+
+def list_profiles() -> list[dict[str, Any]]:
+    """Saved profiles, most recent first.
+
+    Returns:
+        One dict per profile with ``name``, ``size`` and ``created_at``
+    """
+    directory = Path(settings.PROFILING_DIR)
+    if not directory.is_dir():
+        return []
+    profiles = []
+    for path in directory.glob(f"*{PROFILE_SUFFIX}"):
+        stat = path.stat()
+        profiles.append(
+            {
+                "name": path.name,
+                "size": stat.st_size,
+                "created_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+            }
+        )
+    return sorted(profiles, key=lambda profile: profile["name"], reverse=True)
@@ -0,0 +1,244 @@
+"""Per-stage latency instrumentation.
+
+Wrap a stage of work in ``span`` (or decorate a function with ``timed``) to
+record how long it took. Every duration is added to a per-stage histogram and,
+while a message is being processed inside ``message_trace``, to that message's
+stage breakdown. When the trace ends, a single structured log line with the
+breakdown is emitted, so a slow webhook can be attributed to download, OCR,
+LLM, database or Kapso time.
+
+Recording is lock-free, so it must happen on the event loop: histograms are
+plain counters and a trace's stages a plain dict, and ``asyncio.to_thread``
+copies the context, so threads running concurrently would update the same
+trace. Time blocking work around the ``to_thread`` call, not inside the
+thread. Traces are kept in a context variable so concurrent messages never
+share one.
+
+Example:
+    ```python
+    @timed("ocr.download")
+    async def download_image_from_url(image_url: str) -> tuple[bytes, str]: ...
+
+    with message_trace("image", message_id=message.id):
+        with span("ocr.classify"):
+            classification = await classifier_model.ainvoke([classify_message])
+    ```
+"""
+
+import functools
+import inspect
+import json
+import logging
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Upper bounds, in seconds, of the histogram buckets; the last bucket is +Inf
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed buckets.
+
+    Args:
+        buckets: Sorted bucket upper bounds in seconds
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """Initialize an empty histogram.
+
+        Args:
+            buckets: Sorted bucket upper bounds in seconds
+        """
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a duration.
+
+        Args:
+            value: Duration in seconds
+        """
+        self.bucket_counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> list[tuple[float, int]]:
+        """Number of observations at or below each bucket bound, ending with +Inf."""
+        result = []
+        total = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.bucket_counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile as the upper bound of the bucket containing it.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Bucket bound in seconds, or None if nothing was observed
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative_counts():
+            if total >= rank:
+                return bound
+        return float("inf")
+
+
+class MessageTrace:
+    """Stage breakdown of a single incoming message.
+
+    Args:
+        message_type: Kind of message (image, text, audio)
+        fields: Extra fields included in the log line
+    """
+
+    def __init__(self, message_type: str, fields: dict[str, Any]) -> None:
+        """Start a trace.
+
+        Args:
+            message_type: Kind of message (image, text, audio)
+            fields: Extra fields included in the log line
+        """
+        self.message_type = message_type
+        self.fields = fields
+        self.started_at = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.stage_calls: dict[str, int] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add the duration of a stage; repeated stages are summed.
+
+        Args:
+            stage: Stage name
+            seconds: Duration in seconds
+        """
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        self.stage_calls[stage] = self.stage_calls.get(stage, 0) + 1
+
+    def as_dict(self, status: str) -> dict[str, Any]:
+        """Summary of the trace for logging.
+
+        Args:
+            status: Outcome of the message ("ok" or "error")
+
+        Returns:
+            dict with the message type, status, total and per-stage milliseconds
+        """
+        return {
+            "message_type": self.message_type,
+            **self.fields,
+            "status": status,
+            "total_ms": round((time.perf_counter() - self.started_at) * 1000, 1),
+            "stages_ms": {stage: round(seconds * 1000, 1) for stage, seconds in self.stages.items()},
+            "stage_calls": {stage: calls for stage, calls in self.stage_calls.items() if calls > 1},
+        }
+
+
+# Histogram of every stage recorded since the process started
+stage_histograms: dict[str, Histogram] = {}
+
+_current_trace: ContextVar[MessageTrace | None] = ContextVar("message_trace", default=None)
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """Record the duration of a stage in its histogram and the current trace.
+
+    Args:
+        stage: Stage name
+        seconds: Duration in seconds
+    """
+    histogram = stage_histograms.get(stage)
+    if histogram is None:
+        histogram = stage_histograms.setdefault(stage, Histogram())
+    histogram.observe(seconds)
+
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(stage, seconds)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time the enclosed block as a stage, whether it succeeds or raises.
+
+    Args:
+        stage: Stage name, dotted by component (e.g. "ocr.classify")
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start)
+
+
+def timed(stage: str) -> Callable[[F], F]:
+    """Decorator timing every call of a sync or async function as a stage.
+
+    Args:
+        stage: Stage name, dotted by component (e.g. "kapso.send")
+
+    Returns:
+        Decorator
+    """
+
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(stage):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(stage):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+@contextmanager
+def message_trace(message_type: str, **fields: Any) -> Iterator[MessageTrace]:
+    """Collect the stage breakdown of a message and log it when done.
+
+    The total duration is also recorded as the ``message.<type>`` stage.
+
+    Args:
+        message_type: Kind of message (image, text, audio)
+        **fields: Extra fields for the log line, such as the message ID
+
+    Yields:
+        MessageTrace: The active trace
+    """
+    trace = MessageTrace(message_type, fields)
+    token = _current_trace.set(trace)
+    status = "ok"
+    try:
+        yield trace
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        _current_trace.reset(token)
+        summary = trace.as_dict(status)
+        record_stage(f"message.{message_type}", summary["total_ms"] / 1000)
+        logger.info(f"Message processed: {json.dumps(summary)}", extra={"message_trace": summary})
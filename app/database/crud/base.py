@@ -4,15 +4,86 @@ Provides generic CRUD operations that can be inherited and extended
 for specific models.
 """
 
-from typing import Any, Generic, TypeVar
+import base64
+import json
+from collections.abc import Iterable
+from typing import Any, Generic, Literal, TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import Select, func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+TotalMode = Literal["exact", "estimate"]
+
+
+def encode_cursor(last_id: Any) -> str:
+    """Encode the last seen primary key as an opaque cursor.
+
+    Args:
+        last_id: Primary key of the last record of the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps({"id": str(last_id)}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, id_type: type) -> Any:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor: Opaque cursor string
+        id_type: Python type of the primary key (e.g. int or uuid.UUID)
+
+    Returns:
+        Primary key value of the last record of the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return id_type(json.loads(base64.urlsafe_b64decode(padded))["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor}") from e
+
+
+class Page(list[ModelType], Generic[ModelType]):
+    """List of records plus keyset pagination metadata.
+
+    Behaves as a plain list, so callers that only need the records are unaffected.
+
+    Attributes:
+        next_cursor: Cursor for the next page, or None on the last page
+        total: Number of matching records, if requested
+        total_is_estimate: Whether ``total`` is an estimate
+    """
+
+    def __init__(
+        self,
+        items: Iterable[ModelType] = (),
+        next_cursor: str | None = None,
+        total: int | None = None,
+        total_is_estimate: bool = False,
+    ) -> None:
+        """Initialize a page.
+
+        Args:
+            items: Records of the page
+            next_cursor: Cursor for the next page
+            total: Number of matching records
+            total_is_estimate: Whether ``total`` is an estimate
+        """
+        super().__init__(items)
+        self.next_cursor = next_cursor
+        self.total = total
+        self.total_is_estimate = total_is_estimate
+
 
 class CRUDBase(Generic[ModelType]):
     """Base class for CRUD operations.
@@ -71,6 +142,108 @@ class CRUDBase(Generic[ModelType]):
         result = await db.execute(select(self.model).offset(skip).limit(limit))
         return list(result.scalars().all())
 
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: str | None = None,
+        limit: int | None = None,
+        total: TotalMode | None = None,
+    ) -> Page[ModelType]:
+        """Get multiple records with keyset pagination.
+
+        Unlike ``get_multi``, the cost of a page does not grow with its depth.
+
+        Args:
+            db: Database session
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return (capped at API_MAX_PAGE_SIZE)
+            total: Also count matching records, exactly or as a cheap estimate
+
+        Returns:
+            Page of model instances
+        """
+        return await self.paginate(db, select(self.model), cursor=cursor, limit=limit, total=total)
+
+    async def paginate(
+        self,
+        db: AsyncSession,
+        stmt: Select,
+        *,
+        cursor: str | None = None,
+        limit: int | None = None,
+        total: TotalMode | None = None,
+    ) -> Page[ModelType]:
+        """Execute a select of this model one page at a time.
+
+        Records are ordered by primary key and the page starts right after the
+        key encoded in ``cursor``. Without a limit, all records are returned.
+
+        Args:
+            db: Database session
+            stmt: Select statement returning this model
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return (capped at API_MAX_PAGE_SIZE)
+            total: Also count matching records, exactly or as a cheap estimate
+
+        Returns:
+            Page of model instances
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        total_count: int | None = None
+        total_is_estimate = False
+        if total == "exact":
+            total_count = await self._count_exact(db, stmt)
+        elif total == "estimate":
+            total_count, total_is_estimate = await self._count_estimate(db, stmt)
+
+        if cursor is not None:
+            stmt = stmt.where(self.model.id > decode_cursor(cursor, self.model.id.type.python_type))
+        stmt = stmt.order_by(self.model.id)
+        if limit is not None:
+            limit = max(1, min(limit, settings.API_MAX_PAGE_SIZE))
+            # Fetch one extra row to know whether there is a next page
+            stmt = stmt.limit(limit + 1)
+
+        result = await db.execute(stmt)
+        rows = list(result.scalars().all())
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].id)
+        return Page(rows, next_cursor, total_count, total_is_estimate)
+
+    async def _count_exact(self, db: AsyncSession, stmt: Select) -> int:
+        result = await db.execute(select(func.count()).select_from(stmt.order_by(None).subquery()))
+        return result.scalar_one()
+
+    async def _count_estimate(self, db: AsyncSession, stmt: Select) -> tuple[int, bool]:
+        """Cheaply estimate how many records a select returns.
+
+        Unfiltered selects use the planner statistics in ``pg_class``; filtered
+        ones are counted exactly up to API_COUNT_ESTIMATE_CAP rows.
+
+        Returns:
+            Tuple of (count, is_estimate)
+        """
+        if stmt.whereclause is None:
+            result = await db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                {"table": self.model.__tablename__},
+            )
+            estimate = result.scalar_one_or_none()
+            # reltuples is -1 until the table is first vacuumed or analyzed
+            if estimate is not None and estimate >= 0:
+                return estimate, True
+
+        cap = settings.API_COUNT_ESTIMATE_CAP
+        capped = stmt.order_by(None).limit(cap).subquery()
+        result = await db.execute(select(func.count()).select_from(capped))
+        count = result.scalar_one()
+        return count, count >= cap
+
     async def create(self, db: AsyncSession, *, obj_in: dict[str, Any]) -> ModelType:
         """Create a new record.
 
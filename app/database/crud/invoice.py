@@ -1,52 +1,101 @@
 """CRUD operations for Invoice model."""
 
+import uuid
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.crud.base import CRUDBase
+from app.database.crud.base import CRUDBase, Page, TotalMode
 from app.database.models.invoice import Invoice
 
 
 class CRUDInvoice(CRUDBase[Invoice]):
     """CRUD operations for Invoice model."""
 
-    async def get_by_payer(self, db: AsyncSession, payer_id: int) -> list[Invoice]:
+    async def get_by_payer(
+        self,
+        db: AsyncSession,
+        payer_id: int,
+        *,
+        cursor: str | None = None,
+        limit: int | None = None,
+        total: TotalMode | None = None,
+    ) -> Page[Invoice]:
         """Get invoices by payer ID.
 
         Args:
             db: Database session
             payer_id: Payer's user ID
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return (all if None)
+            total: Also count matching records, exactly or as an estimate
 
         Returns:
-            List of Invoice instances
+            Page of Invoice instances
         """
-        result = await db.execute(select(Invoice).where(Invoice.payer_id == payer_id))
-        return list(result.scalars().all())
-
-    async def get_by_session(self, db: AsyncSession, session_id) -> list[Invoice]:
+        return await self.paginate(
+            db,
+            select(Invoice).where(Invoice.payer_id == payer_id),
+            cursor=cursor,
+            limit=limit,
+            total=total,
+        )
+
+    async def get_by_session(
+        self,
+        db: AsyncSession,
+        session_id: uuid.UUID,
+        *,
+        cursor: str | None = None,
+        limit: int | None = None,
+        total: TotalMode | None = None,
+    ) -> Page[Invoice]:
         """Get invoices by session ID.
 
         Args:
             db: Database session
             session_id: Session UUID
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return (all if None)
+            total: Also count matching records, exactly or as an estimate
 
         Returns:
-            List of Invoice instances
+            Page of Invoice instances
         """
-        result = await db.execute(select(Invoice).where(Invoice.session_id == session_id))
-        return list(result.scalars().all())
-
-    async def get_pending_invoices(self, db: AsyncSession) -> list[Invoice]:
+        return await self.paginate(
+            db,
+            select(Invoice).where(Invoice.session_id == session_id),
+            cursor=cursor,
+            limit=limit,
+            total=total,
+        )
+
+    async def get_pending_invoices(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: str | None = None,
+        limit: int | None = None,
+        total: TotalMode | None = None,
+    ) -> Page[Invoice]:
         """Get all invoices with pending amounts.
 
         Args:
             db: Database session
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return (all if None)
+            total: Also count matching records, exactly or as an estimate
 
         Returns:
-            List of Invoice instances with pending_amount > 0
+            Page of Invoice instances with pending_amount > 0
         """
-        result = await db.execute(select(Invoice).where(Invoice.pending_amount > 0))
-        return list(result.scalars().all())
+        return await self.paginate(
+            db,
+            select(Invoice).where(Invoice.pending_amount > 0),
+            cursor=cursor,
+            limit=limit,
+            total=total,
+        )
 
 
 # Create instance
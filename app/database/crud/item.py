@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 import uuid
 
-from app.database.crud.base import CRUDBase
+from app.database.crud.base import CRUDBase, Page, TotalMode
 from app.database.models.item import Item
 from app.database.models.invoice import Invoice
 
@@ -13,78 +13,151 @@ from app.database.models.invoice import Invoice
 class CRUDItem(CRUDBase[Item]):
     """CRUD operations for Item model."""
 
-    async def get_by_invoice(self, db: AsyncSession, invoice_id: int) -> list[Item]:
+    async def get_by_invoice(
+        self,
+        db: AsyncSession,
+        invoice_id: int,
+        *,
+        cursor: str | None = None,
+        limit: int | None = None,
+        total: TotalMode | None = None,
+    ) -> Page[Item]:
         """Get items by invoice ID.
 
         Args:
             db: Database session
             invoice_id: Invoice ID
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return (all if None)
+            total: Also count matching records, exactly or as an estimate
 
         Returns:
-            List of Item instances with debtor relationship loaded
+            Page of Item instances with debtor relationship loaded
         """
-        result = await db.execute(
-            select(Item)
-            .options(selectinload(Item.debtor))
-            .where(Item.invoice_id == invoice_id)
+        return await self.paginate(
+            db,
+            select(Item).options(selectinload(Item.debtor)).where(Item.invoice_id == invoice_id),
+            cursor=cursor,
+            limit=limit,
+            total=total,
         )
-        return list(result.scalars().all())
 
-    async def get_by_debtor(self, db: AsyncSession, debtor_id: int) -> list[Item]:
+    async def get_by_debtor(
+        self,
+        db: AsyncSession,
+        debtor_id: int,
+        *,
+        cursor: str | None = None,
+        limit: int | None = None,
+        total: TotalMode | None = None,
+    ) -> Page[Item]:
         """Get items by debtor ID.
 
         Args:
             db: Database session
             debtor_id: Debtor's user ID
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return (all if None)
+            total: Also count matching records, exactly or as an estimate
 
         Returns:
-            List of Item instances
+            Page of Item instances
         """
-        result = await db.execute(select(Item).where(Item.debtor_id == debtor_id))
-        return list(result.scalars().all())
+        return await self.paginate(
+            db,
+            select(Item).where(Item.debtor_id == debtor_id),
+            cursor=cursor,
+            limit=limit,
+            total=total,
+        )
 
-    async def get_unpaid_items(self, db: AsyncSession) -> list[Item]:
+    async def get_unpaid_items(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: str | None = None,
+        limit: int | None = None,
+        total: TotalMode | None = None,
+    ) -> Page[Item]:
         """Get all unpaid items.
 
         Args:
             db: Database session
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return (all if None)
+            total: Also count matching records, exactly or as an estimate
 
         Returns:
-            List of unpaid Item instances
+            Page of unpaid Item instances
         """
-        result = await db.execute(select(Item).where(Item.is_paid == False))
-        return list(result.scalars().all())
+        return await self.paginate(
+            db,
+            select(Item).where(Item.is_paid == False),
+            cursor=cursor,
+            limit=limit,
+            total=total,
+        )
 
-    async def get_by_payment(self, db: AsyncSession, payment_id: int) -> list[Item]:
+    async def get_by_payment(
+        self,
+        db: AsyncSession,
+        payment_id: int,
+        *,
+        cursor: str | None = None,
+        limit: int | None = None,
+        total: TotalMode | None = None,
+    ) -> Page[Item]:
         """Get items by payment ID.
 
         Args:
             db: Database session
             payment_id: Payment ID
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return (all if None)
+            total: Also count matching records, exactly or as an estimate
 
         Returns:
-            List of Item instances
+            Page of Item instances
         """
-        result = await db.execute(select(Item).where(Item.payment_id == payment_id))
-        return list(result.scalars().all())
+        return await self.paginate(
+            db,
+            select(Item).where(Item.payment_id == payment_id),
+            cursor=cursor,
+            limit=limit,
+            total=total,
+        )
 
-    async def get_by_session(self, db: AsyncSession, session_id: uuid.UUID) -> list[Item]:
+    async def get_by_session(
+        self,
+        db: AsyncSession,
+        session_id: uuid.UUID,
+        *,
+        cursor: str | None = None,
+        limit: int | None = None,
+        total: TotalMode | None = None,
+    ) -> Page[Item]:
         """Get items by session ID.
 
         Args:
             db: Database session
             session_id: Session UUID
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return (all if None)
+            total: Also count matching records, exactly or as an estimate
 
         Returns:
-            List of Item instances with debtor relationship loaded
+            Page of Item instances with debtor relationship loaded
         """
-        result = await db.execute(
+        return await self.paginate(
+            db,
             select(Item)
             .join(Invoice, Item.invoice_id == Invoice.id)
             .options(selectinload(Item.debtor))
-            .where(Invoice.session_id == session_id)
+            .where(Invoice.session_id == session_id),
+            cursor=cursor,
+            limit=limit,
+            total=total,
         )
-        return list(result.scalars().all())
 
 
 # Create instance
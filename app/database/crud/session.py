@@ -4,49 +4,91 @@ import uuid
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.crud.base import CRUDBase
+from app.database.crud.base import CRUDBase, Page, TotalMode
 from app.database.models.session import Session, SessionStatus
 
 
 class CRUDSession(CRUDBase[Session]):
     """CRUD operations for Session model."""
 
-    async def get_by_owner(self, db: AsyncSession, owner_id: int) -> list[Session]:
+    async def get_by_owner(
+        self,
+        db: AsyncSession,
+        owner_id: int,
+        *,
+        cursor: str | None = None,
+        limit: int | None = None,
+        total: TotalMode | None = None,
+    ) -> Page[Session]:
         """Get sessions by owner ID.
 
         Args:
             db: Database session
             owner_id: Owner's user ID
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return (all if None)
+            total: Also count matching records, exactly or as an estimate
 
         Returns:
-            List of Session instances
+            Page of Session instances
         """
-        result = await db.execute(select(Session).where(Session.owner_id == owner_id))
-        return list(result.scalars().all())
-
-    async def get_by_status(self, db: AsyncSession, status: SessionStatus) -> list[Session]:
+        return await self.paginate(
+            db,
+            select(Session).where(Session.owner_id == owner_id),
+            cursor=cursor,
+            limit=limit,
+            total=total,
+        )
+
+    async def get_by_status(
+        self,
+        db: AsyncSession,
+        status: SessionStatus,
+        *,
+        cursor: str | None = None,
+        limit: int | None = None,
+        total: TotalMode | None = None,
+    ) -> Page[Session]:
         """Get sessions by status.
 
         Args:
             db: Database session
             status: Session status
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return (all if None)
+            total: Also count matching records, exactly or as an estimate
 
         Returns:
-            List of Session instances
+            Page of Session instances
         """
-        result = await db.execute(select(Session).where(Session.status == status))
-        return list(result.scalars().all())
-
-    async def get_active_sessions(self, db: AsyncSession) -> list[Session]:
+        return await self.paginate(
+            db,
+            select(Session).where(Session.status == status),
+            cursor=cursor,
+            limit=limit,
+            total=total,
+        )
+
+    async def get_active_sessions(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: str | None = None,
+        limit: int | None = None,
+        total: TotalMode | None = None,
+    ) -> Page[Session]:
         """Get all active sessions.
 
         Args:
             db: Database session
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return (all if None)
+            total: Also count matching records, exactly or as an estimate
 
         Returns:
-            List of active Session instances
+            Page of active Session instances
         """
-        return await self.get_by_status(db, SessionStatus.ACTIVE)
+        return await self.get_by_status(db, SessionStatus.ACTIVE, cursor=cursor, limit=limit, total=total)
 
     async def create(
         self, db: AsyncSession, *, obj_in: dict, owner_id: int | None = None
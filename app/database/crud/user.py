@@ -3,7 +3,7 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.crud.base import CRUDBase
+from app.database.crud.base import CRUDBase, Page, TotalMode
 from app.database.models.user import User
 
 
@@ -23,18 +23,34 @@ class CRUDUser(CRUDBase[User]):
         result = await db.execute(select(User).where(User.phone_number == phone_number))
         return result.scalar_one_or_none()
 
-    async def get_by_name(self, db: AsyncSession, name: str) -> list[User]:
+    async def get_by_name(
+        self,
+        db: AsyncSession,
+        name: str,
+        *,
+        cursor: str | None = None,
+        limit: int | None = None,
+        total: TotalMode | None = None,
+    ) -> Page[User]:
         """Get users by name (partial match).
 
         Args:
             db: Database session
             name: User's name (partial match)
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return (all if None)
+            total: Also count matching records, exactly or as an estimate
 
         Returns:
-            List of User instances
+            Page of User instances
         """
-        result = await db.execute(select(User).where(User.name.ilike(f"%{name}%")))
-        return list(result.scalars().all())
+        return await self.paginate(
+            db,
+            select(User).where(User.name.ilike(f"%{name}%")),
+            cursor=cursor,
+            limit=limit,
+            total=total,
+        )
 
 
 # Create instance
@@ -1,5 +1,10 @@
 """Database configuration and session management."""
 
+import logging
+import time
+import uuid
+from typing import Any
+
 from sqlalchemy import Engine, MetaData, create_engine
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -8,8 +13,13 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 
 from app.config import settings
+from app.database.query_stats import install_query_hooks
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 
 # Naming convention for database constraints
@@ -33,14 +43,79 @@ class Base(DeclarativeBase):
     metadata = MetaData(naming_convention=NAMING_CONVENTION)
 
 
+class PoolCheckoutStats:
+    """Running statistics of how long requests wait for a pooled connection.
+
+    Attributes:
+        count: Number of checkouts recorded
+        total_seconds: Accumulated wait time
+        max_seconds: Longest single wait
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record a single checkout wait.
+
+        Args:
+            seconds: Time spent waiting for a connection
+        """
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if seconds >= settings.DB_POOL_CHECKOUT_WARNING_SECONDS:
+            logger.warning(f"Waited {seconds:.3f}s for a database connection, pool may be exhausted")
+
+    def as_dict(self) -> dict[str, float]:
+        """Get the statistics as a dictionary."""
+        return {
+            "checkouts": self.count,
+            "wait_seconds_total": self.total_seconds,
+            "wait_seconds_avg": self.total_seconds / self.count if self.count else 0.0,
+            "wait_seconds_max": self.max_seconds,
+        }
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout waits."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = PoolCheckoutStats()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.checkout_stats.record(time.perf_counter() - start)
+
+
+def _session_write_key(session_id: uuid.UUID | str) -> str | None:
+    """Key of a session in the recent writes cache, in canonical UUID form; None if not a UUID."""
+    try:
+        return f"session:{uuid.UUID(str(session_id))}"
+    except ValueError:
+        return None
+
+
 class DatabaseManager:
     """Database connection and session management.
 
     Manages the lifecycle of database connections and provides
     session factories for dependency injection.
 
+    When ``DATABASE_REPLICA_URL`` is configured, read-only sessions are served
+    from the replica, except for users that wrote and sessions that were written
+    recently (read-your-writes).
+
     Attributes:
-        engine: SQLAlchemy async engine
+        engine: SQLAlchemy async engine for the primary
+        read_engine: SQLAlchemy async engine for the read replica, if configured
         sessionmaker: Factory for creating database sessions
     """
 
@@ -48,36 +123,68 @@ class DatabaseManager:
         """Initialize database manager."""
         self.engine: AsyncEngine | None = None
         self._sessionmaker: async_sessionmaker[AsyncSession] | None = None
+        self.read_engine: AsyncEngine | None = None
+        self._read_sessionmaker: async_sessionmaker[AsyncSession] | None = None
         self.sync_engine: Engine | None = None
         self._sync_sessionmaker: sessionmaker[Session] | None = None
+        self._recent_writers: TTLCache[bool] = TTLCache(
+            maxsize=10_000, ttl=settings.DB_READ_YOUR_WRITES_SECONDS, name="recent_writers"
+        )
 
     async def connect(self) -> None:
-        """Create database engine and session factory.
+        """Create database engines and session factories.
 
-        Should be called during application startup.
+        Should be called during application startup. The synchronous engine
+        is only created on the first call to ``db_session()``.
         """
-        self.engine = create_async_engine(
-            settings.database_url_async,
-            echo=settings.DB_ECHO,
-            pool_pre_ping=True,
-        )
+        self.engine = self._create_async_engine(settings.database_url_async)
         self._sessionmaker = async_sessionmaker(
             self.engine,
             class_=AsyncSession,
             expire_on_commit=False,
         )
-        # Create synchronous engine and sessionmaker
-        sync_url = str(settings.DATABASE_URL)
-        self.sync_engine = create_engine(
-            sync_url,
+        if settings.database_replica_url_async:
+            self.read_engine = self._create_async_engine(settings.database_replica_url_async, read_only=True)
+            self._read_sessionmaker = async_sessionmaker(
+                self.read_engine,
+                class_=AsyncSession,
+                expire_on_commit=False,
+            )
+
+    @staticmethod
+    def _create_async_engine(url: str, read_only: bool = False) -> AsyncEngine:
+        """Create an async engine with the configured pool settings.
+
+        Args:
+            url: Async database URL
+            read_only: Whether to make every transaction read-only
+
+        Returns:
+            AsyncEngine: Configured engine
+        """
+        server_settings = {"application_name": settings.DB_APPLICATION_NAME}
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if read_only:
+            # Guards against accidental writes when the replica URL points at the primary
+            server_settings["default_transaction_read_only"] = "on"
+
+        engine = create_async_engine(
+            url,
             echo=settings.DB_ECHO,
             pool_pre_ping=True,
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            connect_args={
+                "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+                "server_settings": server_settings,
+            },
         )
-        self._sync_sessionmaker = sessionmaker(
-            self.sync_engine,
-            class_=Session,
-            expire_on_commit=False,
-        )
+        install_query_hooks(engine)
+        return engine
 
     async def disconnect(self) -> None:
         """Dispose database engine and close all connections.
@@ -86,8 +193,12 @@ class DatabaseManager:
         """
         if self.engine:
             await self.engine.dispose()
+        if self.read_engine:
+            await self.read_engine.dispose()
         if self.sync_engine:
             self.sync_engine.dispose()
+            self.sync_engine = None
+            self._sync_sessionmaker = None
 
     def sessionmaker(self) -> async_sessionmaker[AsyncSession]:
         """Get the session factory.
@@ -102,6 +213,60 @@ class DatabaseManager:
             raise RuntimeError("Database is not connected. Call connect() first.")
         return self._sessionmaker
 
+    def read_sessionmaker(
+        self, user_key: str | None = None, session_id: uuid.UUID | str | None = None
+    ) -> async_sessionmaker[AsyncSession]:
+        """Get the session factory for read-only work.
+
+        Returns the replica factory when a replica is configured, falling back to
+        the primary if ``user_key`` wrote, or ``session_id`` was written, within
+        ``DB_READ_YOUR_WRITES_SECONDS``.
+
+        Args:
+            user_key: Identifier of the user issuing the reads (phone number)
+            session_id: Session the reads are about, if any
+
+        Returns:
+            async_sessionmaker: Factory for creating read-only database sessions
+
+        Raises:
+            RuntimeError: If database is not connected
+        """
+        if self._read_sessionmaker is None:
+            return self.sessionmaker()
+        if user_key and self._recent_writers.get(user_key):
+            return self.sessionmaker()
+        if session_id and (key := _session_write_key(session_id)) and self._recent_writers.get(key):
+            return self.sessionmaker()
+        return self._read_sessionmaker
+
+    def mark_write(self, user_key: str) -> None:
+        """Record that a user just wrote to the primary.
+
+        Subsequent reads by the same user go to the primary for
+        ``DB_READ_YOUR_WRITES_SECONDS``, so replica lag never hides their own
+        changes. Tracked per process.
+
+        Args:
+            user_key: Identifier of the user that wrote (phone number)
+        """
+        self._recent_writers.set(user_key, True)
+
+    def mark_session_write(self, session_id: uuid.UUID | str) -> None:
+        """Record that a session was just changed on the primary.
+
+        Called on commit for every session whose version was bumped (see
+        ``app.database.versioning``). Reads about the session go to the primary
+        for ``DB_READ_YOUR_WRITES_SECONDS``, whoever issues them, so the
+        dashboard sees a WhatsApp write right away. Tracked per process.
+
+        Args:
+            session_id: Session UUID
+        """
+        key = _session_write_key(session_id)
+        if key is not None:
+            self._recent_writers.set(key, True)
+
     def db_session(self) -> Session:
         """Get a synchronous database session.
 
@@ -119,10 +284,55 @@ class DatabaseManager:
             db_session.close()
             ```
         """
-        if self._sync_sessionmaker is None:
+        if self.engine is None:
             raise RuntimeError("Database is not connected. Call connect() first.")
+        if self._sync_sessionmaker is None:
+            # Created lazily: the request path only uses the async engine
+            options = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+            self.sync_engine = create_engine(
+                settings.database_url_sync,
+                echo=settings.DB_ECHO,
+                pool_pre_ping=True,
+                pool_recycle=settings.DB_POOL_RECYCLE,
+                connect_args={"application_name": settings.DB_APPLICATION_NAME, "options": options},
+            )
+            install_query_hooks(self.sync_engine)
+            self._sync_sessionmaker = sessionmaker(
+                self.sync_engine,
+                class_=Session,
+                expire_on_commit=False,
+            )
         return self._sync_sessionmaker()
 
+    def pool_status(self) -> dict[str, Any]:
+        """Get connection pool utilization and checkout wait statistics.
+
+        Returns:
+            dict: Pool size, checked out and overflow connections, and checkout waits
+
+        Raises:
+            RuntimeError: If database is not connected
+        """
+        if self.engine is None:
+            raise RuntimeError("Database is not connected. Call connect() first.")
+        status = self._engine_pool_status(self.engine)
+        if self.read_engine is not None:
+            status["replica"] = self._engine_pool_status(self.read_engine)
+        return status
+
+    @staticmethod
+    def _engine_pool_status(engine: AsyncEngine) -> dict[str, Any]:
+        pool = engine.pool
+        status: dict[str, Any] = {"pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW}
+        if isinstance(pool, InstrumentedAsyncQueuePool):
+            status.update(
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+                **pool.checkout_stats.as_dict(),
+            )
+        return status
+
 
 # Global database manager instance
 db_manager = DatabaseManager()
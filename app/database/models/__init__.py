@@ -18,6 +18,10 @@ from app.database.models.invoice import Invoice
 from app.database.models.item import Item
 from app.database.models.payment import Payment
 from app.database.models.payment_method import PaymentMethod
+from app.database.models.llm_usage import LLMUsage
+
+# Registers the flush hook that bumps session change versions
+import app.database.versioning  # noqa: E402, F401
 
 __all__ = [
     "User",
@@ -27,4 +31,5 @@ __all__ = [
     "Item",
     "Payment",
     "PaymentMethod",
+    "LLMUsage",
 ]
@@ -0,0 +1,57 @@
+"""LLM usage model definition."""
+
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import BigInteger, Date, DateTime, ForeignKey, Index, Integer, Numeric, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.database import Base
+
+
+class LLMUsage(Base):
+    """LLM usage model.
+
+    Token usage, latency and cost of the LLM calls made while handling one
+    WhatsApp message, aggregated per output schema and model.
+
+    Attributes:
+        id: Primary key
+        message_id: Kapso message ID that triggered the calls
+        user_id: ID of the user who sent the message, if known
+        session_id: Active session of the user when the message was handled
+        day: UTC day the message was handled
+        schema: Output schema of the calls (receipt, transfer, agent_action, ...)
+        model: Model name
+        calls: Number of calls
+        input_tokens: Prompt tokens, including image tokens
+        output_tokens: Completion tokens
+        cached_tokens: Prompt tokens served from the provider's prompt cache
+        images: Number of images sent
+        latency_ms: Total latency of the calls in milliseconds
+        cost_usd: Estimated cost in US dollars
+        created_at: When the row was recorded
+    """
+
+    __tablename__ = "llm_usage"
+    __table_args__ = (
+        Index("ix_llm_usage_session_id", "session_id"),
+        Index("ix_llm_usage_day", "day"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    message_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
+    session_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("sessions.id"), nullable=True)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    schema: Mapped[str] = mapped_column(String(100), nullable=False)
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    calls: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    input_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    output_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    cached_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    images: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    latency_ms: Mapped[float] = mapped_column(Numeric(12, 1), nullable=False, default=0)
+    cost_usd: Mapped[float] = mapped_column(Numeric(12, 6), nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
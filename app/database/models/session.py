@@ -2,7 +2,7 @@
 
 import enum
 import uuid
-from sqlalchemy import String, Table, Column, ForeignKey, Enum, text
+from sqlalchemy import BigInteger, String, Table, Column, ForeignKey, Enum, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.database.database import Base
@@ -29,6 +29,7 @@ class Session(Base):
     Attributes:
         id: Primary key
         description: Description of the session
+        version: Change version, incremented on every write affecting the session
         users: Users participating in this session (many-to-many)
     """
 
@@ -38,6 +39,8 @@ class Session(Base):
     description: Mapped[str] = mapped_column(String(500), nullable=True)
     owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     status: Mapped[SessionStatus] = mapped_column(Enum(SessionStatus, name="session_status"), nullable=False)
+    # Bumped on every write to the session, its invoices, items or members (see app.database.versioning)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default=text("0"))
 
     # Relationships
     users: Mapped[list["User"]] = relationship(secondary=session_users, back_populates="sessions")
@@ -0,0 +1,168 @@
+"""Per-request statement counting and slow query logging.
+
+``install_query_hooks`` registers cursor execution events on an engine. Every
+statement is timed; statements slower than ``DB_SLOW_QUERY_MS`` are logged with
+their parameters redacted, and while a request runs inside ``track_queries``
+its statement count and database time are accumulated, so the logging
+middleware can report them and flag requests running more than
+``DB_QUERY_COUNT_WARNING`` statements (usually an N+1 pattern).
+
+Example:
+    ```python
+    with track_queries() as stats:
+        response = await call_next(request)
+    logger.info(f"{stats.count} queries in {stats.total_seconds:.3f}s")
+    ```
+"""
+
+import logging
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+from app.core.metrics import DB_QUERIES_PER_REQUEST, DB_QUERY_DURATION, DB_QUERY_HEAVY_REQUESTS, DB_SLOW_QUERIES
+
+logger = logging.getLogger(__name__)
+
+# Longest statement text included in log lines
+MAX_LOGGED_STATEMENT_LENGTH = 1000
+
+
+class QueryStats:
+    """Statements run while handling a single request."""
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slow = 0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float, slow: bool) -> None:
+        """Record an executed statement.
+
+        Args:
+            statement: SQL text
+            seconds: Execution time
+            slow: Whether it exceeded the slow query threshold
+        """
+        self.count += 1
+        self.total_seconds += seconds
+        self.slow += slow
+        self.statements[statement] += 1
+
+    def most_repeated(self) -> tuple[str, int] | None:
+        """Statement run most often and how many times."""
+        most_common = self.statements.most_common(1)
+        return most_common[0] if most_common else None
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count the statements run inside the block, including in tasks it starts.
+
+    Yields:
+        QueryStats: Statistics accumulated so far
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Replace parameter values with their type names.
+
+    Args:
+        parameters: DBAPI parameters (sequence, mapping or list of them for executemany)
+
+    Returns:
+        Same structure with values like ``<str>``
+    """
+    if isinstance(parameters, dict):
+        return {key: f"<{type(value).__name__}>" for key, value in parameters.items()}
+    if isinstance(parameters, list):
+        return f"<{len(parameters)} rows>"
+    if isinstance(parameters, tuple):
+        return tuple(f"<{type(value).__name__}>" for value in parameters)
+    return "<redacted>"
+
+
+def _operation(statement: str) -> str:
+    return statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+
+
+def _before_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    seconds = time.perf_counter() - conn.info["query_start_time"].pop()
+    operation = _operation(statement)
+    DB_QUERY_DURATION.observe(seconds, operation)
+
+    slow = bool(settings.DB_SLOW_QUERY_MS) and seconds * 1000 >= settings.DB_SLOW_QUERY_MS
+    if slow:
+        DB_SLOW_QUERIES.inc(operation)
+        logger.warning(
+            f"Slow query ({seconds * 1000:.0f}ms): {statement[:MAX_LOGGED_STATEMENT_LENGTH]} "
+            f"params={redact_parameters(parameters)}"
+        )
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, seconds, slow)
+
+
+def _handle_error(exception_context: Any) -> None:
+    # Keep the start time stack balanced when a statement fails
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start_time"):
+        connection.info["query_start_time"].pop()
+
+
+def install_query_hooks(engine: AsyncEngine | Engine) -> None:
+    """Time and count every statement executed by an engine.
+
+    Args:
+        engine: Async or sync engine to instrument
+    """
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+def report_request_queries(stats: QueryStats, route: str) -> None:
+    """Record the statement count of a finished request and flag heavy ones.
+
+    Args:
+        stats: Statistics of the request
+        route: Route template of the request
+    """
+    if stats.count == 0:
+        return
+    DB_QUERIES_PER_REQUEST.observe(stats.count)
+    if settings.DB_QUERY_COUNT_WARNING and stats.count > settings.DB_QUERY_COUNT_WARNING:
+        DB_QUERY_HEAVY_REQUESTS.inc(route)
+        statement, times = stats.most_repeated() or ("", 0)
+        logger.warning(
+            f"Possible N+1: {route} ran {stats.count} queries "
+            f"(most repeated {times}x: {statement[:MAX_LOGGED_STATEMENT_LENGTH]})"
+        )
@@ -0,0 +1,99 @@
+"""SQL queries for streaming exports."""
+
+import uuid
+from collections.abc import AsyncIterator, Sequence
+
+from sqlalchemy import Select, or_, select
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models.invoice import Invoice
+from app.database.models.item import Item
+from app.database.models.user import User
+
+# Columns of every export row, in CSV order
+EXPORT_COLUMNS = [
+    "session_id",
+    "invoice_id",
+    "invoice_description",
+    "payer_id",
+    "item_id",
+    "item_description",
+    "debtor_id",
+    "debtor_name",
+    "unit_price",
+    "tip",
+    "total",
+    "paid_amount",
+    "is_paid",
+    "payment_id",
+]
+
+
+def _export_statement() -> Select:
+    return (
+        select(
+            Invoice.session_id,
+            Invoice.id.label("invoice_id"),
+            Invoice.description.label("invoice_description"),
+            Invoice.payer_id,
+            Item.id.label("item_id"),
+            Item.description.label("item_description"),
+            Item.debtor_id,
+            User.name.label("debtor_name"),
+            Item.unit_price,
+            Item.tip,
+            Item.total,
+            Item.paid_amount,
+            Item.is_paid,
+            Item.payment_id,
+        )
+        .join(Invoice, Item.invoice_id == Invoice.id)
+        .outerjoin(User, Item.debtor_id == User.id)
+        .order_by(Invoice.id, Item.id)
+    )
+
+
+def session_export_statement(session_id: uuid.UUID) -> Select:
+    """Select every item of a session with its invoice and debtor.
+
+    Args:
+        session_id: Session UUID
+
+    Returns:
+        Select statement yielding ``EXPORT_COLUMNS``
+    """
+    return _export_statement().where(Invoice.session_id == session_id)
+
+
+def user_export_statement(user_id: int) -> Select:
+    """Select every item a user consumed or paid for, across all sessions.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Select statement yielding ``EXPORT_COLUMNS``
+    """
+    return _export_statement().where(or_(Item.debtor_id == user_id, Invoice.payer_id == user_id))
+
+
+async def stream_export_batches(
+    db_session: AsyncSession, stmt: Select, batch_size: int
+) -> AsyncIterator[Sequence[RowMapping]]:
+    """Iterate over the rows of an export with a server-side cursor.
+
+    Only ``batch_size`` rows are held in memory at a time, however large the
+    export is.
+
+    Args:
+        db_session: Database session
+        stmt: Export statement
+        batch_size: Rows fetched per round trip
+
+    Yields:
+        Batches of rows
+    """
+    result = await db_session.stream(stmt.execution_options(yield_per=batch_size))
+    async for batch in result.mappings().partitions():
+        yield batch
@@ -5,6 +5,8 @@ from app.database.models.invoice import Invoice
 from app.database.models.item import Item
 from app.database.sql.user import get_user_by_phone_number
 from app.database.sql.session import get_active_session_by_user_id
+from app.core.events import publish_session_event
+from app.models.events import SessionEventType
 
 
 async def create_invoice_with_items(
@@ -40,4 +42,12 @@ async def create_invoice_with_items(
             db_session.add(db_item)
             items.append(db_item)
     await db_session.commit()
+    await publish_session_event(
+        SessionEventType.INVOICE_CREATED,
+        invoice.session_id,
+        invoice_id=invoice.id,
+        payer_id=invoice.payer_id,
+        total=float(invoice.total),
+        item_count=len(items),
+    )
     return invoice, items
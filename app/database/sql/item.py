@@ -0,0 +1,39 @@
+"""Item-related SQL operations."""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.events import publish_session_event
+from app.database.models.invoice import Invoice
+from app.database.models.item import Item
+from app.database.models.user import User
+from app.models.events import SessionEventType
+
+
+async def assign_item_to_debtor(db_session: AsyncSession, item: Item, debtor: User) -> Item:
+    """Assign an item to a debtor and notify the session's live subscribers.
+
+    Args:
+        db_session: Database session
+        item: Item to assign
+        debtor: User who consumed the item
+
+    Returns:
+        Updated item
+    """
+    item.debtor_id = debtor.id
+    await db_session.commit()
+    await db_session.refresh(item)
+
+    result = await db_session.execute(select(Invoice.session_id).where(Invoice.id == item.invoice_id))
+    session_id = result.scalar_one()
+    await publish_session_event(
+        SessionEventType.ITEM_ASSIGNED,
+        session_id,
+        item_id=item.id,
+        invoice_id=item.invoice_id,
+        debtor_id=debtor.id,
+        debtor_name=debtor.name,
+        total=float(item.total),
+    )
+    return item
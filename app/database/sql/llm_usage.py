@@ -0,0 +1,75 @@
+"""SQL queries for LLM usage accounting."""
+
+import uuid
+from datetime import date
+from typing import Any
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models.llm_usage import LLMUsage
+
+_ROLLUP_COLUMNS = (
+    LLMUsage.schema,
+    LLMUsage.model,
+    func.sum(LLMUsage.calls).label("calls"),
+    func.sum(LLMUsage.input_tokens).label("input_tokens"),
+    func.sum(LLMUsage.output_tokens).label("output_tokens"),
+    func.sum(LLMUsage.cached_tokens).label("cached_tokens"),
+    func.sum(LLMUsage.images).label("images"),
+    func.sum(LLMUsage.latency_ms).label("latency_ms"),
+    func.sum(LLMUsage.cost_usd).label("cost_usd"),
+    func.count(func.distinct(LLMUsage.message_id)).label("messages"),
+)
+
+
+async def save_llm_usage(db_session: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """Insert LLM usage rows in a single statement and commit.
+
+    Args:
+        db_session: Database session
+        rows: Column values of each row
+    """
+    if not rows:
+        return
+    await db_session.execute(insert(LLMUsage), rows)
+    await db_session.commit()
+
+
+async def get_session_llm_usage(db_session: AsyncSession, session_id: uuid.UUID) -> list[dict[str, Any]]:
+    """Get the LLM usage of a session, per output schema and model.
+
+    Args:
+        db_session: Database session
+        session_id: Session UUID
+
+    Returns:
+        One dict per schema and model with summed calls, tokens, latency and cost
+    """
+    result = await db_session.execute(
+        select(*_ROLLUP_COLUMNS)
+        .where(LLMUsage.session_id == session_id)
+        .group_by(LLMUsage.schema, LLMUsage.model)
+        .order_by(LLMUsage.schema, LLMUsage.model)
+    )
+    return [{"session_id": session_id, **row} for row in result.mappings()]
+
+
+async def get_daily_llm_usage(db_session: AsyncSession, start: date, end: date) -> list[dict[str, Any]]:
+    """Get the LLM usage per day, output schema and model.
+
+    Args:
+        db_session: Database session
+        start: First day, inclusive
+        end: Last day, inclusive
+
+    Returns:
+        One dict per day, schema and model with summed calls, tokens, latency and cost
+    """
+    result = await db_session.execute(
+        select(LLMUsage.day, *_ROLLUP_COLUMNS)
+        .where(LLMUsage.day.between(start, end))
+        .group_by(LLMUsage.day, LLMUsage.schema, LLMUsage.model)
+        .order_by(LLMUsage.day, LLMUsage.schema, LLMUsage.model)
+    )
+    return [dict(row) for row in result.mappings()]
@@ -1,12 +1,15 @@
 """Payment-related SQL operations."""
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import and_, select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import contains_eager, selectinload
 from app.database.models.payment import Payment
 from app.database.models.item import Item
 from app.database.models.invoice import Invoice
+from app.database.models.user import User
 from app.database.models.session import Session as SessionModel, session_users, SessionStatus
+from app.core.events import publish_session_event
+from app.models.events import SessionEventType
 
 
 async def get_pending_items_by_user_id(db_session: AsyncSession, user_id: int) -> list[Item]:
@@ -19,8 +22,6 @@ async def get_pending_items_by_user_id(db_session: AsyncSession, user_id: int) -
     Returns:
         List of items where the user is the debtor and is_paid is False
     """
-    from sqlalchemy import or_
-
     result = await db_session.execute(
         select(Item)
         .options(selectinload(Item.invoice).selectinload(Invoice.payer))
@@ -43,6 +44,53 @@ async def get_pending_items_by_user_id(db_session: AsyncSession, user_id: int) -
     return list(result.scalars().all())
 
 
+async def get_pending_items_owed_to_collector(db_session: AsyncSession, collector_id: int) -> list[Item]:
+    """Get every pending item owed to a collector in the collector's active session.
+
+    Resolves the active session, the debtors (session participants other than the
+    owner) and their unpaid items on invoices paid by the collector in a single
+    query, so collecting from a large table does not cost one query per debtor.
+
+    Args:
+        db_session: Database session
+        collector_id: ID of the collector (payer of the invoices)
+
+    Returns:
+        List of items with ``debtor`` and ``invoice`` loaded, ordered by debtor and invoice
+    """
+    active_session_ids = (
+        select(SessionModel.id)
+        .outerjoin(session_users, SessionModel.id == session_users.c.session_id)
+        .where(
+            SessionModel.status == SessionStatus.ACTIVE,
+            or_(SessionModel.owner_id == collector_id, session_users.c.user_id == collector_id),
+        )
+        .correlate(None)
+    )
+    result = await db_session.execute(
+        select(Item)
+        .join(Invoice, Item.invoice_id == Invoice.id)
+        .join(SessionModel, Invoice.session_id == SessionModel.id)
+        .join(User, Item.debtor_id == User.id)
+        .join(
+            session_users,
+            and_(
+                session_users.c.session_id == Invoice.session_id,
+                session_users.c.user_id == Item.debtor_id,
+            ),
+        )
+        .options(contains_eager(Item.invoice), contains_eager(Item.debtor))
+        .where(
+            Invoice.session_id.in_(active_session_ids),
+            Invoice.payer_id == collector_id,
+            Item.is_paid == False,
+            Item.debtor_id != SessionModel.owner_id,
+        )
+        .order_by(Item.debtor_id, Item.invoice_id, Item.id)
+    )
+    return list(result.scalars().all())
+
+
 async def process_payment(
     db_session: AsyncSession,
     payer_id: int,
@@ -93,14 +141,26 @@ async def process_payment(
         invoices_to_update[item.invoice_id] += item_total
 
     # Update invoice pending_amount
+    session_ids = set()
     for invoice_id, paid_amount in invoices_to_update.items():
         result = await db_session.execute(select(Invoice).filter(Invoice.id == invoice_id))
         invoice = result.scalar_one_or_none()
         if invoice:
+            session_ids.add(invoice.session_id)
             # Ensure both values are float before arithmetic
             current_pending = float(invoice.pending_amount)
             paid_amount_float = float(paid_amount)
             invoice.pending_amount = max(0.0, current_pending - paid_amount_float)
 
     await db_session.commit()
+    for session_id in session_ids:
+        await publish_session_event(
+            SessionEventType.PAYMENT_PROCESSED,
+            session_id,
+            payment_id=payment.id,
+            payer_id=payer_id,
+            receiver_id=receiver_id,
+            amount=float(amount),
+            item_ids=[item.id for item in items_to_pay],
+        )
     return payment
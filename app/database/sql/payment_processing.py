@@ -4,6 +4,8 @@ import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.core.events import publish_session_event
+from app.models.events import SessionEventType
 from app.models.payment_matching import PaymentMatchResult
 from app.database.models.item import Item
 from app.database.models.invoice import Invoice
@@ -136,6 +138,15 @@ async def process_payment_result(
     
     await db_session.commit()
     await db_session.refresh(payment)
+    await publish_session_event(
+        SessionEventType.PAYMENT_PROCESSED,
+        invoice.session_id,
+        payment_id=payment.id,
+        payer_id=user.id,
+        receiver_id=receiver_id,
+        amount=float(payment.amount),
+        item_ids=[item.id for item in paid_items],
+    )
     
     for item in paid_items:
         await db_session.refresh(item)
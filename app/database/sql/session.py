@@ -1,11 +1,31 @@
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, insert, or_
+from sqlalchemy import select, insert, or_, union
+from app.config import settings
+from app.core.events import publish_session_event
 from app.database.models.session import Session, SessionStatus, session_users
 from app.database.models.user import User
-from app.database.sql.user import get_user_by_phone_number, get_user_by_id
+from app.database.sql.user import get_user_by_phone_number
+from app.models.events import SessionEventType
+from app.database.versioning import bump_session_version
+from app.utils.cache import TTLCache
 import uuid
 
+# Short-lived cache of (user_id, phone_number) rosters keyed by session UUID.
+# Invalidated by join_session/close_session; the TTL bounds staleness across workers.
+_session_roster_cache: TTLCache[list[tuple[int, str]]] = TTLCache(
+    maxsize=settings.SESSION_ROSTER_CACHE_SIZE, ttl=settings.SESSION_ROSTER_CACHE_TTL, name="session_roster"
+)
+
+
+def invalidate_session_roster(session_id: str | uuid.UUID) -> None:
+    """Drop the cached roster of a session.
+
+    Args:
+        session_id: Session UUID as string or UUID object
+    """
+    _session_roster_cache.invalidate(uuid.UUID(str(session_id)))
+
 
 async def get_active_session_by_user_id(db_session: AsyncSession, user_id: int) -> Session | None:
     result = await db_session.execute(
@@ -40,42 +60,45 @@ async def has_active_session(db_session: AsyncSession, user_id: int) -> bool:
 async def get_all_session_users(db_session: AsyncSession, session_id: str | uuid.UUID) -> list[tuple[int, str]]:
     """Get all users (owner + participants) in a session.
 
+    Uses a single UNION query and caches the roster for a few seconds, since it is
+    needed on every invoice notification and session close.
+
     Args:
         db_session: Database session
         session_id: Session UUID as string or UUID object
 
     Returns:
         List of tuples (user_id, phone_number) for all users in the session
-    """
-    # Convert session_id to string if it's a UUID object (handles both Python UUID and asyncpg UUID)
-    if isinstance(session_id, str):
-        session_id_str = session_id
-        session_uuid = uuid.UUID(session_id)
-    else:
-        # It's a UUID object (Python UUID or asyncpg UUID) - convert to string first
-        session_id_str = str(session_id)
-        # Convert string to Python UUID for use in queries
-        session_uuid = uuid.UUID(session_id_str)
 
-    session = await get_session_by_id(db_session, session_id_str)
+    Raises:
+        ValueError: If session_id is not a valid UUID
+        NoResultFound: If the session does not exist
+    """
+    # str() handles both Python UUID and asyncpg UUID objects
+    try:
+        session_uuid = uuid.UUID(str(session_id))
+    except (ValueError, AttributeError) as e:
+        raise ValueError(f"Invalid session ID format: {session_id}") from e
 
-    # Get owner
-    owner = await get_user_by_id(db_session, session.owner_id)
-    users_list = [(owner.id, owner.phone_number)]
+    cached = _session_roster_cache.get(session_uuid)
+    if cached is not None:
+        return list(cached)
 
-    # Get all participants from session_users table
-    result = await db_session.execute(
+    owner = select(User.id, User.phone_number).join(Session, Session.owner_id == User.id).where(Session.id == session_uuid)
+    participants = (
         select(User.id, User.phone_number)
-        .select_from(session_users)
-        .join(User, session_users.c.user_id == User.id)
-        .where(
-            session_users.c.session_id == session_uuid,
-            session_users.c.user_id != session.owner_id,  # Exclude owner to avoid duplicates
-        )
+        .join(session_users, session_users.c.user_id == User.id)
+        .where(session_users.c.session_id == session_uuid)
     )
-    participants = result.all()
-    users_list.extend(participants)
-    return users_list
+    # UNION (not UNION ALL) removes the owner if it is also listed as a participant
+    result = await db_session.execute(union(owner, participants))
+    users_list = [(user_id, phone_number) for user_id, phone_number in result.all()]
+    if not users_list:
+        # Every session has an owner, so an empty roster means the session does not exist
+        raise NoResultFound(f"Session with ID {session_id} not found")
+
+    _session_roster_cache.set(session_uuid, users_list)
+    return list(users_list)
 
 
 async def get_all_session_debtors_from_active_session(db_session: AsyncSession, number: str) -> list[User]:
@@ -108,6 +131,8 @@ async def close_session(db_session: AsyncSession, session_id: str, user_phone: s
     session.status = SessionStatus.CLOSED
     await db_session.commit()
     await db_session.refresh(session)
+    invalidate_session_roster(session.id)
+    await publish_session_event(SessionEventType.SESSION_CLOSED, session.id, closed_by=user.id)
     return session
 
 
@@ -163,13 +188,18 @@ async def join_session(db_session: AsyncSession, session_id: str, user_phone: st
             # Only close if it's a different session
             if active_session and str(active_session.id) != session_id:
                 active_session.status = SessionStatus.CLOSED
+                invalidate_session_roster(active_session.id)
         except Exception:
             pass  # If there's an issue closing, continue
 
     # Add user to target session (many-to-many relationship)
     # Use insert directly on the association table to avoid lazy loading issues
     await db_session.execute(insert(session_users).values(session_id=session_uuid, user_id=user.id))
+    # Core inserts bypass the flush hook that bumps change versions
+    await bump_session_version(db_session, session_uuid)
     await db_session.commit()
     await db_session.refresh(target_session)
+    invalidate_session_roster(session_uuid)
+    await publish_session_event(SessionEventType.MEMBER_JOINED, session_uuid, user_id=user.id, name=user.name)
 
     return target_session, False
@@ -0,0 +1,116 @@
+"""SQL queries for the aggregated session overview."""
+
+import uuid
+from collections import defaultdict
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.database.models.invoice import Invoice
+from app.database.models.item import Item
+from app.database.models.payment import Payment
+from app.database.models.session import Session
+from app.database.models.user import User
+
+
+async def get_session_overview(db_session: AsyncSession, session_id: uuid.UUID) -> dict[str, Any] | None:
+    """Load everything needed to render a session page.
+
+    Always runs the same five queries, regardless of the number of invoices,
+    items or participants:
+    1. The session joined with its owner
+    2. Its participants (selectinload)
+    3. Its invoices joined with their payers
+    4. The items of those invoices joined with their debtors (selectinload)
+    5. The payments that settled any of those items
+
+    Args:
+        db_session: Database session
+        session_id: Session UUID
+
+    Returns:
+        dict with ``session``, ``participants``, ``invoices`` (with ``items``),
+        ``payments`` and ``balances``, or None if the session does not exist
+    """
+    session_result = await db_session.execute(
+        select(Session)
+        .options(joinedload(Session.owner), selectinload(Session.users))
+        .where(Session.id == session_id)
+    )
+    session = session_result.unique().scalar_one_or_none()
+    if session is None:
+        return None
+
+    invoice_result = await db_session.execute(
+        select(Invoice)
+        .options(
+            joinedload(Invoice.payer),
+            selectinload(Invoice.items).joinedload(Item.debtor),
+        )
+        .where(Invoice.session_id == session_id)
+        .order_by(Invoice.id)
+    )
+    invoices = list(invoice_result.unique().scalars().all())
+
+    session_payment_ids = (
+        select(Item.payment_id)
+        .join(Invoice, Item.invoice_id == Invoice.id)
+        .where(Invoice.session_id == session_id, Item.payment_id.is_not(None))
+    )
+    payment_result = await db_session.execute(
+        select(Payment).where(Payment.id.in_(session_payment_ids)).order_by(Payment.id)
+    )
+    payments = list(payment_result.scalars().all())
+
+    participants = {session.owner.id: session.owner}
+    participants.update((user.id, user) for user in session.users)
+    for invoice in invoices:
+        participants.setdefault(invoice.payer.id, invoice.payer)
+        for item in invoice.items:
+            if item.debtor is not None:
+                participants.setdefault(item.debtor.id, item.debtor)
+
+    return {
+        "session": session,
+        "participants": sorted(participants.values(), key=lambda user: user.id),
+        "invoices": invoices,
+        "payments": payments,
+        "balances": compute_session_balances(invoices, participants),
+    }
+
+
+def compute_session_balances(invoices: list[Invoice], participants: dict[int, User]) -> list[dict[str, Any]]:
+    """Compute what each participant owes and is owed within a session.
+
+    Only unpaid items assigned to someone other than the invoice payer count.
+
+    Args:
+        invoices: Session invoices with ``items`` loaded
+        participants: Session participants by user ID
+
+    Returns:
+        One dict per participant with ``user_id``, ``name``, ``owes``, ``owed``
+        and ``balance`` (positive when the user should receive money)
+    """
+    owes: dict[int, float] = defaultdict(float)
+    owed: dict[int, float] = defaultdict(float)
+    for invoice in invoices:
+        for item in invoice.items:
+            if item.is_paid or item.debtor_id is None or item.debtor_id == invoice.payer_id:
+                continue
+            pending = float(item.total) - float(item.paid_amount)
+            owes[item.debtor_id] += pending
+            owed[invoice.payer_id] += pending
+
+    return [
+        {
+            "user_id": user_id,
+            "name": user.name,
+            "owes": round(owes[user_id], 2),
+            "owed": round(owed[user_id], 2),
+            "balance": round(owed[user_id] - owes[user_id], 2),
+        }
+        for user_id, user in sorted(participants.items())
+    ]
@@ -0,0 +1,125 @@
+"""Per-session change versions.
+
+Every flush that writes a session, or an invoice, item or payment belonging to
+one, increments ``sessions.version`` in the same transaction. Read endpoints
+use the version as an ETag, so polling clients can be answered with a single
+indexed lookup instead of re-running the queries behind the response.
+
+Sessions whose version was bumped are reported to ``db_manager`` on commit,
+so reads about them skip the read replica for a short while
+(read-your-writes, see ``DatabaseManager.mark_session_write``).
+
+Writes that bypass the ORM unit of work (Core ``insert``/``update``
+statements) must call ``bump_session_version`` themselves.
+
+Example:
+    ```python
+    await db_session.execute(insert(session_users).values(session_id=session_id, user_id=user_id))
+    await bump_session_version(db_session, session_id)
+    await db_session.commit()
+    ```
+"""
+
+import uuid
+from itertools import chain
+from typing import Any
+
+from sqlalchemy import event, inspect, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session as OrmSession
+
+from app.database.database import db_manager
+from app.database.models.invoice import Invoice
+from app.database.models.item import Item
+from app.database.models.payment import Payment
+from app.database.models.session import Session
+
+# Session.info key collecting the sessions bumped in the current transaction
+WRITTEN_SESSIONS_KEY = "written_session_ids"
+
+
+async def bump_session_version(db_session: AsyncSession, session_id: uuid.UUID) -> None:
+    """Increment the change version of a session.
+
+    Args:
+        db_session: Database session
+        session_id: Session UUID
+    """
+    await db_session.execute(
+        update(Session).where(Session.id == session_id).values(version=Session.version + 1)
+    )
+    db_session.info.setdefault(WRITTEN_SESSIONS_KEY, set()).add(session_id)
+
+
+async def get_session_version(db_session: AsyncSession, session_id: uuid.UUID) -> int | None:
+    """Get the change version of a session.
+
+    Args:
+        db_session: Database session
+        session_id: Session UUID
+
+    Returns:
+        Current version, or None if the session does not exist
+    """
+    result = await db_session.execute(select(Session.version).where(Session.id == session_id))
+    return result.scalar_one_or_none()
+
+
+def _attribute_values(obj: Any, key: str) -> set[Any]:
+    """Current and previous values of an attribute, so moves bump both sides."""
+    history = inspect(obj).attrs[key].history
+    values = set(chain(history.added, history.unchanged, history.deleted))
+    values.add(getattr(obj, key))
+    values.discard(None)
+    return values
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _bump_versions_after_flush(session: OrmSession, flush_context: Any) -> None:
+    session_ids: set[Any] = set()
+    invoice_ids: set[Any] = set()
+    payment_ids: set[Any] = set()
+
+    # new/dirty/deleted still describe the flushed changes in after_flush
+    dirty = [obj for obj in session.dirty if session.is_modified(obj)]
+    for obj in chain(session.new, dirty, session.deleted):
+        if isinstance(obj, Session):
+            session_ids.add(obj.id)
+        elif isinstance(obj, Invoice):
+            session_ids |= _attribute_values(obj, "session_id")
+        elif isinstance(obj, Item):
+            invoice_ids |= _attribute_values(obj, "invoice_id")
+        elif isinstance(obj, Payment):
+            payment_ids.add(obj.id)
+
+    conditions = []
+    if session_ids:
+        conditions.append(Session.id.in_(session_ids))
+    if invoice_ids:
+        conditions.append(Session.id.in_(select(Invoice.session_id).where(Invoice.id.in_(invoice_ids))))
+    if payment_ids:
+        conditions.append(
+            Session.id.in_(
+                select(Invoice.session_id)
+                .join(Item, Item.invoice_id == Invoice.id)
+                .where(Item.payment_id.in_(payment_ids))
+            )
+        )
+    if not conditions:
+        return
+
+    written = session.connection().execute(
+        update(Session).where(or_(*conditions)).values(version=Session.version + 1).returning(Session.id)
+    )
+    session.info.setdefault(WRITTEN_SESSIONS_KEY, set()).update(written.scalars())
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _mark_written_sessions(session: OrmSession) -> None:
+    for session_id in session.info.pop(WRITTEN_SESSIONS_KEY, ()):
+        db_manager.mark_session_write(session_id)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _forget_written_sessions(session: OrmSession) -> None:
+    session.info.pop(WRITTEN_SESSIONS_KEY, None)
@@ -11,20 +11,66 @@ from app.models.kapso import (
     KapsoSection,
 )
 from app.config import settings
+from app.core.metrics import KAPSO_REQUEST_DURATION, KAPSO_REQUESTS
+from app.core.timing import timed
+import asyncio
+import logging
+import time
 import requests
 
 
-def send_kapso_request(endpoint: str, body: KapsoBody, method: str = "POST") -> None:
+def _kapso_url(endpoint: str) -> str:
     if not settings.KAPSO_URL or not settings.KAPSO_PHONE_NUMBER_ID:
         raise ValueError("KAPSO_URL and KAPSO_PHONE_NUMBER_ID must be configured")
-    
-    url = f"{settings.KAPSO_URL}/{settings.KAPSO_PHONE_NUMBER_ID}/{endpoint}"
+    return f"{settings.KAPSO_URL}/{settings.KAPSO_PHONE_NUMBER_ID}/{endpoint}"
+
+
+def _request_kapso(url: str, body: KapsoBody, method: str) -> requests.Response:
+    # Records nothing, so it can run in a worker thread
     headers = {
         "X-API-Key": settings.KAPSO_API_KEY,
         "Content-Type": "application/json",
     }
-    response = requests.request(method, url, headers=headers, json=body.model_dump())
-    response.raise_for_status()
+    return requests.request(method, url, headers=headers, json=body.model_dump())
+
+
+def _record_kapso_request(endpoint: str, seconds: float, response: requests.Response | None) -> None:
+    status = str(response.status_code) if response is not None else "error"  # connection failures have no status
+    KAPSO_REQUEST_DURATION.observe(seconds, endpoint)
+    KAPSO_REQUESTS.inc(endpoint, status)
+
+
+@timed("kapso.send")
+def send_kapso_request(endpoint: str, body: KapsoBody, method: str = "POST") -> None:
+    url = _kapso_url(endpoint)
+    start = time.perf_counter()
+    response = None
+    try:
+        response = _request_kapso(url, body, method)
+        response.raise_for_status()
+    finally:
+        _record_kapso_request(endpoint, time.perf_counter() - start, response)
+
+
+@timed("kapso.send")
+async def _send_kapso_request_in_thread(endpoint: str, body: KapsoBody, method: str = "POST") -> None:
+    # Timed and counted here, on the event loop: stage and metric recording is not thread-safe
+    url = _kapso_url(endpoint)
+    start = time.perf_counter()
+    response = None
+    try:
+        response = await asyncio.to_thread(_request_kapso, url, body, method)
+        response.raise_for_status()
+    finally:
+        _record_kapso_request(endpoint, time.perf_counter() - start, response)
+
+
+def _text_message_body(receiver: str, message: str) -> KapsoTextMessage:
+    return KapsoTextMessage(
+        to=receiver,
+        type=KapsoMessageType.TEXT,
+        text=KapsoBody(body=message),
+    )
 
 
 def send_text_message(receiver: str, message: str) -> None:
@@ -34,12 +80,7 @@ def send_text_message(receiver: str, message: str) -> None:
         receiver: Phone number of the receiver
         message: Text message to send
     """
-    body = KapsoTextMessage(
-        to=receiver,
-        type=KapsoMessageType.TEXT,
-        text=KapsoBody(body=message),
-    )
-    send_kapso_request("messages", body)
+    send_kapso_request("messages", _text_message_body(receiver, message))
 
 
 def send_text_message_to_multiple(receivers: list[str], message: str) -> None:
@@ -54,10 +95,29 @@ def send_text_message_to_multiple(receivers: list[str], message: str) -> None:
             send_text_message(receiver, message)
         except Exception as e:
             # Log error but continue sending to other users
-            import logging
             logging.error(f"Failed to send message to {receiver}: {e}")
 
 
+async def send_text_messages_concurrently(messages: list[tuple[str, str]]) -> None:
+    """Send several text messages concurrently.
+
+    Each HTTP call runs in a worker thread so the blocking calls overlap instead
+    of running one after the other on the event loop; they are timed on the loop.
+
+    Args:
+        messages: List of (receiver, message) tuples
+    """
+    bodies = [_text_message_body(receiver, message) for receiver, message in messages]
+    results = await asyncio.gather(
+        *(_send_kapso_request_in_thread("messages", body) for body in bodies),
+        return_exceptions=True,
+    )
+    for (receiver, _), result in zip(messages, results):
+        if isinstance(result, Exception):
+            # Log error but don't fail the other sends
+            logging.error(f"Failed to send message to {receiver}: {result}")
+
+
 def send_buttons_message(receiver: str, title: str, buttons: list[KapsoButton]) -> None:
     body = KapsoInteractiveMessage(
         to=receiver,
@@ -1,53 +1,42 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from collections import defaultdict
-from app.database.sql.session import get_all_session_debtors_from_active_session
+from app.database.models.item import Item
 from app.database.models.user import User
 from app.database.models.payment_method import PaymentMethod
-from app.database.sql.payment import get_pending_items_by_user_id
-from app.integrations.kapso import send_text_message
-from app.database.sql.payment_methods import get_user_payment_methods
+from app.database.sql.payment import get_pending_items_owed_to_collector
+from app.integrations.kapso import send_text_messages_concurrently
 
 
-async def build_collection_message(
-    db_session: AsyncSession, user: User, collector_id: int, collector_payment_methods: list[PaymentMethod]
+def build_collection_message(
+    items: list[Item], collector_name: str, collector_payment_methods: list[PaymentMethod]
 ) -> str:
-    """Build a collection message for a user showing all their pending debts to a specific collector.
+    """Build a collection message for a debtor showing all their pending debts to a specific collector.
 
     Args:
-        db_session: Database session
-        user: User to build the message for (debtor)
-        collector_id: ID of the collector (person who triggered collect and is the payer)
+        items: Pending items of a single debtor owed to the collector (with ``invoice`` loaded)
+        collector_name: Name of the collector (payer of the invoices)
         collector_payment_methods: Payment methods of the collector
 
     Returns:
         Formatted message string with debts grouped by invoice
     """
-    # Get all pending items for this user
-    all_items = await get_pending_items_by_user_id(db_session, user.id)
-    
-    # Filter items to only show those where the collector is the payer
-    items = [item for item in all_items if item.invoice.payer_id == collector_id]
-
     if not items:
         return "No tienes deudas pendientes con esta persona."
 
     # Group items by invoice
     items_by_invoice = defaultdict(list)
     for item in items:
-        items_by_invoice[item.invoice].append(item)
+        items_by_invoice[item.invoice_id].append(item)
 
     # Build message parts
     message_parts = []
 
-    for invoice, invoice_items in items_by_invoice.items():
+    for invoice_items in items_by_invoice.values():
         # Calculate total from all items for this invoice
         total_from_all_items = sum(float(item.total) for item in invoice_items)
 
-        # Get payer name
-        payer_name = invoice.payer.name
-
         # Build the header for this invoice
-        message_parts.append(f"Le debes a {payer_name} {total_from_all_items:.2f}:")
+        message_parts.append(f"Le debes a {collector_name} {total_from_all_items:.2f}:")
 
         # Build bullet list of items
         for item in invoice_items:
@@ -76,19 +65,32 @@ async def build_collection_message(
 
 
 async def send_collection_message_to_all_debtors(
-    db_session: AsyncSession, number: str, collector_id: int, collector_payment_methods: list[PaymentMethod]
+    db_session: AsyncSession, collector: User, collector_payment_methods: list[PaymentMethod]
 ) -> None:
     """Send collection messages to all debtors in the active session who owe money to the collector.
-    
+
+    All pending items owed to the collector are loaded with a single query, grouped
+    by debtor, and the resulting messages are dispatched concurrently.
+
     Args:
         db_session: Database session
-        number: Phone number of the user who triggered collect
-        collector_id: ID of the collector (person who triggered collect)
+        collector: User who triggered collect
         collector_payment_methods: Payment methods of the collector
     """
-    users = await get_all_session_debtors_from_active_session(db_session, number)
-    for user in users:
-        message = await build_collection_message(db_session, user, collector_id, collector_payment_methods)
-        # Only send message if there are debts to show
-        if message != "No tienes deudas pendientes con esta persona.":
-            send_text_message(user.phone_number, message)
+    items = await get_pending_items_owed_to_collector(db_session, collector.id)
+
+    # Group items by debtor (rows come ordered by debtor and invoice)
+    items_by_debtor: dict[int, list[Item]] = defaultdict(list)
+    debtors: dict[int, User] = {}
+    for item in items:
+        items_by_debtor[item.debtor_id].append(item)
+        debtors[item.debtor_id] = item.debtor
+
+    messages = [
+        (
+            debtors[debtor_id].phone_number,
+            build_collection_message(debtor_items, collector.name, collector_payment_methods),
+        )
+        for debtor_id, debtor_items in items_by_debtor.items()
+    ]
+    await send_text_messages_concurrently(messages)
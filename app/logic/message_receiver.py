@@ -1,11 +1,20 @@
+import asyncio
 import logging
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy import select
 from app.services.ocr_service import download_image_from_url, scan_receipt
 from app.models.kapso import KapsoImage, KapsoBody, KapsoConversation
-from app.models.receipt import ReceiptExtraction, TransferExtraction, ReceiptDocumentType
+from app.models.receipt import DocumentExtraction, ReceiptExtraction, TransferExtraction, ReceiptDocumentType
+from app.models.payment_matching import PaymentIntent
+from app.database.models.item import Item
 from app.database.sql.invoice import create_invoice_with_items
+from app.database.sql.item import assign_item_to_debtor
 from app.integrations.kapso import send_text_message
+from app.core.events import publish_session_event
+from app.core.timing import span, timed
+from app.services.llm_usage import attribute_llm_usage
+from app.services.llm_gate import LLMUnavailableError
+from app.models.events import SessionEventType
 from sqlalchemy.orm.exc import MultipleResultsFound
 from app.utils.messages import (
     TOO_MANY_ACTIVE_SESSIONS_MESSAGE,
@@ -31,6 +40,7 @@ from app.database.sql.user import get_user_by_phone_number, create_user
 from app.logic.message_sender import send_message_to_all_session_users
 
 
+@timed("db.check_user")
 async def check_existing_user_logic(db_session: AsyncSession, conversation: KapsoConversation) -> None:
     logging.info(f"Checking existing user for conversation: {conversation}")
     current_user = await get_user_by_phone_number(db_session, conversation.phone_number)
@@ -66,7 +76,9 @@ async def handle_receipt(db_session: AsyncSession, receipt: ReceiptExtraction, s
 
     tip = round(receipt.tip / receipt.total_amount, 2)
     try:
-        invoice, items = await create_invoice_with_items(db_session, receipt, tip, sender)
+        with span("db.create_invoice"):
+            invoice, items = await create_invoice_with_items(db_session, receipt, tip, sender)
+        attribute_llm_usage(invoice.session_id)
         await send_message_to_all_session_users(
             db_session, invoice.session_id, build_invoice_created_message(invoice, items)
         )
@@ -79,6 +91,7 @@ async def handle_receipt(db_session: AsyncSession, receipt: ReceiptExtraction, s
         return
 
 
+@timed("payment.transfer")
 async def handle_transfer(db_session: AsyncSession, transfer: TransferExtraction, sender: str) -> None:
     user = await get_user_by_phone_number(db_session, sender)
     if not user:
@@ -206,6 +219,15 @@ async def handle_transfer(db_session: AsyncSession, transfer: TransferExtraction
                     invoice.pending_amount = max(0.0, current_pending - paid_amount_float)
 
             await db_session.commit()
+            await publish_session_event(
+                SessionEventType.PAYMENT_PROCESSED,
+                first_invoice.session_id,
+                payment_id=payment.id,
+                payer_id=user.id,
+                receiver_id=receiver_id,
+                amount=transfer_amount,
+                item_ids=[item.id for item in items_to_pay],
+            )
 
             fully_paid = sum(1 for item in items_to_pay if item.is_paid)
             partial_paid = len(items_to_pay) - fully_paid
@@ -239,6 +261,21 @@ async def handle_transfer(db_session: AsyncSession, transfer: TransferExtraction
         send_text_message(sender, f"❌ Error al procesar el pago: {str(e)}. Por favor, intenta nuevamente.")
 
 
+async def _scan_image(image: KapsoImage) -> DocumentExtraction:
+    """Download an image and extract its document."""
+    with span("payment.scan"):
+        image_content, mime_type = await download_image_from_url(image.link)
+        return await scan_receipt(image_content, mime_type)
+
+
+async def _cancel_tasks(*tasks: asyncio.Task | None) -> None:
+    """Cancel tasks that are still running and wait for them, discarding their results or errors."""
+    tasks = [task for task in tasks if task is not None]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
 async def handle_payment_with_context(
     db_session: AsyncSession, image: KapsoImage, sender: str, context_message: str | None = None
 ) -> None:
@@ -246,10 +283,16 @@ async def handle_payment_with_context(
 
     When user sends a message like "pagué una bebida y una pizza" with a transfer image,
     this function:
-    1. Extracts payment intent from the message
-    2. Processes the image to get payment amount
-    3. Matches items using AI
-    4. Processes the payment with proper logic (exact/more/less)
+    1. Processes the image to get payment amount, while extracting the payment
+       intent from the message and fetching the unpaid items of the session
+    2. Matches items using AI
+    3. Processes the payment with proper logic (exact/more/less)
+
+    Download + OCR and intent extraction are independent LLM-bound steps, so
+    they run as concurrent tasks and the database prefetch runs meanwhile on
+    this coroutine (the database session can't be shared across tasks). The
+    reply then waits for the slowest of them rather than their sum. The
+    intent is cancelled if the image is not a transfer.
 
     Args:
         db_session: Database session
@@ -258,15 +301,31 @@ async def handle_payment_with_context(
         context_message: Optional message describing what was paid
     """
     from app.services.payment_agent import extract_payment_intent_from_message
-    from app.services.payment_matcher import match_payment_to_items
+    from app.services.payment_matcher import match_payment_to_items, payment_matcher
     from app.database.sql.payment_processing import process_payment_result, get_payment_summary
 
-    # Download and process image
-    image_content, mime_type = await download_image_from_url(image.link)
-    ocr_result = await scan_receipt(image_content, mime_type)
+    async def extract_intent() -> PaymentIntent:
+        with span("payment.intent"):
+            return await extract_payment_intent_from_message(context_message)
+
+    scan_task = asyncio.create_task(_scan_image(image))
+    intent_task = asyncio.create_task(extract_intent()) if context_message else None
+    try:
+        has_session = False
+        unpaid_items: list[Item] = []
+        if context_message:
+            with span("payment.prefetch"):
+                has_session = await check_user_has_active_session(db_session, sender)
+                if has_session:
+                    unpaid_items = await payment_matcher.get_session_unpaid_items(db_session, sender)
+        ocr_result = await scan_task
+    except BaseException:
+        await _cancel_tasks(scan_task, intent_task)
+        raise
 
     # Only handle transfer documents for payment matching
     if ocr_result.document_type != ReceiptDocumentType.TRANSFER:
+        await _cancel_tasks(intent_task)
         # Fall back to regular receipt handling
         if ocr_result.document_type == ReceiptDocumentType.RECEIPT:
             await handle_receipt(db_session, ocr_result.receipt, sender)
@@ -275,19 +334,19 @@ async def handle_payment_with_context(
     transfer = ocr_result.transfer
 
     # If no context message, use old flow
-    if not context_message:
+    if intent_task is None:
         await handle_transfer(db_session, transfer, sender)
         return
 
     # Check if user has active session
-    if not await check_user_has_active_session(db_session, sender):
+    if not has_session:
+        await _cancel_tasks(intent_task)
         send_text_message(sender, NO_ACTIVE_SESSION_MESSAGE)
         return
 
     try:
         # Extract payment intent from message
-        logging.info(f"Extracting payment intent from message: {context_message}")
-        payment_intent = await extract_payment_intent_from_message(context_message)
+        payment_intent = await intent_task
 
         if not payment_intent.is_payment or not payment_intent.items_paid:
             logging.warning("Message is not a payment intent, falling back to old flow")
@@ -302,6 +361,7 @@ async def handle_payment_with_context(
             sender,
             payment_intent,
             transfer.amount,
+            available_items=unpaid_items,
         )
 
         logging.info(f"Payment match result: {payment_match}")
@@ -315,17 +375,20 @@ async def handle_payment_with_context(
             return
 
         # Process payment
-        paid_items, remainder_item = await process_payment_result(
-            db_session,
-            payment_match,
-            sender,
-            payment_description=f"Pago: {context_message[:100]}",
-        )
+        with span("db.process_payment"):
+            paid_items, remainder_item = await process_payment_result(
+                db_session,
+                payment_match,
+                sender,
+                payment_description=f"Pago: {context_message[:100]}",
+            )
 
         # Send summary
         summary = await get_payment_summary(db_session, paid_items, remainder_item)
         send_text_message(sender, summary)
 
+    except LLMUnavailableError:
+        raise
     except Exception as e:
         logging.error(f"Error processing payment with context: {e}", exc_info=True)
         send_text_message(
@@ -369,7 +432,8 @@ async def handle_voice_message(db_session: AsyncSession, conversation: KapsoConv
     logging.info(f"Procesando transcripción de voz: {transcript[:100]}...")
 
     # Procesar la transcripción con el agente, igual que handle_text_message
-    action_to_execute = await process_user_command(transcript)
+    with span("agent.command"):
+        action_to_execute = await process_user_command(transcript)
     if action_to_execute.action == ActionType.CREATE_SESSION:
         session = await create_session(db_session, action_to_execute.create_session_data.description, sender)
         send_text_message(sender, build_session_id_link(session.id))
@@ -390,13 +454,16 @@ async def parse_payment_method_from_message(message: str) -> tuple[str, str] | N
     from app.services.payment_method_agent import extract_payment_method_from_message
     
     try:
-        result = await extract_payment_method_from_message(message)
+        with span("agent.payment_method"):
+            result = await extract_payment_method_from_message(message)
         
         # Only return if AI detected it's a payment method
         if result.is_payment_method and result.bank_name and result.description:
             return (result.bank_name, result.description)
         
         return None
+    except LLMUnavailableError:
+        raise
     except Exception as e:
         logging.error(f"Error parsing payment method with AI: {e}", exc_info=True)
         return None
@@ -428,7 +495,8 @@ async def handle_text_message(db_session: AsyncSession, message_body: KapsoBody,
                 send_text_message(sender, f"❌ Error al agregar el método de pago: {str(e)}")
                 return
 
-    action_to_execute = await process_user_command(text_content)
+    with span("agent.command"):
+        action_to_execute = await process_user_command(text_content)
 
     if action_to_execute.action == ActionType.QUERY_DEBT_STATUS:
         # Handle debt status query
@@ -481,6 +549,8 @@ async def handle_text_message(db_session: AsyncSession, message_body: KapsoBody,
 
             # Close the session (this will verify ownership)
             closed_session = await close_session(db_session, session_id, sender)
+            # The session is no longer active once the message is done
+            attribute_llm_usage(closed_session.id)
 
             # Get owner info
             owner_user = await get_user_by_phone_number(db_session, sender)
@@ -627,9 +697,7 @@ async def handle_text_message(db_session: AsyncSession, message_body: KapsoBody,
             return
 
         # Assign the item by updating debtor_id
-        item.debtor_id = assigned_user.id
-        await db_session.commit()
-        await db_session.refresh(item)
+        item = await assign_item_to_debtor(db_session, item, assigned_user)
 
         # Send confirmation message
         message = f"✅ Item '{item.description}' asignado a {assigned_user.name} (${item.total:.2f})"
@@ -669,7 +737,7 @@ async def handle_text_message(db_session: AsyncSession, message_body: KapsoBody,
             return
         
         # Send collection messages to all debtors with collector's payment methods
-        await send_collection_message_to_all_debtors(db_session, sender, collector_user.id, collector_payment_methods)
+        await send_collection_message_to_all_debtors(db_session, collector_user, collector_payment_methods)
         
         # Send confirmation to collector
         confirmation_parts = [
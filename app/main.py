@@ -7,13 +7,21 @@ from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 
+from app.api.v1.pagination import PAGINATION_HEADERS
 from app.config import settings
+from app.core.events import event_broker
+from app.core.executor import cpu_pool
+from app.core.http_client import http_client
 from app.core.logging import setup_logging
 from app.database import db_manager
 from app.routers.deps import get_db
+from app.middleware.compression import CompressionMiddleware
 from app.middleware.error_handler import error_handler_middleware
 from app.middleware.logging_middleware import logging_middleware
+from app.middleware.profiling_middleware import profiling_middleware
 from app.routers.webhooks.kapso import router as kapso_router
+from app.routers.metrics import router as metrics_router
+from app.routers.admin import router as admin_router
 from app.api.v1.router import api_router
 
 # Setup logging
@@ -25,12 +33,17 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     """Application lifespan manager.
 
     Handles startup and shutdown events for the FastAPI application.
-    - Startup: Initialize database engine and session factory
-    - Shutdown: Dispose database engine and close all connections
+    - Startup: Initialize database engine and session factory, start the event broker
+    - Shutdown: Stop the event broker, close the shared HTTP client, stop the CPU worker pool,
+      dispose database engine and close all connections
     """
     # Startup: Connect to database
     await db_manager.connect()
+    await event_broker.start()
     yield
+    await event_broker.stop()
+    await http_client.stop()
+    cpu_pool.stop()
     await db_manager.disconnect()
 
 
@@ -50,16 +63,29 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[*PAGINATION_HEADERS, "ETag"],
+)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    compresslevel=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
 )
 
 
 # Add custom middlewares
+if settings.PROFILING_ENABLED:
+    app.middleware("http")(profiling_middleware)
 app.middleware("http")(logging_middleware)
 app.middleware("http")(error_handler_middleware)
 
 # Include API routers
 app.include_router(api_router, prefix="/api/v1")
 app.include_router(kapso_router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
+if settings.PROFILING_ENABLED:
+    app.include_router(admin_router)
 
 
 # Scalar documentation endpoint
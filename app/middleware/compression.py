@@ -0,0 +1,82 @@
+"""Response compression middleware.
+
+Compresses responses of at least ``COMPRESSION_MINIMUM_SIZE`` bytes with
+Brotli when the client accepts it and the optional ``brotli`` package is
+installed (``pip install .[compression]``), and with GZip otherwise. Streaming
+responses are compressed chunk by chunk. Server-Sent Events and already
+compressed media types are left untouched.
+"""
+
+from typing import Any
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES, GZipMiddleware, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+class BrotliResponder(IdentityResponder):
+    """Responder that encodes the response body with Brotli."""
+
+    content_encoding = "br"
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        quality: int = 4,
+        *,
+        exclude_content_types: tuple[str, ...] = DEFAULT_EXCLUDED_CONTENT_TYPES,
+    ) -> None:
+        super().__init__(app, minimum_size, exclude_content_types=exclude_content_types)
+        self.quality = quality
+        self._compressor: Any = None
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = brotli.Compressor(quality=self.quality)
+        chunk = self._compressor.process(body)
+        # Flush every streamed chunk so clients can decode it right away
+        return chunk + (self._compressor.flush() if more_body else self._compressor.finish())
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """GZip middleware that prefers Brotli when available.
+
+    Args:
+        app: ASGI application
+        minimum_size: Smallest response body, in bytes, worth compressing
+        compresslevel: GZip compression level (1-9)
+        brotli_quality: Brotli quality (0-11); low values favour speed
+
+    Example:
+        ```python
+        app.add_middleware(CompressionMiddleware, minimum_size=1024)
+        ```
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        compresslevel: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and brotli is not None and "br" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = BrotliResponder(
+                self.app,
+                self.minimum_size,
+                quality=self.brotli_quality,
+                exclude_content_types=self.exclude_content_types,
+            )
+            await responder(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
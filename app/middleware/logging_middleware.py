@@ -6,6 +6,8 @@ from collections.abc import Callable
 from fastapi import Request, Response
 
 from app.core.logging import get_logger
+from app.core.metrics import HTTP_REQUEST_DURATION
+from app.database.query_stats import report_request_queries, track_queries
 
 logger = get_logger(__name__)
 
@@ -25,17 +27,25 @@ async def logging_middleware(request: Request, call_next: Callable) -> Response:
     # Log request
     logger.info(f"Request: {request.method} {request.url.path}")
 
-    # Process request
-    response = await call_next(request)
+    # Process request, counting the SQL statements it runs
+    with track_queries() as query_stats:
+        response = await call_next(request)
 
     # Calculate processing time
     process_time = time.time() - start_time
 
+    # Label by route template so path parameters don't create a series per ID
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    HTTP_REQUEST_DURATION.observe(process_time, request.method, route, str(response.status_code))
+    report_request_queries(query_stats, route)
+
     # Log response
     logger.info(
         f"Response: {request.method} {request.url.path} "
         f"Status: {response.status_code} "
-        f"Duration: {process_time:.3f}s"
+        f"Duration: {process_time:.3f}s "
+        f"Queries: {query_stats.count} "
+        f"DB: {query_stats.total_seconds:.3f}s"
     )
 
     # Add processing time to response headers
@@ -0,0 +1,22 @@
+"""Profiling middleware for opt-in request profiling."""
+
+from collections.abc import Callable
+
+from fastapi import Request, Response
+
+from app.core.profiling import PROFILE_TOKEN_HEADER, profile_call, should_profile
+
+
+async def profiling_middleware(request: Request, call_next: Callable) -> Response:
+    """Profile requests signed with ``X-Profile-Token`` or picked by the sample rate.
+
+    Args:
+        request: FastAPI request object
+        call_next: Next middleware or route handler
+
+    Returns:
+        Response: Response from the route handler
+    """
+    if not should_profile(request.headers.get(PROFILE_TOKEN_HEADER)):
+        return await call_next(request)
+    return await profile_call(request.method, request.url.path, call_next(request))
@@ -0,0 +1,31 @@
+"""Live session event schemas."""
+
+import uuid
+from datetime import datetime, timezone
+from enum import StrEnum
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class SessionEventType(StrEnum):
+    INVOICE_CREATED = "invoice_created"
+    ITEM_ASSIGNED = "item_assigned"
+    PAYMENT_PROCESSED = "payment_processed"
+    SESSION_CLOSED = "session_closed"
+    MEMBER_JOINED = "member_joined"
+    # Sent to a subscriber that fell behind and lost events: refetch the session
+    RESYNC = "resync"
+
+
+class SessionEvent(BaseModel):
+    """Change to a session, pushed to its live subscribers.
+
+    Payloads only carry identifiers and amounts; clients fetch details from the
+    REST API. Keep them small, the Postgres backend is limited to 8000 bytes.
+    """
+
+    type: SessionEventType
+    session_id: uuid.UUID
+    data: dict[str, Any] = Field(default_factory=dict)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,58 @@
+"""Admin endpoints for diagnosing production performance."""
+
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+from pydantic import BaseModel
+
+from app.config import settings
+from app.core.profiling import PROFILE_TOKEN_HEADER, is_valid_profile_token, list_profiles
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+class ProfileOut(BaseModel):
+    """Saved request profile."""
+
+    name: str
+    size: int
+    created_at: datetime
+
+
+def require_profile_token(x_profile_token: str | None = Header(default=None, alias=PROFILE_TOKEN_HEADER)) -> None:
+    """Reject requests without a valid ``X-Profile-Token`` header.
+
+    Raises:
+        HTTPException: If the token is missing or invalid
+    """
+    if not is_valid_profile_token(x_profile_token):
+        raise HTTPException(status_code=401, detail="Invalid profile token")
+
+
+@router.get("/profiles", response_model=list[ProfileOut], dependencies=[Depends(require_profile_token)])
+async def get_profiles():
+    """List saved request profiles, most recent first.
+
+    Returns:
+        Profiles with name, size and creation time
+    """
+    return list_profiles()
+
+
+@router.get("/profiles/{name}", dependencies=[Depends(require_profile_token)])
+async def get_profile(name: str) -> FileResponse:
+    """Download a profile in collapsed stack format.
+
+    Args:
+        name: Profile file name, as listed by ``/admin/profiles``
+
+    Returns:
+        FileResponse: Collapsed stacks, loadable in speedscope
+
+    Raises:
+        HTTPException: If the profile does not exist
+    """
+    if name not in {profile["name"] for profile in list_profiles()}:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(f"{settings.PROFILING_DIR}/{name}", media_type="text/plain", filename=name)
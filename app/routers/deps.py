@@ -1,7 +1,9 @@
 """API dependencies for dependency injection."""
 
+import uuid
 from collections.abc import AsyncGenerator
 
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import db_manager
@@ -28,3 +30,40 @@ async def get_db() -> AsyncGenerator[AsyncSession]:
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession]:
+    """Get read-only database session dependency.
+
+    Routes to the read replica when one is configured. Requests about a
+    session (a ``session_id`` path parameter) that was written recently, and
+    users identified by the ``X-User-Phone`` header who wrote recently, are
+    served from the primary so recent changes are always visible.
+
+    Args:
+        request: Incoming request
+
+    Yields:
+        AsyncSession: Read-only database session for the request
+
+    Example:
+        ```python
+        @router.get("/items")
+        async def get_items(db: AsyncSession = Depends(get_read_db)):
+            result = await db.execute(select(Item))
+            return result.scalars().all()
+        ```
+    """
+    session_id = request.path_params.get("session_id")
+    try:
+        # Same form as the writes are recorded in, whatever the casing or hyphens of the URL
+        session_id = uuid.UUID(str(session_id)) if session_id is not None else None
+    except ValueError:
+        session_id = None  # rejected by the endpoint's validation
+    session_maker = db_manager.read_sessionmaker(request.headers.get("X-User-Phone"), session_id)
+    async with session_maker() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
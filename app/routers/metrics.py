@@ -0,0 +1,68 @@
+"""Prometheus metrics endpoint."""
+
+from collections.abc import Iterator
+
+from fastapi import APIRouter, Response
+
+from app.core.metrics import MetricSamples, gauge_samples, registry
+from app.database import db_manager
+from app.services.agent.prompt import AGENT_PROMPT_VERSION
+from app.utils.cache import named_caches
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _collect_db_pool() -> Iterator[MetricSamples]:
+    if db_manager.engine is None:
+        return
+    status = db_manager.pool_status()
+    pools = [("primary", status)]
+    if "replica" in status:
+        pools.append(("replica", status["replica"]))
+
+    for name, key, metric_type, help in (
+        ("db_pool_size", "pool_size", "gauge", "Configured connection pool size"),
+        ("db_pool_checked_out", "checked_out", "gauge", "Connections currently in use"),
+        ("db_pool_overflow", "overflow", "gauge", "Connections open beyond the pool size"),
+        ("db_pool_checkouts_total", "checkouts", "counter", "Connections checked out of the pool"),
+        ("db_pool_checkout_wait_seconds_total", "wait_seconds_total", "counter", "Time spent waiting for a connection"),
+        ("db_pool_checkout_wait_seconds_max", "wait_seconds_max", "gauge", "Longest wait for a connection"),
+    ):
+        yield name, metric_type, help, gauge_samples(({"pool": pool}, values.get(key)) for pool, values in pools)
+
+
+def _collect_caches() -> Iterator[MetricSamples]:
+    caches = list(named_caches.items())
+    yield (
+        "cache_requests_total",
+        "counter",
+        "In-process cache lookups by result",
+        [({"cache": name, "result": "hit"}, cache.hits) for name, cache in caches]
+        + [({"cache": name, "result": "miss"}, cache.misses) for name, cache in caches],
+    )
+    yield "cache_entries", "gauge", "Entries held by in-process caches", [
+        ({"cache": name}, len(cache)) for name, cache in caches
+    ]
+
+
+def _collect_agent_prompt() -> Iterator[MetricSamples]:
+    yield "agent_prompt_info", "gauge", "Version (hash) of the agent prompt in use", [
+        ({"version": AGENT_PROMPT_VERSION}, 1.0)
+    ]
+
+
+registry.add_collector(_collect_db_pool)
+registry.add_collector(_collect_caches)
+registry.add_collector(_collect_agent_prompt)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Expose application metrics in the Prometheus text format.
+
+    Returns:
+        Response: Metrics of this worker process
+    """
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -8,32 +8,65 @@ from app.logic.message_receiver import (
     check_existing_user_logic,
 )
 from app.database import db_manager
+from app.core.metrics import WEBHOOK_MESSAGES
+from app.core.timing import message_trace
+from app.services.llm_usage import track_llm_usage
+from app.services.llm_gate import LLMUnavailableError
+from app.integrations.kapso import send_text_message
+from app.utils.messages import LLM_UNAVAILABLE_MESSAGE
 
 router = APIRouter(prefix="/webhooks/kapso")
 
 logger = logging.getLogger(__name__)
 
 
+def _message_type(payload: KapsoWebhookMessageReceived) -> str:
+    if payload.message.is_image():
+        return "image"
+    if payload.message.is_text():
+        return "text"
+    if payload.message.is_audio():
+        return "audio"
+    return "other"
+
+
 @router.post("/received", status_code=200)
 async def kapso_received_webhook(request: Request, payload: KapsoWebhookMessageReceived):
-    async with db_manager.sessionmaker()() as db_session:
-        await check_existing_user_logic(db_session, payload.conversation)
-        
-        if payload.message.is_image():
-            # Try to get context from last message
-            context_message = None
-            if payload.conversation.kapso and payload.conversation.kapso.last_message_text:
-                context_message = payload.conversation.kapso.last_message_text
-                logger.info(f"Using context from last message: {context_message}")
-            
-            await handle_payment_with_context(
-                db_session,
-                payload.message.image,
-                payload.message.sender,
-                context_message=context_message,
-            )
-        elif payload.message.is_text():
-            await handle_text_message(db_session, payload.message.text, payload.message.sender)
-        elif payload.message.is_audio():
-            await handle_voice_message(db_session, payload.conversation, payload.message.sender)
+    # Webhook handlers write on behalf of the sender; keep their API reads on the primary
+    # while the message is processed and for a short window afterwards
+    db_manager.mark_write(payload.message.sender)
+    message_type = _message_type(payload)
+    WEBHOOK_MESSAGES.inc(message_type)
+    try:
+        # Logs one line with the per-stage breakdown of the message
+        with message_trace(message_type, message_id=payload.message.id):
+            async with (
+                track_llm_usage(payload.message.id, payload.message.sender),
+                db_manager.sessionmaker()() as db_session,
+            ):
+                await check_existing_user_logic(db_session, payload.conversation)
+
+                if payload.message.is_image():
+                    # Try to get context from last message
+                    context_message = None
+                    if payload.conversation.kapso and payload.conversation.kapso.last_message_text:
+                        context_message = payload.conversation.kapso.last_message_text
+                        logger.info(f"Using context from last message: {context_message}")
+
+                    await handle_payment_with_context(
+                        db_session,
+                        payload.message.image,
+                        payload.message.sender,
+                        context_message=context_message,
+                    )
+                elif payload.message.is_text():
+                    await handle_text_message(db_session, payload.message.text, payload.message.sender)
+                elif payload.message.is_audio():
+                    await handle_voice_message(db_session, payload.conversation, payload.message.sender)
+    except LLMUnavailableError as e:
+        # The LLM provider is failing or saturated: answer now rather than queueing the message
+        logger.warning(f"Message {payload.message.id} not processed: {e}")
+        send_text_message(payload.message.sender, LLM_UNAVAILABLE_MESSAGE)
+    finally:
+        db_manager.mark_write(payload.message.sender)
     return Response(status_code=200)
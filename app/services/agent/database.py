@@ -6,6 +6,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.models import Item, Session, User
+from app.database.sql.item import assign_item_to_debtor
 
 logger = logging.getLogger(__name__)
 
@@ -185,10 +186,7 @@ async def assign_item_to_user_in_db(
         raise ValueError("Either item_id or item_description must be provided")
 
     # Update the item's debtor_id
-    item.debtor_id = user.id
-    db.add(item)
-    await db.commit()
-    await db.refresh(item)
+    item = await assign_item_to_debtor(db, item, user)
 
     logger.info(
         f"Assigned item {item.id} to user {user.id} ({user.name}). "
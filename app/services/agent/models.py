@@ -27,6 +27,7 @@ def initialize_openai_model(temperature: float = 0.2) -> ChatOpenAI:
     return ChatOpenAI(
         model="gpt-4o-mini",
         api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
         temperature=temperature,
         max_tokens=2048,
     )
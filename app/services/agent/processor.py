@@ -1,21 +1,57 @@
 """Agent command processor."""
 
 import logging
+import re
+import unicodedata
 
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import HumanMessage, SystemMessage
 
+from app.config import settings
 from app.services.agent.models import initialize_openai_model
-from app.services.agent.prompt import get_agent_prompt
+from app.services.agent.prompt import get_agent_prompt, get_agent_prompt_version
 from app.models.text_agent import AgentActionSchema
+from app.services.llm_fixtures import ainvoke_llm
+from app.services.llm_gate import LLMUnavailableError
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Agent decisions keyed by normalized command text, tagged with the prompt version
+# that produced them. Commands like "cuánto debo?" repeat a lot across users.
+_command_cache: TTLCache[tuple[str, AgentActionSchema]] = TTLCache(
+    maxsize=settings.AGENT_COMMAND_CACHE_SIZE, ttl=settings.AGENT_COMMAND_CACHE_TTL, name="agent_command"
+)
+
+
+def normalize_command(user_text: str) -> str:
+    """Normalize a command so near-identical texts share a cache entry.
+
+    Lowercases, strips accents, and collapses punctuation and whitespace:
+    "¿Cuánto  debo?" and "cuanto debo" both become "cuanto debo".
+
+    Args:
+        user_text: User's command in natural language
+
+    Returns:
+        str: Normalized command
+    """
+    folded = unicodedata.normalize("NFKD", user_text.casefold())
+    folded = "".join(char for char in folded if not unicodedata.combining(char))
+    return " ".join(re.findall(r"\w+", folded))
+
+
+def clear_command_cache() -> None:
+    """Forget all cached agent decisions."""
+    _command_cache.clear()
+
 
 async def process_user_command(user_text: str) -> AgentActionSchema:
     """Process user command in natural language and determine action to take.
 
     Uses OpenAI with structured outputs to classify the intent and extract
-    necessary data for the action.
+    necessary data for the action. Decisions are cached by normalized text,
+    so repeated commands skip the LLM until the entry expires or the prompt
+    changes.
 
     Args:
         user_text: User's command in natural language
@@ -27,21 +63,28 @@ async def process_user_command(user_text: str) -> AgentActionSchema:
         ValueError: If API key is missing or response is invalid
         RuntimeError: If OpenAI API returns an error
     """
+    key = normalize_command(user_text)
+    prompt_version = get_agent_prompt_version()
+    cached = _command_cache.get(key) if key else None
+    if cached is not None:
+        cached_version, cached_result = cached
+        if cached_version == prompt_version:
+            logger.info(f"Agent decision cache hit: action={cached_result.action.value}")
+            return cached_result.model_copy(deep=True)
+        _command_cache.invalidate(key)
+
     try:
         # Initialize model
         model = initialize_openai_model()
 
-        # Get structured prompt
-        prompt = get_agent_prompt()
-
-        # Create message with user text
-        message = HumanMessage(content=f"{prompt}\n\nTEXTO DEL USUARIO:\n{user_text}")
+        # Static instructions first so the provider can cache the prompt prefix
+        messages = [SystemMessage(content=get_agent_prompt()), HumanMessage(content=user_text)]
 
         logger.info(f"Processing user command: {user_text[:100]}...")
 
         # Configure model with structured output
         structured_model = model.with_structured_output(AgentActionSchema)
-        result = await structured_model.ainvoke([message])
+        result = await ainvoke_llm(structured_model, messages, "agent_action")
 
         logger.info(
             f"Agent decision: action={result.action.value}, "
@@ -50,10 +93,12 @@ async def process_user_command(user_text: str) -> AgentActionSchema:
             f"has_assign_item_to_user_data={result.assign_item_to_user_data is not None}"
         )
 
+        if key:
+            _command_cache.set(key, (prompt_version, result.model_copy(deep=True)))
         return result
 
-    except ValueError as e:
-        # Re-raise validation errors
+    except (ValueError, LLMUnavailableError):
+        # Re-raise validation errors, and gate rejections for the webhook to answer
         raise
     except Exception as e:
         logger.error(f"Error calling OpenAI API via LangChain: {str(e)}", exc_info=True)
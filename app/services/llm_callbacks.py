@@ -0,0 +1,131 @@
+"""LangChain callbacks recording LLM call metrics and usage.
+
+Pass ``llm_config(schema)`` as the ``config`` of every ``ainvoke`` so calls are
+counted, timed and their token usage attributed to the output schema and, when
+handling a WhatsApp message, to that message (see ``app.services.llm_usage``).
+
+Example:
+    ```python
+    result = await structured_model.ainvoke([message], config=llm_config("agent_action"))
+    ```
+"""
+
+import time
+import uuid
+from typing import Any
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_core.runnables import RunnableConfig
+
+from app.core.metrics import LLM_REQUEST_DURATION, LLM_REQUESTS, LLM_TOKENS
+from app.services.llm_usage import record_llm_call
+
+
+def _token_usage(response: LLMResult) -> tuple[int, int, int]:
+    """Input, output and cached input tokens reported by the provider, 0 if unknown."""
+    input_tokens = output_tokens = cached_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            if isinstance(generation, ChatGeneration) and generation.message.usage_metadata:
+                usage_metadata = generation.message.usage_metadata
+                input_tokens += usage_metadata.get("input_tokens", 0)
+                output_tokens += usage_metadata.get("output_tokens", 0)
+                cached_tokens += (usage_metadata.get("input_token_details") or {}).get("cache_read", 0)
+    if not input_tokens and not output_tokens and response.llm_output:
+        usage = response.llm_output.get("token_usage") or {}
+        input_tokens = usage.get("prompt_tokens", 0)
+        output_tokens = usage.get("completion_tokens", 0)
+    return input_tokens, output_tokens, cached_tokens
+
+
+def _count_images(messages: list[list[Any]]) -> int:
+    """Number of image parts in the prompt messages."""
+    return sum(
+        1
+        for batch in messages
+        for message in batch
+        if isinstance(message.content, list)
+        for part in message.content
+        if isinstance(part, dict) and part.get("type") == "image_url"
+    )
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """Record count, latency and token usage of the LLM calls of a chain.
+
+    OpenAI reports image tokens as part of the input tokens; the number of
+    images sent is recorded separately.
+
+    Args:
+        schema: Output schema the calls are attributed to
+    """
+
+    # Bookkeeping only, no need to hop to a worker thread
+    run_inline = True
+
+    def __init__(self, schema: str) -> None:
+        """Initialize the callback.
+
+        Args:
+            schema: Output schema the calls are attributed to
+        """
+        self.schema = schema
+        self._runs: dict[uuid.UUID, tuple[float, str, int]] = {}
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list[list[Any]],
+        *,
+        run_id: uuid.UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        model = (metadata or {}).get("ls_model_name") or "unknown"
+        self._runs[run_id] = (time.perf_counter(), model, _count_images(messages))
+
+    def on_llm_start(
+        self,
+        serialized: dict[str, Any],
+        prompts: list[str],
+        *,
+        run_id: uuid.UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        model = (metadata or {}).get("ls_model_name") or "unknown"
+        self._runs[run_id] = (time.perf_counter(), model, 0)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: uuid.UUID, **kwargs: Any) -> None:
+        input_tokens, output_tokens, cached_tokens = _token_usage(response)
+        self._finish(
+            run_id, "ok", input_tokens=input_tokens, output_tokens=output_tokens, cached_tokens=cached_tokens
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: uuid.UUID, **kwargs: Any) -> None:
+        self._finish(run_id, "error")
+
+    def _finish(self, run_id: uuid.UUID, status: str, **tokens: int) -> None:
+        started_at, model, images = self._runs.pop(run_id, (None, "unknown", 0))
+        latency = time.perf_counter() - started_at if started_at is not None else 0.0
+        if started_at is not None:
+            LLM_REQUEST_DURATION.observe(latency, self.schema)
+        LLM_REQUESTS.inc(self.schema, model, status)
+        for kind in ("input", "output", "cached"):
+            if tokens.get(f"{kind}_tokens"):
+                LLM_TOKENS.inc(self.schema, model, kind, amount=tokens[f"{kind}_tokens"])
+        # Failed calls are counted too, without tokens
+        record_llm_call(self.schema, model, images=images, latency_ms=latency * 1000, **tokens)
+
+
+def llm_config(schema: str) -> RunnableConfig:
+    """Runnable config recording metrics for the calls of a chain.
+
+    Args:
+        schema: Output schema the calls are attributed to (e.g. "receipt")
+
+    Returns:
+        RunnableConfig to pass to ``ainvoke``
+    """
+    return {"callbacks": [LLMMetricsCallback(schema)]}
@@ -0,0 +1,205 @@
+"""Record and replay of LLM calls.
+
+Every LLM call goes through ``ainvoke_llm``. Depending on
+``LLM_FIXTURES_MODE`` (or ``use_llm_fixtures`` in tests) it:
+
+- ``off``: calls the model.
+- ``record``: calls the model and saves the structured output to a fixture.
+- ``replay``: serves the saved output without any network access, raising
+  ``LLMFixtureNotFoundError`` when there is none.
+- ``auto``: replays when a fixture exists, records otherwise.
+
+Fixtures are JSON files under ``LLM_FIXTURES_DIR``, one per output schema and
+input, named after a hash of the normalized prompt: the messages actually
+sent (prompt templates rendered), with whitespace collapsed and images
+replaced by the hash of their content. Editing a prompt therefore changes
+the key, and the flow needs recording again.
+
+Example:
+    ```python
+    result = await ainvoke_llm(structured_model, [message], "agent_action")
+
+    with use_llm_fixtures("replay", "tests/fixtures/llm"):
+        await handle_text_message(db_session, message_body, sender)
+    ```
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Literal
+
+from langchain_core.messages import BaseMessage, HumanMessage, convert_to_messages
+from langchain_core.prompts import BasePromptTemplate
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel
+
+from app.config import settings
+from app.services.llm_callbacks import llm_config
+from app.services.llm_gate import llm_gate
+
+logger = logging.getLogger(__name__)
+
+FixtureMode = Literal["off", "record", "replay", "auto"]
+
+# Characters of the last message kept in a fixture to tell what it answers
+PREVIEW_LENGTH = 300
+
+
+class LLMFixtureNotFoundError(LookupError):
+    """No recorded output for an LLM call in replay mode."""
+
+
+_override: ContextVar[tuple[FixtureMode, Path] | None] = ContextVar("llm_fixtures", default=None)
+
+
+@contextmanager
+def use_llm_fixtures(mode: FixtureMode, directory: str | Path) -> Iterator[None]:
+    """Record or replay the LLM calls made inside the block, whatever the settings say.
+
+    Args:
+        mode: Fixture mode
+        directory: Fixture directory
+    """
+    token = _override.set((mode, Path(directory)))
+    try:
+        yield
+    finally:
+        _override.reset(token)
+
+
+def _current() -> tuple[FixtureMode, Path]:
+    return _override.get() or (settings.LLM_FIXTURES_MODE, Path(settings.LLM_FIXTURES_DIR))
+
+
+def _collapse(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _normalize_content(content: str | list[Any]) -> str | list[Any]:
+    if isinstance(content, str):
+        return _collapse(content)
+    parts = []
+    for part in content:
+        if isinstance(part, dict) and part.get("type") == "image_url":
+            url = part["image_url"]["url"] if isinstance(part["image_url"], dict) else part["image_url"]
+            parts.append({"image_sha256": hashlib.sha256(url.encode()).hexdigest()})
+        elif isinstance(part, dict) and part.get("type") == "text":
+            parts.append(_collapse(part["text"]))
+        else:
+            parts.append(part)
+    return parts
+
+
+def prompt_messages(runnable: Runnable, input: Any) -> list[BaseMessage]:
+    """Messages a runnable sends to the model for an input.
+
+    Args:
+        runnable: Chain starting with a prompt template, or a model taking messages
+        input: Input passed to ``ainvoke``
+
+    Returns:
+        Prompt messages
+    """
+    first = getattr(runnable, "first", None)
+    if isinstance(first, BasePromptTemplate):
+        return first.invoke(input).to_messages()
+    if isinstance(input, str):
+        return [HumanMessage(content=input)]
+    return convert_to_messages(input)
+
+
+def normalize_prompt(messages: list[BaseMessage]) -> list[dict[str, Any]]:
+    """Prompt messages in a stable, compact form: collapsed whitespace and hashed images."""
+    return [{"role": message.type, "content": _normalize_content(message.content)} for message in messages]
+
+
+def fixture_key(schema: str, messages: list[BaseMessage]) -> str:
+    """Hash identifying an LLM call.
+
+    Args:
+        schema: Output schema of the call
+        messages: Prompt messages
+
+    Returns:
+        Hex digest of the schema and normalized prompt
+    """
+    payload = json.dumps({"schema": schema, "messages": normalize_prompt(messages)}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def fixture_path(directory: Path, schema: str, key: str) -> Path:
+    """File of a fixture."""
+    return directory / schema / f"{key}.json"
+
+
+def _dump_output(output: Any) -> dict[str, Any]:
+    if isinstance(output, BaseModel):
+        output_type = f"{type(output).__module__}:{type(output).__qualname__}"
+        return {"output_type": output_type, "output": output.model_dump(mode="json")}
+    return {"output_type": None, "output": output}
+
+
+def _load_output(fixture: dict[str, Any]) -> Any:
+    if fixture["output_type"] is None:
+        return fixture["output"]
+    module_name, _, qualname = fixture["output_type"].partition(":")
+    output_class: Any = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        output_class = getattr(output_class, name)
+    return output_class.model_validate(fixture["output"])
+
+
+def save_fixture(path: Path, schema: str, key: str, messages: list[BaseMessage], output: Any) -> None:
+    """Write the output of an LLM call to a fixture file."""
+    last = normalize_prompt(messages[-1:])[0]["content"] if messages else ""
+    preview = last if isinstance(last, str) else " ".join(part for part in last if isinstance(part, str))
+    fixture = {"schema": schema, "key": key, "input_preview": preview[-PREVIEW_LENGTH:], **_dump_output(output)}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(fixture, indent=2, ensure_ascii=False) + "\n")
+
+
+async def _call(runnable: Runnable, input: Any, schema: str) -> Any:
+    async with llm_gate(runnable):
+        return await runnable.ainvoke(input, config=llm_config(schema))
+
+
+async def ainvoke_llm(runnable: Runnable, input: Any, schema: str) -> Any:
+    """Invoke an LLM chain through its model's gate, recording or replaying its output.
+
+    Replayed calls skip the gate, since they don't reach the provider.
+
+    Args:
+        runnable: Structured output model or chain
+        input: Messages, or the variables of the chain's prompt template
+        schema: Output schema of the call (e.g. "receipt")
+
+    Returns:
+        Output of the chain
+
+    Raises:
+        LLMFixtureNotFoundError: In replay mode, if the call was never recorded
+        LLMUnavailableError: If the model's gate rejects the call
+    """
+    mode, directory = _current()
+    if mode == "off":
+        return await _call(runnable, input, schema)
+
+    messages = prompt_messages(runnable, input)
+    key = fixture_key(schema, messages)
+    path = fixture_path(directory, schema, key)
+    if mode in ("replay", "auto") and path.is_file():
+        return _load_output(json.loads(path.read_text()))
+    if mode == "replay":
+        raise LLMFixtureNotFoundError(f"No recorded {schema} output at {path}; record it with LLM_FIXTURES_MODE=record")
+
+    output = await _call(runnable, input, schema)
+    save_fixture(path, schema, key, messages, output)
+    logger.info(f"Recorded {schema} LLM output to {path}")
+    return output
@@ -0,0 +1,361 @@
+"""Gate bounding the LLM calls made to each model.
+
+Every LLM call (``ainvoke_llm``) goes through the gate of its model, which:
+
+- Limits in-flight calls (``LLM_MAX_CONCURRENT_CALLS``); calls waiting
+  longer than ``LLM_QUEUE_TIMEOUT`` for a slot fail instead of piling up.
+- Rate limits calls to the provider quota (``LLM_REQUESTS_PER_MINUTE``) with
+  a token bucket, within the same queue timeout.
+- Opens a circuit breaker when the share of provider failures (connection
+  errors, timeouts, rate limits and 5xx) over the last
+  ``LLM_CIRCUIT_WINDOW`` seconds reaches ``LLM_CIRCUIT_FAILURE_RATIO``: calls
+  then fail immediately for ``LLM_CIRCUIT_COOLDOWN`` seconds, after which a
+  single probe call decides whether to close it.
+
+Rejected calls raise ``LLMUnavailableError``, which the webhook turns into a
+"try again later" reply. Limits are per worker process.
+
+Example:
+    ```python
+    async with llm_gate(runnable):
+        result = await runnable.ainvoke(input)
+    ```
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import openai
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+
+from app.config import settings
+from app.core.metrics import LLM_GATE_REJECTIONS, LLM_GATE_WAIT, MetricSamples, registry
+
+# Errors meaning the provider is unhealthy, as opposed to a bad request or output
+PROVIDER_FAILURES = (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError, TimeoutError)
+
+
+class LLMUnavailableError(RuntimeError):
+    """An LLM call was rejected by the gate without reaching the provider.
+
+    Args:
+        model: Model of the call
+        reason: "circuit_open", "queue_timeout" or "rate_limited"
+    """
+
+    def __init__(self, model: str, reason: str) -> None:
+        """Initialize the error.
+
+        Args:
+            model: Model of the call
+            reason: "circuit_open", "queue_timeout" or "rate_limited"
+        """
+        super().__init__(f"LLM {model} unavailable: {reason}")
+        self.model = model
+        self.reason = reason
+
+
+class TokenBucket:
+    """Token bucket handing out calls at a steady rate, with bursts up to ``capacity``.
+
+    Callers reserve a token up front and sleep until it is available, so
+    waiting calls are served in order.
+
+    Args:
+        rate: Tokens added per second
+        capacity: Maximum tokens stored
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens stored
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+
+    async def acquire(self, deadline: float) -> bool:
+        """Take a token, waiting for it if needed.
+
+        Args:
+            deadline: ``time.monotonic()`` time after which to give up
+
+        Returns:
+            bool: False if the token would only be available after the deadline
+        """
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0
+        if now + wait > deadline:
+            return False
+        self._tokens -= 1
+        if wait:
+            await asyncio.sleep(wait)
+        return True
+
+
+class CircuitBreaker:
+    """Stop calling a failing provider for a while.
+
+    Closed, it records the outcome of each call and opens when at least
+    ``failure_ratio`` of the calls of the last ``window`` seconds failed (and
+    there were ``min_calls`` of them). Open, it rejects calls; every
+    ``cooldown`` seconds it lets one probe through, whose success closes it.
+
+    ``allow`` hands each admitted call a ticket to pass back to ``record``.
+    Tickets are numbered by state: opening the circuit or sending a probe
+    starts a new number, so the late outcomes of calls admitted earlier (or
+    of a superseded probe) are dropped and only the current probe can change
+    an open circuit.
+
+    Args:
+        failure_ratio: Share of failed calls that opens the circuit, 0 to never open
+        min_calls: Calls needed in the window before opening
+        window: Seconds of calls considered
+        cooldown: Seconds between probes while open
+    """
+
+    def __init__(self, failure_ratio: float, min_calls: int, window: float, cooldown: float) -> None:
+        """Initialize a closed circuit.
+
+        Args:
+            failure_ratio: Share of failed calls that opens the circuit, 0 to never open
+            min_calls: Calls needed in the window before opening
+            window: Seconds of calls considered
+            cooldown: Seconds between probes while open
+        """
+        self.failure_ratio = failure_ratio
+        self.min_calls = min_calls
+        self.window = window
+        self.cooldown = cooldown
+        self.opened_at: float | None = None
+        self._ticket = 0
+        self._outcomes: deque[tuple[float, bool]] = deque()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are being rejected."""
+        return self.opened_at is not None
+
+    def allow(self) -> int | None:
+        """Admit a call; while open, lets one probe through per cooldown.
+
+        Returns:
+            int | None: Ticket to pass to ``record``, or None if the call is rejected
+        """
+        if self.opened_at is None:
+            return self._ticket
+        now = time.monotonic()
+        if now - self.opened_at < self.cooldown:
+            return None
+        self.opened_at = now
+        self._ticket += 1
+        return self._ticket
+
+    def record(self, ticket: int, failed: bool) -> None:
+        """Record the outcome of a call.
+
+        Args:
+            ticket: Ticket the call was admitted with
+            failed: Whether the provider failed
+        """
+        if ticket != self._ticket:
+            # Admitted before the circuit opened, or a probe superseded by a newer one
+            return
+        now = time.monotonic()
+        if self.opened_at is not None:
+            # Outcome of the probe
+            if failed:
+                self.opened_at = now
+            else:
+                self.opened_at = None
+                self._outcomes.clear()
+            return
+
+        self._outcomes.append((now, failed))
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            self._outcomes.popleft()
+        failures = sum(failed for _, failed in self._outcomes)
+        if (
+            self.failure_ratio > 0
+            and len(self._outcomes) >= self.min_calls
+            and failures >= self.failure_ratio * len(self._outcomes)
+        ):
+            self.opened_at = now
+            self._ticket += 1
+
+
+class ModelGate:
+    """Concurrency limit, rate limit and circuit breaker of one model.
+
+    Args:
+        model: Model name
+        max_concurrent_calls: In-flight calls allowed, 0 for no limit
+        queue_timeout: Seconds a call may wait for a slot
+        requests_per_minute: Rate limit, None for no limit
+        breaker: Circuit breaker of the model
+    """
+
+    def __init__(
+        self,
+        model: str,
+        max_concurrent_calls: int,
+        queue_timeout: float,
+        requests_per_minute: float | None,
+        breaker: CircuitBreaker,
+    ) -> None:
+        """Initialize the gate.
+
+        Args:
+            model: Model name
+            max_concurrent_calls: In-flight calls allowed, 0 for no limit
+            queue_timeout: Seconds a call may wait for a slot
+            requests_per_minute: Rate limit, None for no limit
+            breaker: Circuit breaker of the model
+        """
+        self.model = model
+        self.queue_timeout = queue_timeout
+        self.breaker = breaker
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent_calls) if max_concurrent_calls > 0 else None
+        self._bucket = (
+            TokenBucket(requests_per_minute / 60, max(1.0, requests_per_minute / 60)) if requests_per_minute else None
+        )
+
+    def _reject(self, reason: str) -> LLMUnavailableError:
+        LLM_GATE_REJECTIONS.inc(self.model, reason)
+        return LLMUnavailableError(self.model, reason)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait for a slot to call the model, and record the outcome of the call.
+
+        Raises:
+            LLMUnavailableError: If the circuit is open or no slot frees up in time
+        """
+        ticket = self.breaker.allow()
+        if ticket is None:
+            raise self._reject("circuit_open")
+
+        started_at = time.monotonic()
+        deadline = started_at + self.queue_timeout
+        self.waiting += 1
+        try:
+            if self._semaphore is not None:
+                try:
+                    async with asyncio.timeout(self.queue_timeout):
+                        await self._semaphore.acquire()
+                except TimeoutError:
+                    raise self._reject("queue_timeout") from None
+            try:
+                if self._bucket is not None and not await self._bucket.acquire(deadline):
+                    raise self._reject("rate_limited")
+            except BaseException:
+                if self._semaphore is not None:
+                    self._semaphore.release()
+                raise
+        finally:
+            self.waiting -= 1
+        LLM_GATE_WAIT.observe(time.monotonic() - started_at, self.model)
+
+        self.in_flight += 1
+        try:
+            yield
+        except PROVIDER_FAILURES:
+            self.breaker.record(ticket, failed=True)
+            raise
+        except Exception:
+            # The provider answered; the request or its output was the problem
+            self.breaker.record(ticket, failed=False)
+            raise
+        else:
+            self.breaker.record(ticket, failed=False)
+        finally:
+            self.in_flight -= 1
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+
+_gates: dict[str, ModelGate] = {}
+
+
+def get_model_gate(model: str) -> ModelGate:
+    """Get the gate of a model, created from the settings on first use.
+
+    Args:
+        model: Model name
+
+    Returns:
+        ModelGate: Gate shared by all calls to the model in this process
+    """
+    gate = _gates.get(model)
+    if gate is None:
+        breaker = CircuitBreaker(
+            settings.LLM_CIRCUIT_FAILURE_RATIO,
+            settings.LLM_CIRCUIT_MIN_CALLS,
+            settings.LLM_CIRCUIT_WINDOW,
+            settings.LLM_CIRCUIT_COOLDOWN,
+        )
+        gate = _gates[model] = ModelGate(
+            model,
+            settings.LLM_MAX_CONCURRENT_CALLS,
+            settings.LLM_QUEUE_TIMEOUT,
+            settings.LLM_REQUESTS_PER_MINUTE.get(model),
+            breaker,
+        )
+    return gate
+
+
+def _chat_models(runnable: Any) -> Iterator[BaseChatModel]:
+    """Chat models inside a chain, looking through sequences and bindings."""
+    if isinstance(runnable, BaseChatModel):
+        yield runnable
+    for step in getattr(runnable, "steps", None) or ():
+        yield from _chat_models(step)
+    bound = getattr(runnable, "bound", None)
+    if bound is not None:
+        yield from _chat_models(bound)
+
+
+def model_name(runnable: Runnable) -> str:
+    """Name of the model a chain calls, "unknown" if it has none."""
+    for model in _chat_models(runnable):
+        return getattr(model, "model_name", None) or getattr(model, "model", None) or type(model).__name__
+    return "unknown"
+
+
+@asynccontextmanager
+async def llm_gate(runnable: Runnable) -> AsyncIterator[None]:
+    """Wait for a slot to call the model of a chain.
+
+    Args:
+        runnable: Chain about to be invoked
+
+    Raises:
+        LLMUnavailableError: If the call is rejected
+    """
+    async with get_model_gate(model_name(runnable)).slot():
+        yield
+
+
+def _collect_gates() -> Iterator[MetricSamples]:
+    gates = list(_gates.values())
+    yield "llm_gate_in_flight", "gauge", "LLM calls in flight", [({"model": g.model}, g.in_flight) for g in gates]
+    yield "llm_gate_waiting", "gauge", "LLM calls waiting for a slot", [({"model": g.model}, g.waiting) for g in gates]
+    yield "llm_circuit_open", "gauge", "Whether the circuit breaker of the model is open", [
+        ({"model": g.model}, float(g.breaker.is_open)) for g in gates
+    ]
+
+
+registry.add_collector(_collect_gates)
@@ -0,0 +1,188 @@
+"""LLM token and cost accounting per WhatsApp message.
+
+The webhook handles each message inside ``track_llm_usage``. Every LLM call
+made meanwhile is reported by ``LLMMetricsCallback`` and added to the
+message's usage, aggregated per output schema and model. When the message is
+done, even if handling it failed, one ``llm_usage`` row per schema and model
+is persisted, attributed to the Kapso message ID, the sender and their active
+session.
+
+Example:
+    ```python
+    async with track_llm_usage(message.id, message.sender):
+        await handle_text_message(db_session, message.text, message.sender)
+    ```
+"""
+
+import logging
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy.orm.exc import MultipleResultsFound
+
+from app.config import settings
+from app.database import db_manager
+from app.database.sql.llm_usage import save_llm_usage
+from app.database.sql.session import get_active_session_by_user_id
+from app.database.sql.user import get_user_by_phone_number
+
+logger = logging.getLogger(__name__)
+
+USAGE_FIELDS = ("calls", "input_tokens", "output_tokens", "cached_tokens", "images", "latency_ms")
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int, cached_tokens: int = 0) -> float:
+    """Estimate the cost of LLM calls from ``LLM_PRICES_PER_MILLION_TOKENS``.
+
+    Args:
+        model: Model name
+        input_tokens: Prompt tokens, including cached ones
+        output_tokens: Completion tokens
+        cached_tokens: Prompt tokens served from the provider's prompt cache
+
+    Returns:
+        Cost in US dollars, 0 for models without a configured price
+    """
+    prices = settings.LLM_PRICES_PER_MILLION_TOKENS.get(model)
+    if not prices:
+        return 0.0
+    input_price, output_price = prices[0], prices[1]
+    cached_price = prices[2] if len(prices) > 2 else input_price
+    uncached_tokens = max(input_tokens - cached_tokens, 0)
+    return (uncached_tokens * input_price + cached_tokens * cached_price + output_tokens * output_price) / 1_000_000
+
+
+class MessageUsage:
+    """LLM usage accumulated while handling one message.
+
+    Args:
+        message_id: Kapso message ID
+        user_phone: Phone number of the sender
+    """
+
+    def __init__(self, message_id: str | None, user_phone: str | None) -> None:
+        """Initialize empty usage.
+
+        Args:
+            message_id: Kapso message ID
+            user_phone: Phone number of the sender
+        """
+        self.message_id = message_id
+        self.user_phone = user_phone
+        self.user_id: int | None = None
+        self.session_id: uuid.UUID | None = None
+        self.started_at = datetime.now(timezone.utc)
+        self.totals: dict[tuple[str, str], dict[str, float]] = {}
+
+    def add(self, schema: str, model: str, **usage: float) -> None:
+        """Add the usage of one LLM call.
+
+        Args:
+            schema: Output schema of the call
+            model: Model name
+            **usage: Values of ``USAGE_FIELDS`` other than ``calls``
+        """
+        totals = self.totals.setdefault((schema, model), dict.fromkeys(USAGE_FIELDS, 0))
+        totals["calls"] += 1
+        for field, value in usage.items():
+            totals[field] += value
+
+    def rows(self) -> list[dict[str, Any]]:
+        """One ``llm_usage`` row per schema and model."""
+        return [
+            {
+                "message_id": self.message_id,
+                "user_id": self.user_id,
+                "session_id": self.session_id,
+                "day": self.started_at.date(),
+                "schema": schema,
+                "model": model,
+                **{field: totals[field] for field in USAGE_FIELDS},
+                "latency_ms": round(totals["latency_ms"], 1),
+                "cost_usd": estimate_cost(
+                    model, int(totals["input_tokens"]), int(totals["output_tokens"]), int(totals["cached_tokens"])
+                ),
+            }
+            for (schema, model), totals in self.totals.items()
+        ]
+
+
+_current_usage: ContextVar[MessageUsage | None] = ContextVar("llm_usage", default=None)
+
+
+@asynccontextmanager
+async def track_llm_usage(message_id: str | None, user_phone: str | None) -> AsyncIterator[MessageUsage]:
+    """Attribute the LLM calls made inside the block to a message and save them on exit.
+
+    Args:
+        message_id: Kapso message ID
+        user_phone: Phone number of the sender
+
+    Yields:
+        MessageUsage: Usage collected so far
+    """
+    usage = MessageUsage(message_id, user_phone)
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+        await save_message_usage(usage)
+
+
+def record_llm_call(schema: str, model: str, **usage: float) -> None:
+    """Add an LLM call to the current message, if any.
+
+    Args:
+        schema: Output schema of the call
+        model: Model name
+        **usage: Values of ``USAGE_FIELDS`` other than ``calls``
+    """
+    current = _current_usage.get()
+    if current is not None:
+        current.add(schema, model, **usage)
+
+
+def attribute_llm_usage(session_id: uuid.UUID | None = None) -> None:
+    """Attribute the current message to a session.
+
+    Call it where the session is known for sure, for example right after
+    creating an invoice. Otherwise the sender's active session is used.
+
+    Args:
+        session_id: Session UUID
+    """
+    current = _current_usage.get()
+    if current is not None and session_id is not None:
+        current.session_id = session_id
+
+
+async def save_message_usage(usage: MessageUsage) -> None:
+    """Persist the usage of a message, logging instead of raising on failure.
+
+    Uses its own database session, so it works even when the handler left
+    its session in a failed state.
+
+    Args:
+        usage: Usage collected by ``track_llm_usage``
+    """
+    if not usage.totals:
+        return
+    try:
+        async with db_manager.sessionmaker()() as db_session:
+            if usage.user_id is None and usage.user_phone:
+                user = await get_user_by_phone_number(db_session, usage.user_phone)
+                usage.user_id = user.id if user else None
+            if usage.session_id is None and usage.user_id is not None:
+                try:
+                    session = await get_active_session_by_user_id(db_session, usage.user_id)
+                    usage.session_id = session.id if session else None
+                except MultipleResultsFound:
+                    pass
+            await save_llm_usage(db_session, usage.rows())
+    except Exception as e:
+        logger.error(f"Error saving LLM usage of message {usage.message_id}: {e}")
@@ -0,0 +1,196 @@
+"""Optional local OCR pre-pass for document images.
+
+With ``LOCAL_OCR_ENABLED``, ``scan_receipt`` first reads the image text
+with Tesseract (``pip install .[ocr]`` plus the ``tesseract`` binary with
+the ``LOCAL_OCR_LANGUAGE`` language data). Tesseract is CPU-bound, so it
+runs in the shared worker pool (``app/core/executor.py``), outside the event
+loop. The text is then checked against simple rules:
+
+- Transfer screenshots name their fields ("Transferencia", "Comprobante",
+  "Destinatario", "Monto transferido"...) and list no prices.
+- Receipts have many lines ending in a price, and words like "Propina",
+  "Subtotal" or "Mesa".
+
+When the text clearly shows a transfer with a single amount and a
+recipient, the transfer is returned without calling the vision model. When
+it only clearly shows the document type, the LLM classification call is
+skipped. Anything else, or any OCR failure, goes to the vision model as
+before.
+
+Compare accuracy and latency with the LLM path on labelled images with
+``python -m scripts.benchmark_local_ocr``.
+"""
+
+import asyncio
+import io
+import logging
+import re
+import unicodedata
+
+from app.config import settings
+from app.core.executor import cpu_pool
+from app.core.metrics import LOCAL_OCR_RESULTS
+from app.models.receipt import ReceiptDocumentType, TransferExtraction
+
+try:
+    import pytesseract
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional dependency
+    pytesseract = None
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+TRANSFER_KEYWORDS = (
+    "transferencia",
+    "transferiste",
+    "comprobante",
+    "destinatario",
+    "monto transferido",
+    "cuenta destino",
+    "cuenta de destino",
+    "cuenta origen",
+    "numero de operacion",
+    "n de operacion",
+    "codigo de transaccion",
+)
+RECEIPT_KEYWORDS = ("propina", "subtotal", "sub total", "total a pagar", "mesa", "garzon", "iva", "boleta", "servicio")
+# Transfers show their fields; receipts many prices and few or no transfer words
+MIN_TRANSFER_KEYWORDS = 2
+MIN_RECEIPT_PRICE_LINES = 4
+MAX_TRANSFER_PRICE_LINES = 2
+
+# Chilean formatting: "." separates thousands and "," decimals ("$12.500", "12.500,50")
+_NUMBER = r"\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?|\d+(?:,\d{1,2})?"
+PRICE_LINE_PATTERN = re.compile(rf"(?:\$\s*(?:{_NUMBER})|\d{{1,3}}(?:\.\d{{3}})+)\s*$", re.MULTILINE)
+TRANSFER_AMOUNT_PATTERN = re.compile(rf"(?:monto(?: transferido)?|importe|total)\s*:?\s*\$?\s*({_NUMBER})")
+# The recipient follows its label on the same line or the next one
+RECIPIENT_PATTERN = re.compile(
+    r"^\s*(?:destinatario|nombre del destinatario|para)\s*:?\s*([^\n]{2,80})", re.IGNORECASE | re.MULTILINE
+)
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip accents, keeping line breaks."""
+    folded = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in folded if not unicodedata.combining(char))
+
+
+def parse_amount(value: str) -> float:
+    """Parse an amount in Chilean format: "12.500" is 12500, "12.500,50" is 12500.5.
+
+    Args:
+        value: Amount without currency sign
+
+    Returns:
+        float: Amount
+    """
+    return float(value.replace(".", "").replace(",", "."))
+
+
+class LocalOCRResult:
+    """What the local OCR text says about a document.
+
+    Args:
+        text: Text read from the image
+        document_type: Document type, or None if the text is not conclusive
+        amounts: Distinct transfer amounts found next to an amount label
+        recipient: Recipient named in the text, if any
+    """
+
+    def __init__(
+        self,
+        text: str,
+        document_type: ReceiptDocumentType | None,
+        amounts: list[float],
+        recipient: str | None,
+    ) -> None:
+        """Initialize the result.
+
+        Args:
+            text: Text read from the image
+            document_type: Document type, or None if the text is not conclusive
+            amounts: Distinct transfer amounts found next to an amount label
+            recipient: Recipient named in the text, if any
+        """
+        self.text = text
+        self.document_type = document_type
+        self.amounts = amounts
+        self.recipient = recipient
+
+    def transfer_extraction(self) -> TransferExtraction | None:
+        """The transfer, if the text is a transfer with one amount and a recipient."""
+        if self.document_type != ReceiptDocumentType.TRANSFER or len(self.amounts) != 1 or not self.recipient:
+            return None
+        if self.amounts[0] <= 0:
+            return None
+        return TransferExtraction(recipient=self.recipient, amount=self.amounts[0])
+
+
+def analyze_text(text: str) -> LocalOCRResult:
+    """Classify a document and extract transfer fields from its OCR text.
+
+    Args:
+        text: Text read from the image
+
+    Returns:
+        LocalOCRResult: Conclusions of the rules
+    """
+    folded = _fold(text)
+    transfer_hits = sum(keyword in folded for keyword in TRANSFER_KEYWORDS)
+    receipt_hits = sum(re.search(rf"\b{keyword}\b", folded) is not None for keyword in RECEIPT_KEYWORDS)
+    price_lines = len(PRICE_LINE_PATTERN.findall(folded))
+
+    document_type = None
+    if transfer_hits >= MIN_TRANSFER_KEYWORDS and price_lines <= MAX_TRANSFER_PRICE_LINES and not receipt_hits:
+        document_type = ReceiptDocumentType.TRANSFER
+    elif price_lines >= MIN_RECEIPT_PRICE_LINES and transfer_hits <= 1:
+        document_type = ReceiptDocumentType.RECEIPT
+
+    amounts = sorted({parse_amount(match) for match in TRANSFER_AMOUNT_PATTERN.findall(folded)})
+    recipient = None
+    match = RECIPIENT_PATTERN.search(text)
+    if match:
+        recipient = match.group(1).strip(" :") or None
+    return LocalOCRResult(text, document_type, amounts, recipient)
+
+
+def extract_text(image_content: bytes, language: str) -> str:
+    """Read the text of an image with Tesseract. Runs in the worker pool.
+
+    Args:
+        image_content: Image file content
+        language: Tesseract language code(s), e.g. "spa"
+
+    Returns:
+        str: Text of the image
+    """
+    with Image.open(io.BytesIO(image_content)) as image:
+        return pytesseract.image_to_string(image.convert("L"), lang=language)
+
+
+async def analyze_image(image_content: bytes) -> LocalOCRResult | None:
+    """Run the local OCR pre-pass on an image.
+
+    Args:
+        image_content: Image file content
+
+    Returns:
+        LocalOCRResult | None: Conclusions of the rules, or None if local OCR
+        is unavailable or failed
+    """
+    if pytesseract is None or Image is None:
+        logger.warning("LOCAL_OCR_ENABLED is set but pytesseract/Pillow are not installed (pip install .[ocr])")
+        LOCAL_OCR_RESULTS.inc("unavailable")
+        return None
+
+    try:
+        text = await asyncio.wait_for(
+            cpu_pool.run("ocr.local", extract_text, image_content, settings.LOCAL_OCR_LANGUAGE),
+            settings.LOCAL_OCR_TIMEOUT,
+        )
+    except Exception as e:
+        logger.warning(f"Local OCR failed, using the vision model: {e}")
+        LOCAL_OCR_RESULTS.inc("failed")
+        return None
+    return analyze_text(text)
@@ -10,6 +10,12 @@ from enum import Enum
 from pydantic import BaseModel
 
 from app.config import settings
+from app.core.http_client import http_client
+from app.core.metrics import LOCAL_OCR_RESULTS
+from app.core.timing import span, timed
+from app.services.llm_fixtures import ainvoke_llm
+from app.services.llm_gate import LLMUnavailableError
+from app.services.local_ocr import analyze_image
 from app.models.receipt import DocumentExtraction, ReceiptExtraction, TransferExtraction
 
 logger = logging.getLogger(__name__)
@@ -73,14 +79,49 @@ def _initialize_openai_model(temperature: float = 0.2) -> ChatOpenAI:
     return ChatOpenAI(
         model="gpt-4o-mini",
         api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
         temperature=temperature,
         max_tokens=2048,
     )
 
 
+# Leading bytes of the image formats the vision model accepts
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+# Content types under which servers send images without labelling them
+GENERIC_CONTENT_TYPES = {"", "application/octet-stream", "binary/octet-stream"}
+
+
+def sniff_image_mime_type(data: bytes) -> str | None:
+    """Detect the image format from its leading bytes.
+
+    Args:
+        data: Image content, or at least its first 12 bytes
+
+    Returns:
+        str | None: MIME type, or None if not a supported image format
+    """
+    for signature, mime_type in IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return mime_type
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+@timed("ocr.download")
 async def download_image_from_url(image_url: str) -> tuple[bytes, str]:
     """Download image from URL and return content with MIME type.
 
+    Streams the body through the shared HTTP client and stops as soon as it
+    exceeds ``IMAGE_MAX_BYTES``; a larger Content-Length or a non-image
+    Content-Type is rejected before reading the body. The MIME type comes
+    from the image's leading bytes, not from headers or the URL.
+
     Args:
         image_url: URL of the image to download
 
@@ -88,44 +129,39 @@ async def download_image_from_url(image_url: str) -> tuple[bytes, str]:
         tuple: (image_content, mime_type)
 
     Raises:
-        ValueError: If URL is invalid, download fails, or file is not an image
-        RuntimeError: If HTTP request fails
+        RuntimeError: If the download fails, or the file is too large, empty or not a supported image
     """
+    max_bytes = settings.IMAGE_MAX_BYTES
     try:
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-            logger.info(f"Downloading image from URL: {image_url}")
-            response = await client.get(image_url)
+        logger.info(f"Downloading image from URL: {image_url}")
+        async with http_client.client.stream("GET", image_url) as response:
             response.raise_for_status()
 
-            # Get content type from headers or guess from URL
-            content_type = response.headers.get("content-type", "")
-            if content_type:
-                mime_type = content_type.split(";")[0].strip()
-            else:
-                # Try to guess from URL extension
-                if image_url.lower().endswith((".jpg", ".jpeg")):
-                    mime_type = "image/jpeg"
-                elif image_url.lower().endswith(".png"):
-                    mime_type = "image/png"
-                elif image_url.lower().endswith(".webp"):
-                    mime_type = "image/webp"
-                elif image_url.lower().endswith(".gif"):
-                    mime_type = "image/gif"
-                else:
-                    mime_type = "image/jpeg"  # Default
-
-            # Validate it's an image
-            if not mime_type.startswith("image/"):
-                raise ValueError(f"URL does not point to an image. Content-Type: {mime_type}")
-
-            image_content = response.content
-            if not image_content:
-                raise ValueError("Downloaded image is empty")
-
-            logger.info(
-                f"Successfully downloaded image: {len(image_content)} bytes, type: {mime_type}"
-            )
-            return image_content, mime_type
+            content_length = response.headers.get("content-length")
+            if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+                raise ValueError(f"Image too large: {content_length} bytes (max {max_bytes})")
+            content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+            if not content_type.startswith("image/") and content_type not in GENERIC_CONTENT_TYPES:
+                raise ValueError(f"URL does not point to an image. Content-Type: {content_type}")
+
+            chunks = []
+            size = 0
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ValueError(f"Image too large: over {max_bytes} bytes")
+                chunks.append(chunk)
+
+        # Assembled once; hashing and base64 encoding read this buffer directly
+        image_content = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+        if not image_content:
+            raise ValueError("Downloaded image is empty")
+        mime_type = sniff_image_mime_type(image_content)
+        if mime_type is None:
+            raise ValueError(f"Unsupported image format (Content-Type: {content_type or 'none'})")
+
+        logger.info(f"Successfully downloaded image: {len(image_content)} bytes, type: {mime_type}")
+        return image_content, mime_type
 
     except httpx.HTTPError as e:
         logger.error(f"HTTP error downloading image: {str(e)}")
@@ -135,6 +171,50 @@ async def download_image_from_url(image_url: str) -> tuple[bytes, str]:
         raise RuntimeError(f"Failed to download image: {str(e)}") from e
 
 
+async def _classify_with_llm(model: ChatOpenAI, image_url: str, custom_prompt: str | None) -> str:
+    """Classify a document image as receipt or transfer with the vision model.
+
+    Args:
+        model: OpenAI model
+        image_url: Image as a data URL
+        custom_prompt: Optional custom classification instruction
+
+    Returns:
+        str: "receipt" or "transfer"
+    """
+    classify_prompt = (
+        custom_prompt
+        or """Analiza cuidadosamente esta imagen y clasifícala.
+
+CRITERIOS PARA 'transfer' (Transferencia/Depósito):
+- Es una captura de pantalla de app bancaria o comprobante digital.
+- Contiene palabras como: "Transferencia realizada", "Comprobante", "Destinatario", "Monto transferido", "Cuenta origen/destino".
+- Muestra datos bancarios: Banco, RUT/DNI, Nro de operación.
+- NO tiene lista de productos consumidos.
+
+CRITERIOS PARA 'receipt' (Boleta/Recibo):
+- Es una foto de un papel físico o ticket digital de compra.
+- Contiene: Lista de productos/platos, precios individuales, "Total a pagar", "Propina", "Mesa", "Garzón".
+- Nombre de un restaurante, tienda o comercio.
+- Desglose de IVA o impuestos.
+
+Selecciona el tipo de documento correcto."""
+    )
+
+    classify_message = HumanMessage(
+        content=[
+            {"type": "text", "text": classify_prompt},
+            {"type": "image_url", "image_url": {"url": image_url}},
+        ]
+    )
+
+    logger.info("Classifying document type with OpenAI structured output")
+    classifier_model = model.with_structured_output(ClassificationSchema)
+    with span("ocr.classify"):
+        classification = await ainvoke_llm(classifier_model, [classify_message], "classification")
+    return classification.document_type.value
+
+
 async def scan_receipt(
     file_content: bytes, mime_type: str, custom_prompt: str | None = None
 ) -> DocumentExtraction:
@@ -156,6 +236,16 @@ async def scan_receipt(
         RuntimeError: If OpenAI API returns an error
     """
     try:
+        # Optional local OCR pre-pass: clear transfers need no LLM call at all
+        local_result = None
+        if settings.LOCAL_OCR_ENABLED and custom_prompt is None:
+            local_result = await analyze_image(file_content)
+            transfer = local_result.transfer_extraction() if local_result is not None else None
+            if transfer is not None:
+                LOCAL_OCR_RESULTS.inc("shortcut")
+                logger.info(f"Transfer read locally: Recipient={transfer.recipient}, Amount=${transfer.amount}")
+                return DocumentExtraction(document_type="transfer", receipt=None, transfer=transfer)
+
         # Initialize model
         model = _initialize_openai_model()
 
@@ -163,37 +253,14 @@ async def scan_receipt(
         image_b64 = base64.b64encode(file_content).decode()
         image_url = f"data:{mime_type};base64,{image_b64}"
 
-        # Step 1: Classify document type with structured output
-        classify_prompt = (
-            custom_prompt
-            or """Analiza cuidadosamente esta imagen y clasifícala.
-
-CRITERIOS PARA 'transfer' (Transferencia/Depósito):
-- Es una captura de pantalla de app bancaria o comprobante digital.
-- Contiene palabras como: "Transferencia realizada", "Comprobante", "Destinatario", "Monto transferido", "Cuenta origen/destino".
-- Muestra datos bancarios: Banco, RUT/DNI, Nro de operación.
-- NO tiene lista de productos consumidos.
-
-CRITERIOS PARA 'receipt' (Boleta/Recibo):
-- Es una foto de un papel físico o ticket digital de compra.
-- Contiene: Lista de productos/platos, precios individuales, "Total a pagar", "Propina", "Mesa", "Garzón".
-- Nombre de un restaurante, tienda o comercio.
-- Desglose de IVA o impuestos.
-
-Selecciona el tipo de documento correcto."""
-        )
-
-        classify_message = HumanMessage(
-            content=[
-                {"type": "text", "text": classify_prompt},
-                {"type": "image_url", "image_url": {"url": image_url}},
-            ]
-        )
-
-        logger.info("Classifying document type with OpenAI structured output")
-        classifier_model = model.with_structured_output(ClassificationSchema)
-        classification = await classifier_model.ainvoke([classify_message])
-        doc_type = classification.document_type.value
+        # Step 1: Classify document type, locally when the OCR text is conclusive
+        if local_result is not None and local_result.document_type is not None:
+            LOCAL_OCR_RESULTS.inc("classified")
+            doc_type = local_result.document_type.value
+        else:
+            if local_result is not None:
+                LOCAL_OCR_RESULTS.inc("escalated")
+            doc_type = await _classify_with_llm(model, image_url, custom_prompt)
 
         logger.info(f"Document classified as: {doc_type}")
 
@@ -228,7 +295,8 @@ IMPORTANTE:
             )
 
             logger.info("Extracting receipt data with structured output")
-            llm_data = await structured_model.ainvoke([extract_message])
+            with span("ocr.extract"):
+                llm_data = await ainvoke_llm(structured_model, [extract_message], "receipt")
 
             # Convert LLM schema to app schema using model_validate with aliases
             receipt_dict = {
@@ -283,7 +351,8 @@ IMPORTANTE:
             )
 
             logger.info("Extracting transfer data with structured output")
-            llm_data = await structured_model.ainvoke([extract_message])
+            with span("ocr.extract"):
+                llm_data = await ainvoke_llm(structured_model, [extract_message], "transfer")
 
             # Convert LLM schema to app schema
             transfer_data = TransferExtraction(
@@ -304,8 +373,8 @@ IMPORTANTE:
 
         return document_extraction
 
-    except ValueError as e:
-        # Re-raise validation errors
+    except (ValueError, LLMUnavailableError):
+        # Re-raise validation errors, and gate rejections for the webhook to answer
         raise
     except Exception as e:
         logger.error(f"Error calling OpenAI API via LangChain: {str(e)}", exc_info=True)
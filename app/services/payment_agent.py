@@ -6,6 +6,9 @@ from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from app.models.payment_matching import PaymentIntent, ItemMatch
 from app.config.settings import settings
+from app.core.timing import timed
+from app.services.llm_fixtures import ainvoke_llm
+from app.services.llm_gate import LLMUnavailableError
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +47,7 @@ class PaymentIntentAgent:
             model="gpt-4o-mini",
             temperature=0,
             api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
         )
         
         # Create structured output LLM
@@ -58,6 +62,7 @@ class PaymentIntentAgent:
         # Create chain
         self.chain = self.prompt | self.structured_llm
     
+    @timed("payment_agent.intent")
     async def extract_payment_intent(self, user_message: str) -> PaymentIntent:
         """Extract payment intent from user message.
         
@@ -70,9 +75,11 @@ class PaymentIntentAgent:
         logger.info(f"Extracting payment intent from message: {user_message}")
         
         try:
-            result = await self.chain.ainvoke({"user_message": user_message})
+            result = await ainvoke_llm(self.chain, {"user_message": user_message}, "payment_intent")
             logger.info(f"Extracted payment intent: {result}")
             return result
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"Error extracting payment intent: {e}")
             # Return default empty intent on error
@@ -17,6 +17,9 @@ from app.database.models.invoice import Invoice
 from app.database.sql.session import get_active_session_by_user_id
 from app.database.sql.user import get_user_by_phone_number
 from app.config.settings import settings
+from app.core.timing import timed
+from app.services.llm_fixtures import ainvoke_llm
+from app.services.llm_gate import LLMUnavailableError
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +28,9 @@ class ItemMatchChoice(BaseModel):
     """Schema for item matching output."""
     
     intent_description: str = Field(..., description="Original description from user intent")
-    matched_item_id: int | None = Field(
-        ..., 
-        description="ID of the matched database item, or None if no good match"
+    matched_item_number: int | None = Field(
+        ...,
+        description="Number of the matched item in the database items list, or None if no good match"
     )
     match_confidence: float = Field(
         ...,
@@ -55,7 +58,7 @@ Reglas:
 - "pizza" debe matchear con items que contengan "pizza"
 - "hamburguesa" con items que digan "hamburguesa" o "burger"
 - Si hay múltiples opciones similares, escoge la primera disponible (is_paid=false)
-- Si NO hay un buen match, devuelve matched_item_id como None
+- Si NO hay un buen match, devuelve matched_item_number como None
 - Usa match_confidence para indicar qué tan seguro estás (1.0 = muy seguro, < 0.5 = poco seguro)
 
 Considera sinónimos y variaciones:
@@ -75,6 +78,7 @@ class PaymentMatcherService:
             model="gpt-4o-mini",
             temperature=0,
             api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
         )
         
         self.structured_llm = self.llm.with_structured_output(ItemMatchingResult)
@@ -92,6 +96,7 @@ Haz el matching y devuelve el resultado.""")
         
         self.chain = self.prompt | self.structured_llm
     
+    @timed("payment_matcher.unpaid_items")
     async def get_session_unpaid_items(
         self, 
         db_session: AsyncSession, 
@@ -126,6 +131,7 @@ Haz el matching y devuelve el resultado.""")
         items = result.scalars().all()
         return list(items)
     
+    @timed("payment_matcher.llm")
     async def match_items(
         self,
         payment_intent: PaymentIntent,
@@ -149,12 +155,13 @@ Haz el matching y devuelve el resultado.""")
             for item in payment_intent.items_paid
         ])
         
-        # Format database items
+        # Format database items, numbered by position rather than database ID so the
+        # prompt (and its recorded LLM fixture) doesn't depend on the dataset's IDs
         database_items = "\n".join([
-            f"- ID: {item.id}, Descripción: '{item.description}', "
+            f"- {number}: Descripción: '{item.description}', "
             f"Precio: ${item.unit_price:.2f}, Total: ${item.total:.2f}, "
             f"Pagado: {item.is_paid}"
-            for item in available_items
+            for number, item in enumerate(available_items, start=1)
         ])
         
         if not database_items:
@@ -165,28 +172,31 @@ Haz el matching y devuelve el resultado.""")
                    f"with {len(available_items)} database items")
         
         try:
-            result = await self.chain.ainvoke({
+            result = await ainvoke_llm(self.chain, {
                 "user_intents": user_intents,
                 "database_items": database_items,
-            })
+            }, "item_matching")
             logger.info(f"Matching result: {result}")
             return result
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"Error matching items: {e}")
             return ItemMatchingResult(matches=[])
     
+    @timed("payment_matcher.result")
     async def create_payment_match_result(
         self,
-        db_session: AsyncSession,
         matching_result: ItemMatchingResult,
         payment_amount: float,
+        available_items: list[Item],
     ) -> PaymentMatchResult:
         """Create a complete payment match result.
         
         Args:
-            db_session: Database session
             matching_result: Item matching result from LLM
             payment_amount: Actual payment amount from transfer
+            available_items: Items listed to the LLM, in the same order
             
         Returns:
             PaymentMatchResult with complete analysis
@@ -195,19 +205,14 @@ Haz el matching y devuelve el resultado.""")
         expected_amount = 0.0
         
         for match in matching_result.matches:
-            if match.matched_item_id is None or match.match_confidence < 0.5:
+            if match.matched_item_number is None or match.match_confidence < 0.5:
                 logger.warning(f"Skipping low confidence match: {match}")
                 continue
             
-            # Get item from database
-            result = await db_session.execute(
-                select(Item).where(Item.id == match.matched_item_id)
-            )
-            item = result.scalar_one_or_none()
-            
-            if not item:
-                logger.warning(f"Item {match.matched_item_id} not found in database")
+            if not 1 <= match.matched_item_number <= len(available_items):
+                logger.warning(f"Item number {match.matched_item_number} is not in the list")
                 continue
+            item = available_items[match.matched_item_number - 1]
             
             matched_items.append(ItemPaymentMatch(
                 item_id=item.id,
@@ -246,6 +251,7 @@ async def match_payment_to_items(
     user_phone: str,
     payment_intent: PaymentIntent,
     payment_amount: float,
+    available_items: list[Item] | None = None,
 ) -> PaymentMatchResult:
     """Main function to match a payment to items.
     
@@ -254,14 +260,16 @@ async def match_payment_to_items(
         user_phone: User's phone number
         payment_intent: Extracted payment intent
         payment_amount: Actual payment amount
+        available_items: Unpaid items of the user's session, if already fetched
         
     Returns:
         PaymentMatchResult with complete matching and analysis
     """
     # Get available items
-    available_items = await payment_matcher.get_session_unpaid_items(
-        db_session, user_phone
-    )
+    if available_items is None:
+        available_items = await payment_matcher.get_session_unpaid_items(
+            db_session, user_phone
+        )
     
     if not available_items:
         logger.warning(f"No unpaid items found for user {user_phone}")
@@ -280,6 +288,6 @@ async def match_payment_to_items(
     
     # Create final result
     return await payment_matcher.create_payment_match_result(
-        db_session, matching_result, payment_amount
+        matching_result, payment_amount, available_items
     )
 
@@ -5,6 +5,8 @@ from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from app.models.payment_method_parsing import PaymentMethodInfo
 from app.config.settings import settings
+from app.services.llm_fixtures import ainvoke_llm
+from app.services.llm_gate import LLMUnavailableError
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +52,7 @@ class PaymentMethodAgent:
             model="gpt-4o-mini",
             temperature=0,
             api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
         )
         
         # Create structured output LLM
@@ -76,9 +79,11 @@ class PaymentMethodAgent:
         logger.info(f"Extracting payment method from message: {user_message}")
         
         try:
-            result = await self.chain.ainvoke({"user_message": user_message})
+            result = await ainvoke_llm(self.chain, {"user_message": user_message}, "payment_method")
             logger.info(f"Extracted payment method: bank_name={result.bank_name}, is_payment_method={result.is_payment_method}")
             return result
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"Error extracting payment method: {e}", exc_info=True)
             # Return default empty info on error
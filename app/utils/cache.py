@@ -0,0 +1,100 @@
+"""In-process caching helpers."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+V = TypeVar("V")
+
+# Named caches, reported by the /metrics endpoint
+named_caches: dict[str, "TTLCache"] = {}
+
+
+class TTLCache(Generic[V]):
+    """Small in-process cache with a time-to-live and LRU eviction.
+
+    Entries expire ``ttl`` seconds after being stored. When the cache holds
+    ``maxsize`` entries, the least recently used one is evicted. Hits and
+    misses are counted; give the cache a ``name`` to report them in metrics.
+
+    Args:
+        maxsize: Maximum number of entries to keep
+        ttl: Time-to-live of each entry in seconds
+        name: Name under which the cache is reported in metrics
+
+    Example:
+        ```python
+        roster_cache: TTLCache[list[tuple[int, str]]] = TTLCache(maxsize=1024, ttl=30)
+        roster_cache.set(session_id, users)
+        users = roster_cache.get(session_id)  # None once expired
+        ```
+    """
+
+    def __init__(self, maxsize: int, ttl: float, name: str | None = None) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries to keep
+            ttl: Time-to-live of each entry in seconds
+            name: Name under which the cache is reported in metrics
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        if name is not None:
+            named_caches[name] = self
+
+    def get(self, key: Hashable) -> V | None:
+        """Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a single entry if present.
+
+        Args:
+            key: Cache key
+        """
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        """Number of stored entries, including ones that expired but were not yet evicted."""
+        return len(self._entries)
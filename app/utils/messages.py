@@ -18,6 +18,11 @@ NO_ACTIVE_SESSION_MESSAGE = (
     "• O simplemente 'crear sesión'"
 )
 
+LLM_UNAVAILABLE_MESSAGE = (
+    "Estamos recibiendo muchos mensajes en este momento y no pudimos procesar el tuyo. ⏳\n\n"
+    "Por favor, inténtalo de nuevo en unos minutos."
+)
+
 SESSION_CREATED_MESSAGE = (
     "¡Sesión creada exitosamente! ✅\n\n"
     "Ahora puedes:\n"
@@ -36,6 +36,29 @@ export interface BackendItem {
   debtor?: BackendUser
 }
 
+export interface BackendPayment {
+  id: number
+  payer_id: number
+  receiver_id: number
+  amount: number
+}
+
+export interface BackendBalance {
+  user_id: number
+  name: string
+  owes: number
+  owed: number
+  balance: number
+}
+
+export interface BackendSessionOverview {
+  session: BackendSession
+  participants: BackendUser[]
+  invoices: (BackendInvoice & { items: BackendItem[] })[]
+  payments: BackendPayment[]
+  balances: BackendBalance[]
+}
+
 export interface SessionData {
   sessionId: string
   tituloCompra: string
@@ -62,6 +85,34 @@ export async function getSession(sessionId: string): Promise<BackendSession> {
   return response.json()
 }
 
+/**
+ * Fetch a session with its participants, invoices, items, payments and balances
+ */
+export async function getSessionOverview(sessionId: string): Promise<BackendSessionOverview> {
+  const response = await fetch(`${API_BASE_URL}/api/v1/sessions/${sessionId}/overview`)
+  if (!response.ok) {
+    throw new Error(`Failed to fetch session overview: ${response.statusText}`)
+  }
+  return response.json()
+}
+
+/**
+ * Subscribe to live updates of a session. Returns a function that closes the stream.
+ */
+export function subscribeToSessionEvents(sessionId: string, onChange: (eventType: string) => void): () => void {
+  const source = new EventSource(`${API_BASE_URL}/api/v1/sessions/${sessionId}/events`)
+  const eventTypes = [
+    "invoice_created",
+    "item_assigned",
+    "payment_processed",
+    "member_joined",
+    "session_closed",
+    "resync",
+  ]
+  eventTypes.forEach((eventType) => source.addEventListener(eventType, () => onChange(eventType)))
+  return () => source.close()
+}
+
 /**
  * Fetch invoices for a session
  */
@@ -173,52 +224,19 @@ export function transformSessionData(
 }
 
 /**
- * Fetch complete session data with all related information
+ * Fetch complete session data with all related information in a single request
  */
 export async function getSessionData(sessionId: string): Promise<{
   sessionData: SessionData
   participants: Participante[]
 }> {
-  // Fetch session
-  const session = await getSession(sessionId)
-
-  // Fetch invoices for the session
-  const invoices = await getInvoicesBySession(sessionId)
-
-  // Fetch items for each invoice
-  const itemsPromises = invoices.map((invoice) => getItemsByInvoice(invoice.id))
-  const itemsArrays = await Promise.all(itemsPromises)
+  const overview = await getSessionOverview(sessionId)
 
   // Create a map of invoice_id -> items
   const itemsByInvoice: Record<number, BackendItem[]> = {}
-  invoices.forEach((invoice, index) => {
-    itemsByInvoice[invoice.id] = itemsArrays[index]
+  overview.invoices.forEach((invoice) => {
+    itemsByInvoice[invoice.id] = invoice.items
   })
 
-  // Fetch user details for items that don't have debtor info loaded
-  const userIds = new Set<number>()
-  itemsArrays.flat().forEach((item) => {
-    if (item.debtor_id && !item.debtor) {
-      userIds.add(item.debtor_id)
-    }
-  })
-
-  // Fetch missing user details if needed
-  if (userIds.size > 0) {
-    const userPromises = Array.from(userIds).map((userId) => getUser(userId))
-    const users = await Promise.all(userPromises)
-    const userMap = new Map(users.map((user) => [user.id, user]))
-
-    // Attach user details to items
-    itemsArrays.forEach((items) => {
-      items.forEach((item) => {
-        if (item.debtor_id && !item.debtor) {
-          item.debtor = userMap.get(item.debtor_id)
-        }
-      })
-    })
-  }
-
-  return transformSessionData(session, invoices, itemsByInvoice)
+  return transformSessionData(overview.session, overview.invoices, itemsByInvoice)
 }
-
@@ -0,0 +1,138 @@
+"""Compare the local OCR pre-pass with the vision model on labelled images.
+
+Images are read from a directory with one subdirectory per document type::
+
+    images/
+        receipt/*.jpg
+        transfer/*.png
+        amounts.json    # optional: {"transfer/ana.png": 13200, ...}
+
+Each image goes through ``scan_receipt`` twice: with the local pre-pass
+(``LOCAL_OCR_ENABLED``) and with the vision model only. The report gives,
+for each path, the classification accuracy, the transfer amount accuracy
+(for images listed in ``amounts.json``) and p50/p95 latency, plus how often
+the pre-pass answered without the vision model ("shortcut") or skipped the
+classification call ("classified").
+
+Needs ``pip install .[ocr]``, the ``tesseract`` binary and an OpenAI key;
+with ``--llm-fixtures`` LLM outputs are recorded on the first run and
+replayed afterwards, so repeated runs cost nothing.
+
+Usage:
+    python -m scripts.benchmark_local_ocr images/
+    python -m scripts.benchmark_local_ocr images/ --llm-fixtures /tmp/ocr-fixtures
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import time
+from pathlib import Path
+
+from app.config import settings
+from app.core.executor import cpu_pool
+from app.core.metrics import LOCAL_OCR_RESULTS
+from app.services.llm_fixtures import use_llm_fixtures
+from app.services.ocr_service import scan_receipt, sniff_image_mime_type
+from scripts.loadtest.__main__ import percentile
+
+DOCUMENT_TYPES = ("receipt", "transfer")
+PRE_PASS_OUTCOMES = ("shortcut", "classified", "escalated", "failed", "unavailable")
+
+
+def load_images(directory: Path) -> list[tuple[str, str, float | None]]:
+    """Labelled images of the directory.
+
+    Args:
+        directory: Directory with receipt/ and transfer/ subdirectories
+
+    Returns:
+        list: (relative path, expected document type, expected amount or None)
+    """
+    amounts_path = directory / "amounts.json"
+    amounts = json.loads(amounts_path.read_text()) if amounts_path.exists() else {}
+    images = []
+    for document_type in DOCUMENT_TYPES:
+        for path in sorted((directory / document_type).glob("*")):
+            if path.is_file():
+                name = f"{document_type}/{path.name}"
+                images.append((name, document_type, amounts.get(name)))
+    return images
+
+
+async def run_path(directory: Path, images: list[tuple[str, str, float | None]], local: bool) -> dict:
+    """Scan every image through one path and summarize the results.
+
+    Args:
+        directory: Image directory
+        images: Labelled images
+        local: Whether the local OCR pre-pass is enabled
+
+    Returns:
+        dict: Accuracy and latency of the path
+    """
+    settings.LOCAL_OCR_ENABLED = local
+    outcomes_before = {outcome: LOCAL_OCR_RESULTS.value(outcome) for outcome in PRE_PASS_OUTCOMES}
+    latencies: list[float] = []
+    correct_types = amounts_checked = correct_amounts = errors = 0
+    for name, expected_type, expected_amount in images:
+        content = (directory / name).read_bytes()
+        started_at = time.perf_counter()
+        try:
+            extraction = await scan_receipt(content, sniff_image_mime_type(content) or "image/jpeg")
+        except Exception as e:
+            print(f"  {name}: {e}")
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started_at)
+        correct_types += extraction.document_type == expected_type
+        if expected_amount is not None:
+            amounts_checked += 1
+            correct_amounts += extraction.transfer is not None and extraction.transfer.amount == expected_amount
+
+    ordered = sorted(latencies)
+    summary = {
+        "images": len(images),
+        "errors": errors,
+        "type accuracy": f"{correct_types / len(images):.1%}" if images else "-",
+        "amount accuracy": f"{correct_amounts / amounts_checked:.1%}" if amounts_checked else "-",
+        "p50 ms": round(percentile(ordered, 50) * 1000, 1),
+        "p95 ms": round(percentile(ordered, 95) * 1000, 1),
+    }
+    if local:
+        for outcome in PRE_PASS_OUTCOMES:
+            summary[outcome] = int(LOCAL_OCR_RESULTS.value(outcome) - outcomes_before[outcome])
+    return summary
+
+
+async def benchmark(directory: Path, fixtures: Path | None) -> dict[str, dict]:
+    """Run both paths over the labelled images."""
+    images = load_images(directory)
+    fixture_context = use_llm_fixtures("auto", fixtures) if fixtures else contextlib.nullcontext()
+    try:
+        with fixture_context:
+            return {
+                "vision model": await run_path(directory, images, local=False),
+                "local pre-pass": await run_path(directory, images, local=True),
+            }
+    finally:
+        cpu_pool.stop()
+
+
+def main() -> None:
+    """Print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("directory", type=Path, help="directory with receipt/ and transfer/ subdirectories")
+    parser.add_argument("--llm-fixtures", type=Path, help="record and replay LLM outputs in this directory")
+    args = parser.parse_args()
+
+    columns = asyncio.run(benchmark(args.directory, args.llm_fixtures))
+    rows = list(dict.fromkeys(row for summary in columns.values() for row in summary))
+    print(f"{'':<18}" + "".join(f"{name:>18}" for name in columns))
+    for row in rows:
+        print(f"{row:<18}" + "".join(f"{str(summary.get(row, '')):>18}" for summary in columns.values()))
+
+
+if __name__ == "__main__":
+    main()
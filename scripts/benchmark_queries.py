@@ -0,0 +1,433 @@
+"""Benchmark every query of ``app.database.sql`` and ``app.database.crud`` against data size.
+
+For each ``--sizes`` multiple, the database is topped up to that size with
+``scripts.generate_dataset`` and every query is run ``--repeat`` times with
+parameters sampled from the data (users in active sessions, closed sessions,
+invoices, payments...). Writes run inside a transaction rolled back after
+every call, so the dataset does not drift between runs. The report has the
+p50 and p95 latency of each query at each size and how much the p50 grew
+from the smallest to the largest size, to spot queries that do not scale.
+
+Run it against a dedicated database: it adds synthetic rows.
+
+Usage:
+    python -m scripts.benchmark_queries --sizes 1,10
+    python -m scripts.benchmark_queries --sizes 1,3,10 --repeat 50 --only session --json queries.json
+    python -m scripts.benchmark_queries --no-generate
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections.abc import Awaitable, Callable
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.database import db_manager
+from app.database.crud import invoice_crud, item_crud, payment_crud, session_crud, user_crud
+from app.database.models.invoice import Invoice
+from app.database.models.item import Item
+from app.database.models.session import SessionStatus
+from app.database.models.user import User
+from app.database.sql.debt_queries import get_my_debt_summary
+from app.database.sql.export import session_export_statement, stream_export_batches, user_export_statement
+from app.database.sql.invoice import create_invoice_with_items
+from app.database.sql.item import assign_item_to_debtor
+from app.database.sql.llm_usage import get_daily_llm_usage, get_session_llm_usage, save_llm_usage
+from app.database.sql.payment import get_pending_items_by_user_id, get_pending_items_owed_to_collector, process_payment
+from app.database.sql.payment_methods import create_payment_method, get_user_payment_methods
+from app.database.sql.session import (
+    close_session,
+    create_session,
+    get_active_session_by_user_id,
+    get_all_session_debtors_from_active_session,
+    get_all_session_users,
+    get_session_by_id,
+    invalidate_session_roster,
+    join_session,
+)
+from app.database.sql.session_overview import get_session_overview
+from app.database.sql.user import create_user, get_user_by_id, get_user_by_phone_number
+from app.models.receipt import ReceiptExtraction
+from scripts.generate_dataset import generate_dataset, table_counts
+from scripts.loadtest.__main__ import percentile
+
+SAMPLE_SIZE = 200
+
+# Rows of each sample: (column names, query)
+SAMPLE_QUERIES = {
+    "active_members": (
+        "SELECT u.id AS user_id, u.phone_number AS phone, s.id AS session_id FROM sessions s "
+        "JOIN session_users su ON su.session_id = s.id JOIN users u ON u.id = su.user_id "
+        "WHERE s.status = 'ACTIVE' ORDER BY random() LIMIT :limit"
+    ),
+    "active_owners": (
+        "SELECT u.id AS user_id, u.phone_number AS phone, s.id AS session_id FROM sessions s "
+        "JOIN users u ON u.id = s.owner_id WHERE s.status = 'ACTIVE' ORDER BY random() LIMIT :limit"
+    ),
+    "closed_sessions": "SELECT id AS session_id FROM sessions WHERE status = 'CLOSED' ORDER BY random() LIMIT :limit",
+    "users": "SELECT id AS user_id, phone_number AS phone, name FROM users ORDER BY random() LIMIT :limit",
+    "invoices": "SELECT id AS invoice_id, payer_id FROM invoices ORDER BY random() LIMIT :limit",
+    "payments": "SELECT id AS payment_id, payer_id, receiver_id FROM payments ORDER BY random() LIMIT :limit",
+}
+
+
+class Samples:
+    """Random rows used as query parameters, drawn once per data size."""
+
+    def __init__(self, rows: dict[str, list[dict[str, Any]]]) -> None:
+        """Initialize from sampled rows.
+
+        Args:
+            rows: Rows of each ``SAMPLE_QUERIES`` entry
+        """
+        self.rows = rows
+
+    @classmethod
+    async def load(cls, engine: AsyncEngine) -> "Samples":
+        """Sample the database."""
+        rows = {}
+        async with engine.connect() as conn:
+            for name, query in SAMPLE_QUERIES.items():
+                result = await conn.execute(text(query), {"limit": SAMPLE_SIZE})
+                rows[name] = [dict(row) for row in result.mappings()]
+        return cls(rows)
+
+    def pick(self, name: str) -> dict[str, Any]:
+        """A random row of a sample.
+
+        Raises:
+            LookupError: If the sample is empty
+        """
+        if not self.rows.get(name):
+            raise LookupError(f"No {name} in the database")
+        return random.choice(self.rows[name])
+
+
+async def _consume(batches: Any) -> int:
+    return sum([len(batch) async for batch in batches])
+
+
+def _new_phone() -> str:
+    # Not used by the generated users (+999...), so inserts never hit the unique constraint
+    return f"+998{random.randrange(10**9):09d}"
+
+
+def _receipt() -> ReceiptExtraction:
+    return ReceiptExtraction.model_validate(
+        {
+            "merchant": "Benchmark",
+            "date": date.today().isoformat(),
+            "total_amount": 26400,
+            "tip": 0.1,
+            "items": [{"description": "Pizza", "amount": 12000, "count": 2}],
+        }
+    )
+
+
+# Query benchmarks: name -> (prepare, run). ``prepare`` builds the arguments
+# outside of the timed section, ``run`` is timed.
+Prepare = Callable[[AsyncSession, Samples], Awaitable[dict[str, Any]]]
+Run = Callable[[AsyncSession, dict[str, Any]], Awaitable[Any]]
+
+
+def _from(name: str) -> Prepare:
+    async def prepare(db: AsyncSession, samples: Samples) -> dict[str, Any]:
+        return samples.pick(name)
+
+    return prepare
+
+
+async def _prepare_roster(db: AsyncSession, samples: Samples) -> dict[str, Any]:
+    row = samples.pick("active_members")
+    invalidate_session_roster(row["session_id"])
+    return row
+
+
+async def _prepare_assign(db: AsyncSession, samples: Samples) -> dict[str, Any]:
+    row = samples.pick("invoices")
+    item = (await db.execute(select(Item).where(Item.invoice_id == row["invoice_id"]).limit(1))).scalar_one()
+    return {"item": item, "debtor": await db.get(User, samples.pick("users")["user_id"])}
+
+
+async def _prepare_payment(db: AsyncSession, samples: Samples) -> dict[str, Any]:
+    row = samples.pick("active_members")
+    result = await db.execute(
+        select(Item, Invoice.payer_id)
+        .join(Invoice, Item.invoice_id == Invoice.id)
+        .where(Item.debtor_id == row["user_id"], Item.is_paid.is_(False), Invoice.session_id == row["session_id"])
+        .limit(3)
+    )
+    rows = result.all()
+    return {
+        "payer_id": row["user_id"],
+        "receiver_id": rows[0].payer_id if rows else row["user_id"],
+        "items": [item for item, _ in rows],
+        "amount": float(sum(item.total for item, _ in rows)),
+    }
+
+
+QUERIES: dict[str, tuple[Prepare, Run]] = {
+    # app.database.sql.user
+    "sql.user.get_user_by_phone_number": (_from("users"), lambda db, p: get_user_by_phone_number(db, p["phone"])),
+    "sql.user.get_user_by_id": (_from("users"), lambda db, p: get_user_by_id(db, p["user_id"])),
+    "sql.user.create_user": (
+        _from("users"),
+        lambda db, p: create_user(db, _new_phone(), "Benchmark"),
+    ),
+    # app.database.sql.session
+    "sql.session.get_active_session_by_user_id": (
+        _from("active_members"),
+        lambda db, p: get_active_session_by_user_id(db, p["user_id"]),
+    ),
+    "sql.session.get_all_session_users": (_prepare_roster, lambda db, p: get_all_session_users(db, p["session_id"])),
+    "sql.session.get_all_session_debtors_from_active_session": (
+        _from("active_owners"),
+        lambda db, p: get_all_session_debtors_from_active_session(db, p["phone"]),
+    ),
+    "sql.session.get_session_by_id": (
+        _from("closed_sessions"),
+        lambda db, p: get_session_by_id(db, str(p["session_id"])),
+    ),
+    "sql.session.create_session": (_from("users"), lambda db, p: create_session(db, "Benchmark", p["phone"])),
+    "sql.session.join_session": (
+        _from("active_members"),
+        lambda db, p: join_session(db, str(p["session_id"]), p["phone"]),
+    ),
+    "sql.session.close_session": (
+        _from("active_owners"),
+        lambda db, p: close_session(db, str(p["session_id"]), p["phone"]),
+    ),
+    "sql.session_overview.get_session_overview": (
+        _from("closed_sessions"),
+        lambda db, p: get_session_overview(db, p["session_id"]),
+    ),
+    # app.database.sql.invoice / item / payment
+    "sql.invoice.create_invoice_with_items": (
+        _from("active_owners"),
+        lambda db, p: create_invoice_with_items(db, _receipt(), 0.1, p["phone"]),
+    ),
+    "sql.item.assign_item_to_debtor": (
+        _prepare_assign,
+        lambda db, p: assign_item_to_debtor(db, p["item"], p["debtor"]),
+    ),
+    "sql.payment.get_pending_items_by_user_id": (
+        _from("active_members"),
+        lambda db, p: get_pending_items_by_user_id(db, p["user_id"]),
+    ),
+    "sql.payment.get_pending_items_owed_to_collector": (
+        _from("active_owners"),
+        lambda db, p: get_pending_items_owed_to_collector(db, p["user_id"]),
+    ),
+    "sql.payment.process_payment": (
+        _prepare_payment,
+        lambda db, p: process_payment(db, p["payer_id"], p["receiver_id"], p["amount"], p["items"]),
+    ),
+    "sql.payment_methods.get_user_payment_methods": (
+        _from("users"),
+        lambda db, p: get_user_payment_methods(db, p["user_id"]),
+    ),
+    "sql.payment_methods.create_payment_method": (
+        _from("users"),
+        lambda db, p: create_payment_method(db, p["user_id"], "Banco", "Cuenta 123"),
+    ),
+    "sql.debt_queries.get_my_debt_summary": (
+        _from("active_members"),
+        lambda db, p: get_my_debt_summary(db, p["phone"]),
+    ),
+    # app.database.sql.export
+    "sql.export.session_export": (
+        _from("closed_sessions"),
+        lambda db, p: _consume(stream_export_batches(db, session_export_statement(p["session_id"]), 1000)),
+    ),
+    "sql.export.user_export": (
+        _from("users"),
+        lambda db, p: _consume(stream_export_batches(db, user_export_statement(p["user_id"]), 1000)),
+    ),
+    # app.database.sql.llm_usage
+    "sql.llm_usage.get_session_llm_usage": (
+        _from("closed_sessions"),
+        lambda db, p: get_session_llm_usage(db, p["session_id"]),
+    ),
+    "sql.llm_usage.get_daily_llm_usage": (
+        _from("users"),
+        lambda db, p: get_daily_llm_usage(db, date.today() - timedelta(days=30), date.today()),
+    ),
+    "sql.llm_usage.save_llm_usage": (
+        _from("users"),
+        lambda db, p: save_llm_usage(
+            db, [{"user_id": p["user_id"], "day": date.today(), "schema": "benchmark", "model": "gpt-4o-mini"}]
+        ),
+    ),
+    # app.database.crud
+    "crud.user.get": (_from("users"), lambda db, p: user_crud.get(db, p["user_id"])),
+    "crud.user.get_by_phone": (_from("users"), lambda db, p: user_crud.get_by_phone(db, p["phone"])),
+    "crud.user.get_by_name": (_from("users"), lambda db, p: user_crud.get_by_name(db, p["name"][:12], limit=100)),
+    "crud.user.get_page.exact_total": (_from("users"), lambda db, p: user_crud.get_page(db, limit=100, total="exact")),
+    "crud.user.get_multi.deep_offset": (
+        _from("users"),
+        lambda db, p: user_crud.get_multi(db, skip=p["user_id"], limit=100),
+    ),
+    "crud.user.create": (
+        _from("users"),
+        lambda db, p: user_crud.create(db, obj_in={"name": "Benchmark", "phone_number": _new_phone()}),
+    ),
+    "crud.session.get_by_owner": (_from("active_owners"), lambda db, p: session_crud.get_by_owner(db, p["user_id"])),
+    "crud.session.get_active_sessions": (
+        _from("users"),
+        lambda db, p: session_crud.get_active_sessions(db, limit=100, total="estimate"),
+    ),
+    "crud.session.get_by_status.exact_total": (
+        _from("users"),
+        lambda db, p: session_crud.get_by_status(db, SessionStatus.CLOSED, limit=100, total="exact"),
+    ),
+    "crud.invoice.get_by_payer": (_from("invoices"), lambda db, p: invoice_crud.get_by_payer(db, p["payer_id"])),
+    "crud.invoice.get_by_session": (
+        _from("closed_sessions"),
+        lambda db, p: invoice_crud.get_by_session(db, p["session_id"]),
+    ),
+    "crud.invoice.get_pending_invoices": (
+        _from("users"),
+        lambda db, p: invoice_crud.get_pending_invoices(db, limit=100, total="estimate"),
+    ),
+    "crud.item.get_by_invoice": (_from("invoices"), lambda db, p: item_crud.get_by_invoice(db, p["invoice_id"])),
+    "crud.item.get_by_debtor": (_from("active_members"), lambda db, p: item_crud.get_by_debtor(db, p["user_id"])),
+    "crud.item.get_unpaid_items": (_from("users"), lambda db, p: item_crud.get_unpaid_items(db, limit=100)),
+    "crud.item.get_by_payment": (_from("payments"), lambda db, p: item_crud.get_by_payment(db, p["payment_id"])),
+    "crud.item.get_by_session": (_from("closed_sessions"), lambda db, p: item_crud.get_by_session(db, p["session_id"])),
+    "crud.payment.get_by_payer": (_from("payments"), lambda db, p: payment_crud.get_by_payer(db, p["payer_id"])),
+    "crud.payment.get_by_receiver": (
+        _from("payments"),
+        lambda db, p: payment_crud.get_by_receiver(db, p["receiver_id"]),
+    ),
+    "crud.payment.get_between_users": (
+        _from("payments"),
+        lambda db, p: payment_crud.get_between_users(db, p["payer_id"], p["receiver_id"]),
+    ),
+}
+
+
+async def time_query(engine: AsyncEngine, samples: Samples, prepare: Prepare, run: Run) -> float:
+    """Run a query once inside a rolled back transaction.
+
+    Commits made by the query only release a savepoint, so nothing persists.
+
+    Returns:
+        Seconds spent in ``run``
+    """
+    async with engine.connect() as conn:
+        await conn.begin()
+        db = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+        try:
+            params = await prepare(db, samples)
+            started = time.perf_counter()
+            await run(db, params)
+            return time.perf_counter() - started
+        finally:
+            await db.close()
+            await conn.rollback()
+
+
+async def benchmark_queries(
+    engine: AsyncEngine, names: list[str], repeat: int
+) -> dict[str, dict[str, float] | dict[str, str]]:
+    """Time each query ``repeat`` times after one untimed warm-up call.
+
+    Returns:
+        p50, p95 and mean milliseconds of each query, or the error that stopped it
+    """
+    samples = await Samples.load(engine)
+    results: dict[str, Any] = {}
+    for name in names:
+        prepare, run = QUERIES[name]
+        try:
+            await time_query(engine, samples, prepare, run)
+            timings = sorted([await time_query(engine, samples, prepare, run) for _ in range(repeat)])
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"[:200]}
+            continue
+        results[name] = {
+            "p50_ms": percentile(timings, 50) * 1000,
+            "p95_ms": percentile(timings, 95) * 1000,
+            "mean_ms": sum(timings) / len(timings) * 1000,
+        }
+    return results
+
+
+def print_report(runs: list[dict[str, Any]]) -> None:
+    """Print p50/p95 of each query at each data size and the p50 growth."""
+    names = sorted({name for run in runs for name in run["queries"]})
+    width = max(len(name) for name in names)
+    header = "".join(f"{'x' + str(run['size']) + ' p50/p95 ms':>22}" for run in runs)
+    print(f"\n{'query':<{width}}{header}{'growth':>9}")
+    for name in names:
+        cells = []
+        p50s = []
+        for run in runs:
+            stats = run["queries"].get(name, {})
+            if "p50_ms" in stats:
+                cells.append(f"{stats['p50_ms']:>12.2f}/{stats['p95_ms']:<9.2f}")
+                p50s.append(stats["p50_ms"])
+            else:
+                cells.append(f"{'error':>22}")
+        growth = f"{p50s[-1] / p50s[0]:.1f}x" if len(p50s) > 1 and p50s[0] else ""
+        print(f"{name:<{width}}{''.join(cells)}{growth:>9}")
+    for run in runs:
+        print(f"x{run['size']} rows: {run['rows']}")
+        for name, stats in run["queries"].items():
+            if "error" in stats:
+                print(f"  {name}: {stats['error']}")
+
+
+async def main(args: argparse.Namespace) -> list[dict[str, Any]]:
+    """Benchmark at each data size.
+
+    Returns:
+        One entry per size with table sizes and query timings
+    """
+    names = [name for name in QUERIES if not args.only or any(part in name for part in args.only)]
+    await db_manager.connect()
+    runs = []
+    try:
+        for size in args.sizes:
+            if args.generate:
+                print(f"Growing the dataset to x{size}...")
+                await generate_dataset(db_manager.engine, size, seed=args.seed)
+            async with db_manager.engine.connect() as conn:
+                rows = await table_counts(conn)
+            print(f"Benchmarking {len(names)} queries at x{size} ({rows['items']} items)...")
+            queries = await benchmark_queries(db_manager.engine, names, args.repeat)
+            runs.append({"size": size, "rows": rows, "queries": queries})
+    finally:
+        await db_manager.disconnect()
+    return runs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark database queries against data size")
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [float(size) for size in value.split(",")],
+        default=[1.0, 10.0],
+        help="comma-separated multiples of the base dataset profile",
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="timed calls per query and size")
+    parser.add_argument("--only", nargs="*", help="only queries whose name contains one of these")
+    parser.add_argument("--no-generate", dest="generate", action="store_false", help="benchmark the data as it is")
+    parser.add_argument("--seed", type=int, help="random seed of the generated data")
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    arguments = parser.parse_args()
+    if arguments.seed is not None:
+        random.seed(arguments.seed)
+    if not arguments.generate:
+        arguments.sizes = arguments.sizes[:1]
+    results = asyncio.run(main(arguments))
+    print_report(results)
+    if arguments.json:
+        arguments.json.write_text(json.dumps(results, indent=2, default=str))
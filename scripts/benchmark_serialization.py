@@ -0,0 +1,111 @@
+"""Benchmark JSON serialization of API list responses.
+
+Compares, per row, the previous path (``jsonable_encoder`` over ORM objects
+followed by ``json.dumps``, or the hand-written ``serialize_item``) with the
+typed response models in ``app.api.v1.schemas`` serialized by pydantic-core.
+
+No database is needed: rows are transient ORM instances.
+
+Usage:
+    python -m scripts.benchmark_serialization
+    python -m scripts.benchmark_serialization --rows 5000 --repeat 5
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+from decimal import Decimal
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.api.v1.schemas import ItemOut
+from app.database.models import Item, User
+
+
+def make_items(rows: int) -> list[Item]:
+    """Build transient items with a loaded debtor, like ``GET /items/session/{id}``."""
+    debtor = User(id=1, name="Alice Johnson", phone_number="+1234567890")
+    items = [
+        Item(
+            id=i,
+            invoice_id=i // 10,
+            debtor_id=debtor.id,
+            unit_price=Decimal("1250.00"),
+            paid_amount=Decimal("0.00"),
+            tip=Decimal("0.1000"),
+            total=Decimal("1375.00"),
+            is_paid=False,
+            payment_id=None,
+            description=f"Item {i}",
+        )
+        for i in range(rows)
+    ]
+    for item in items:
+        # As selectinload does: no backref, so debtor.debtor_items stays unloaded
+        set_committed_value(item, "debtor", debtor)
+    return items
+
+
+def serialize_item_legacy(item: Item) -> dict[str, Any]:
+    """The hand-written serializer previously used by the items endpoints."""
+    result = {
+        "id": item.id,
+        "invoice_id": item.invoice_id,
+        "debtor_id": item.debtor_id,
+        "unit_price": float(item.unit_price) if isinstance(item.unit_price, Decimal) else item.unit_price,
+        "paid_amount": float(item.paid_amount) if isinstance(item.paid_amount, Decimal) else item.paid_amount,
+        "tip": float(item.tip) if isinstance(item.tip, Decimal) else item.tip,
+        "total": float(item.total) if isinstance(item.total, Decimal) else item.total,
+        "is_paid": item.is_paid,
+        "payment_id": item.payment_id,
+        "description": item.description,
+    }
+    if item.debtor:
+        result["debtor"] = {
+            "id": item.debtor.id,
+            "name": item.debtor.name,
+            "phone_number": item.debtor.phone_number,
+        }
+    return result
+
+
+def best_of(repeat: int, func: Callable[[], bytes]) -> float:
+    """Run ``func`` ``repeat`` times and return the fastest run in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    """Run the benchmark and print the cost per row of each path."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000, help="Rows per response")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per path (best is reported)")
+    args = parser.parse_args()
+
+    items = make_items(args.rows)
+    adapter = TypeAdapter(list[ItemOut])
+
+    paths: dict[str, Callable[[], bytes]] = {
+        "jsonable_encoder + json.dumps": lambda: json.dumps(jsonable_encoder(items)).encode(),
+        "serialize_item + json.dumps": lambda: json.dumps([serialize_item_legacy(i) for i in items]).encode(),
+        "ItemOut + pydantic dump_json": lambda: adapter.dump_json(adapter.validate_python(items)),
+    }
+
+    baseline = None
+    print(f"{args.rows} rows, best of {args.repeat}")
+    for name, func in paths.items():
+        seconds = best_of(args.repeat, func)
+        baseline = baseline or seconds
+        print(f"  {name:<32} {seconds * 1e6 / args.rows:8.2f} us/row  {baseline / seconds:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Count the input tokens of an agent command.
+
+Reports the tokens of the agent's system prompt, of the structured output
+schema sent along with it, and of a few typical commands, with the
+tokenizer of the agent's model. Pass ``--rev`` to compare with the prompt of
+another git revision, e.g. before a prompt edit.
+
+OpenAI caches prompt prefixes of 1024 tokens or more, so the static part
+(schema + system prompt) is billed at the cached input price on repeated
+calls; the ``llm_tokens{kind="cached_input"}`` metric shows the hit rate.
+
+The tokenizer's vocabulary is downloaded by tiktoken on first use.
+
+Usage:
+    python -m scripts.count_prompt_tokens
+    python -m scripts.count_prompt_tokens --rev HEAD~1
+"""
+
+import argparse
+import json
+import subprocess
+
+import tiktoken
+
+from app.models.text_agent import AgentActionSchema
+from app.services.agent.prompt import AGENT_PROMPT_VERSION, get_agent_prompt
+
+MODEL = "gpt-4o-mini"
+PROMPT_PATH = "app/services/agent/prompt.py"
+SAMPLE_COMMANDS = [
+    "cuánto debo?",
+    "Juan paga la cerveza",
+    "Quiero iniciar una sesión, correspondiente a la ida a un bar con mis amigos",
+]
+# Tokens OpenAI adds around each chat message
+TOKENS_PER_MESSAGE = 3
+
+
+def prompt_at_revision(rev: str) -> str:
+    """Agent prompt as of a git revision."""
+    source = subprocess.run(["git", "show", f"{rev}:{PROMPT_PATH}"], capture_output=True, text=True, check=True).stdout
+    namespace: dict = {}
+    exec(compile(source, f"{rev}:{PROMPT_PATH}", "exec"), namespace)
+    return namespace["get_agent_prompt"]()
+
+
+def count_tokens(prompt: str, encoding: tiktoken.Encoding) -> dict[str, int]:
+    """Token counts of the static prompt and of each sample command."""
+    schema = encoding.encode(json.dumps(AgentActionSchema.model_json_schema()))
+    static = len(schema) + len(encoding.encode(prompt)) + TOKENS_PER_MESSAGE
+    counts = {"schema": len(schema), "system prompt": static - len(schema), "static total": static}
+    for command in SAMPLE_COMMANDS:
+        counts[f"command: {command[:40]}"] = static + len(encoding.encode(command)) + TOKENS_PER_MESSAGE
+    return counts
+
+
+def main() -> None:
+    """Print the token counts."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--rev", help="also count the prompt of this git revision")
+    args = parser.parse_args()
+
+    encoding = tiktoken.encoding_for_model(MODEL)
+    columns = {f"current ({AGENT_PROMPT_VERSION})": count_tokens(get_agent_prompt(), encoding)}
+    if args.rev:
+        columns[args.rev] = count_tokens(prompt_at_revision(args.rev), encoding)
+
+    print(f"{'tokens':<50}" + "".join(f"{name:>22}" for name in columns))
+    for row in next(iter(columns.values())):
+        print(f"{row:<50}" + "".join(f"{counts[row]:>22}" for counts in columns.values()))
+
+
+if __name__ == "__main__":
+    main()
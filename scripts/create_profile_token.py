@@ -0,0 +1,25 @@
+"""Print a token that enables profiling of the requests sending it.
+
+Usage:
+    python -m scripts.create_profile_token
+    python -m scripts.create_profile_token --minutes 15
+
+Send it as the ``X-Profile-Token`` header of the requests to profile, and of
+``GET /admin/profiles`` to list the saved profiles. Requires
+``PROFILING_ENABLED=true`` on the server.
+"""
+
+import argparse
+
+from app.core.profiling import create_profile_token
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=int, default=60, help="minutes until the token expires")
+    args = parser.parse_args()
+    print(create_profile_token(args.minutes))
+
+
+if __name__ == "__main__":
+    main()
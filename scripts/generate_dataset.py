@@ -0,0 +1,462 @@
+"""Generate a large synthetic dataset for scale testing the database layer.
+
+Rows are built in memory and written with ``COPY`` (asyncpg's binary
+``copy_records_to_table``) or, with ``--method insert``, with batched
+multi-row ``INSERT`` statements, a batch of sessions per transaction.
+
+The shape follows real usage:
+
+- A few heavy users take part in many sessions (Pareto popularity).
+- Sessions have a handful of participants besides the owner (log-normal).
+- Invoice and item counts per session and per invoice are skewed too.
+- A small fraction of sessions is active; a user is in one active session at most.
+- Most items of closed sessions are paid, fewer of active ones. Paid items are
+  settled by one payment per debtor and invoice.
+- Each invoice has the LLM usage rows of its OCR calls.
+
+Volumes are ``--scale`` times the base profile. The generator tops the
+database up to that size: running it with ``--scale 1`` and then
+``--scale 10`` adds nine times the base volume. Sequences are advanced past
+the generated IDs and the tables are analyzed at the end.
+
+Usage:
+    python -m scripts.generate_dataset --scale 1
+    python -m scripts.generate_dataset --scale 10 --method insert --seed 42
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import time
+import uuid
+from collections.abc import Callable
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.database import Base, db_manager
+
+# Columns written for each table, in insertion order (parents before children)
+TABLE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "users": ("id", "name", "phone_number"),
+    "payment_methods": ("id", "name", "description", "id_user"),
+    "sessions": ("id", "description", "owner_id", "status", "version"),
+    "session_users": ("session_id", "user_id"),
+    "invoices": ("id", "description", "total", "pending_amount", "payer_id", "session_id"),
+    "payments": ("id", "payer_id", "receiver_id", "amount"),
+    "items": (
+        "id",
+        "invoice_id",
+        "debtor_id",
+        "unit_price",
+        "paid_amount",
+        "tip",
+        "total",
+        "is_paid",
+        "payment_id",
+        "description",
+    ),
+    "llm_usage": (
+        "message_id",
+        "user_id",
+        "session_id",
+        "day",
+        "schema",
+        "model",
+        "calls",
+        "input_tokens",
+        "output_tokens",
+        "cached_tokens",
+        "images",
+        "latency_ms",
+        "cost_usd",
+    ),
+}
+
+# Tables with an integer ID assigned by the generator
+ID_TABLES = ("users", "payment_methods", "invoices", "payments", "items")
+
+MENU = (
+    "Pizza",
+    "Cerveza",
+    "Bebida",
+    "Papas fritas",
+    "Hamburguesa",
+    "Ensalada",
+    "Sushi",
+    "Empanada",
+    "Café",
+    "Postre",
+    "Vino",
+    "Agua mineral",
+)
+MERCHANTS = ("Restaurante El Puerto", "Bar La Esquina", "Café Central", "Sushi House", "Pizzería Roma")
+BANKS = ("Banco de Chile", "Banco Estado", "Santander", "BCI", "Mercado Pago")
+TIP_RATES = (Decimal("0"), Decimal("0.1"))
+CENT = Decimal("0.01")
+
+
+class DatasetProfile:
+    """Volumes and distributions of the synthetic dataset at scale 1.
+
+    Args:
+        users: Users
+        sessions: Sessions
+        participants: Mean participants per session besides the owner
+        invoices_per_session: Mean invoices per session
+        items_per_invoice: Mean items per invoice
+        active_fraction: Fraction of sessions still active
+        paid_fraction_closed: Fraction of assigned items paid in closed sessions
+        paid_fraction_active: Fraction of assigned items paid in active sessions
+        unassigned_fraction: Fraction of items without a debtor
+        payment_method_fraction: Fraction of users with a payment method
+    """
+
+    def __init__(
+        self,
+        users: int = 5000,
+        sessions: int = 2000,
+        participants: float = 3.0,
+        invoices_per_session: float = 3.0,
+        items_per_invoice: float = 6.0,
+        active_fraction: float = 0.05,
+        paid_fraction_closed: float = 0.85,
+        paid_fraction_active: float = 0.3,
+        unassigned_fraction: float = 0.1,
+        payment_method_fraction: float = 0.3,
+    ) -> None:
+        """Initialize a profile, by default of 6,000 invoices and 36,000 items."""
+        self.users = users
+        self.sessions = sessions
+        self.participants = participants
+        self.invoices_per_session = invoices_per_session
+        self.items_per_invoice = items_per_invoice
+        self.active_fraction = active_fraction
+        self.paid_fraction_closed = paid_fraction_closed
+        self.paid_fraction_active = paid_fraction_active
+        self.unassigned_fraction = unassigned_fraction
+        self.payment_method_fraction = payment_method_fraction
+
+
+def _skewed_count(rng: random.Random, mean: float, minimum: int = 1, maximum: int = 60) -> int:
+    """Log-normal count with roughly the given mean."""
+    sigma = 0.6
+    value = rng.lognormvariate(math.log(max(mean, minimum)) - sigma**2 / 2, sigma)
+    return max(minimum, min(round(value), maximum))
+
+
+class DatasetBuilder:
+    """Builds rows of the synthetic dataset, continuing from the IDs already in use.
+
+    Args:
+        profile: Volumes and distributions
+        next_ids: Next free ID of each table in ``ID_TABLES``
+        busy_user_ids: Users already in an active session
+        seed: Random seed
+    """
+
+    def __init__(
+        self, profile: DatasetProfile, next_ids: dict[str, int], busy_user_ids: set[int], seed: int | None = None
+    ) -> None:
+        """Initialize a builder without users.
+
+        Args:
+            profile: Volumes and distributions
+            next_ids: Next free ID of each table in ``ID_TABLES``
+            busy_user_ids: Users already in an active session
+            seed: Random seed
+        """
+        self.profile = profile
+        self.next_ids = dict(next_ids)
+        self.busy_user_ids = set(busy_user_ids)
+        self.rng = random.Random(seed)
+        self.user_ids: list[int] = []
+        self._cum_weights: list[float] = []
+
+    def _take_id(self, table: str) -> int:
+        value = self.next_ids[table]
+        self.next_ids[table] += 1
+        return value
+
+    def add_existing_users(self, user_ids: list[int]) -> None:
+        """Let sessions also pick users that are already in the database."""
+        for user_id in user_ids:
+            self._add_user(user_id)
+
+    def _add_user(self, user_id: int) -> None:
+        # Pareto popularity: a few users take part in many sessions
+        weight = self.rng.paretovariate(1.2)
+        self.user_ids.append(user_id)
+        self._cum_weights.append((self._cum_weights[-1] if self._cum_weights else 0.0) + weight)
+
+    def users(self, count: int) -> dict[str, list[tuple]]:
+        """Rows of new users and their payment methods.
+
+        Args:
+            count: Number of users
+
+        Returns:
+            Rows per table
+        """
+        rows: dict[str, list[tuple]] = {"users": [], "payment_methods": []}
+        for _ in range(count):
+            user_id = self._take_id("users")
+            # The +999 prefix is not assigned to any country, so it never collides with real users
+            rows["users"].append((user_id, f"Usuario Sintético {user_id}", f"+999{user_id:09d}"))
+            self._add_user(user_id)
+            if self.rng.random() < self.profile.payment_method_fraction:
+                bank = self.rng.choice(BANKS)
+                account = self.rng.randrange(10**7, 10**8)
+                rut = f"{self.rng.randrange(10**7, 3 * 10**7)}-{self.rng.randrange(10)}"
+                description = f"Cuenta corriente {account}\nRUT {rut}"
+                rows["payment_methods"].append((self._take_id("payment_methods"), bank, description, user_id))
+        return rows
+
+    def _pick_members(self, count: int, exclude: set[int]) -> list[int]:
+        members: list[int] = []
+        for _ in range(count * 4):
+            if len(members) == count:
+                break
+            user_id = self.rng.choices(self.user_ids, cum_weights=self._cum_weights)[0]
+            if user_id not in exclude and user_id not in members:
+                members.append(user_id)
+        return members
+
+    def sessions(self, count: int) -> dict[str, list[tuple]]:
+        """Rows of new sessions with their members, invoices, items, payments and LLM usage.
+
+        Args:
+            count: Number of sessions
+
+        Returns:
+            Rows per table
+        """
+        if not self.user_ids:
+            raise ValueError("Add users before generating sessions")
+        rows: dict[str, list[tuple]] = {
+            table: [] for table in TABLE_COLUMNS if table not in ("users", "payment_methods")
+        }
+        today = date.today()
+        for _ in range(count):
+            active = self.rng.random() < self.profile.active_fraction
+            members = self._pick_members(
+                _skewed_count(self.rng, self.profile.participants + 1, minimum=2, maximum=30),
+                self.busy_user_ids if active else set(),
+            )
+            if len(members) < 2:
+                # Not enough users left outside active sessions
+                active = False
+                members = self._pick_members(2, set())
+            if active:
+                self.busy_user_ids.update(members)
+
+            session_id = uuid.UUID(int=self.rng.getrandbits(128), version=4)
+            owner_id = members[0]
+            rows["sessions"].append(
+                (session_id, f"Sesión sintética {session_id.hex[:8]}", owner_id, "ACTIVE" if active else "CLOSED", 0)
+            )
+            rows["session_users"].extend((session_id, user_id) for user_id in members[1:])
+
+            paid_fraction = self.profile.paid_fraction_active if active else self.profile.paid_fraction_closed
+            day = today - timedelta(days=0 if active else self.rng.randrange(1, 365))
+            for _ in range(_skewed_count(self.rng, self.profile.invoices_per_session)):
+                self._invoice(rows, session_id, members, paid_fraction, day)
+        return rows
+
+    def _invoice(
+        self, rows: dict[str, list[tuple]], session_id: uuid.UUID, members: list[int], paid_fraction: float, day: date
+    ) -> None:
+        invoice_id = self._take_id("invoices")
+        payer_id = members[0] if self.rng.random() < 0.6 else self.rng.choice(members)
+        tip = self.rng.choice(TIP_RATES)
+        total = pending = Decimal(0)
+        payments: dict[int, tuple[int, list[list[Any]]]] = {}
+        for _ in range(_skewed_count(self.rng, self.profile.items_per_invoice, maximum=80)):
+            unit_price = Decimal(round(self.rng.lognormvariate(math.log(6000), 0.6), -1)).quantize(CENT)
+            item_total = (unit_price * (1 + tip)).quantize(CENT)
+            debtor_id = None if self.rng.random() < self.profile.unassigned_fraction else self.rng.choice(members)
+            item = [
+                self._take_id("items"),
+                invoice_id,
+                debtor_id,
+                unit_price,
+                Decimal(0),
+                tip,
+                item_total,
+                False,
+                None,
+                self.rng.choice(MENU),
+            ]
+            if debtor_id is not None and debtor_id != payer_id and self.rng.random() < paid_fraction:
+                payment_id = payments.setdefault(debtor_id, (self._take_id("payments"), []))[0]
+                item[4], item[7], item[8] = item_total, True, payment_id
+                payments[debtor_id][1].append(item)
+            else:
+                pending += item_total
+            total += item_total
+            rows["items"].append(tuple(item))
+
+        rows["invoices"].append((invoice_id, self.rng.choice(MERCHANTS), total, pending, payer_id, session_id))
+        for debtor_id, (payment_id, items) in payments.items():
+            rows["payments"].append((payment_id, debtor_id, payer_id, sum(item[6] for item in items)))
+
+        for schema, input_tokens, output_tokens in (("classification", 900, 10), ("receipt", 1100, 350)):
+            rows["llm_usage"].append(
+                (
+                    f"wamid.synthetic.{invoice_id}",
+                    payer_id,
+                    session_id,
+                    day,
+                    schema,
+                    "gpt-4o-mini",
+                    1,
+                    input_tokens,
+                    output_tokens,
+                    0,
+                    1,
+                    Decimal(self.rng.randrange(400, 4000)),
+                    Decimal((input_tokens * 0.15 + output_tokens * 0.6) / 1_000_000).quantize(Decimal("0.000001")),
+                )
+            )
+
+
+RowWriter = Callable[[AsyncConnection, str, list[tuple]], Any]
+
+
+async def copy_rows(conn: AsyncConnection, table: str, rows: list[tuple]) -> None:
+    """Write rows with ``COPY ... FROM STDIN (FORMAT binary)``."""
+    if not rows:
+        return
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(table, records=rows, columns=list(TABLE_COLUMNS[table]))
+
+
+async def insert_rows(conn: AsyncConnection, table: str, rows: list[tuple], chunk_size: int = 5000) -> None:
+    """Write rows with multi-row ``INSERT`` statements of ``chunk_size`` rows."""
+    columns = TABLE_COLUMNS[table]
+    for start in range(0, len(rows), chunk_size):
+        chunk = [dict(zip(columns, row)) for row in rows[start : start + chunk_size]]
+        await conn.execute(insert(Base.metadata.tables[table]), chunk)
+
+
+WRITERS: dict[str, RowWriter] = {"copy": copy_rows, "insert": insert_rows}
+
+
+async def write_rows(conn: AsyncConnection, rows: dict[str, list[tuple]], writer: RowWriter) -> dict[str, int]:
+    """Write rows of several tables, parents first.
+
+    Returns:
+        Number of rows written per table
+    """
+    written = {}
+    for table in TABLE_COLUMNS:
+        if rows.get(table):
+            await writer(conn, table, rows[table])
+            written[table] = len(rows[table])
+    return written
+
+
+async def table_counts(conn: AsyncConnection) -> dict[str, int]:
+    """Exact row count of every generated table."""
+    counts = {}
+    for table in TABLE_COLUMNS:
+        counts[table] = (await conn.execute(text(f"SELECT count(*) FROM {table}"))).scalar_one()
+    return counts
+
+
+async def generate_dataset(
+    engine: AsyncEngine,
+    scale: float,
+    profile: DatasetProfile | None = None,
+    method: str = "copy",
+    seed: int | None = None,
+    sessions_per_batch: int = 1000,
+) -> dict[str, int]:
+    """Top the database up to ``scale`` times the profile's users and sessions.
+
+    Args:
+        engine: Engine of the database to fill
+        scale: Multiple of the profile's volumes to reach
+        profile: Volumes and distributions, the default profile if None
+        method: ``copy`` or ``insert``
+        seed: Random seed
+        sessions_per_batch: Sessions written per transaction
+
+    Returns:
+        Number of rows written per table
+    """
+    profile = profile or DatasetProfile()
+    writer = WRITERS[method]
+    async with engine.connect() as conn:
+        next_ids = {
+            table: (await conn.execute(text(f"SELECT coalesce(max(id), 0) + 1 FROM {table}"))).scalar_one()
+            for table in ID_TABLES
+        }
+        existing_users = list((await conn.execute(text("SELECT id FROM users"))).scalars())
+        busy = await conn.execute(
+            text(
+                "SELECT owner_id FROM sessions WHERE status = 'ACTIVE' "
+                "UNION SELECT su.user_id FROM session_users su "
+                "JOIN sessions s ON s.id = su.session_id WHERE s.status = 'ACTIVE'"
+            )
+        )
+        busy_user_ids = set(busy.scalars())
+        existing_sessions = (await conn.execute(text("SELECT count(*) FROM sessions"))).scalar_one()
+
+    builder = DatasetBuilder(profile, next_ids, busy_user_ids, seed)
+    builder.add_existing_users(existing_users)
+    totals: dict[str, int] = dict.fromkeys(TABLE_COLUMNS, 0)
+
+    async def write(rows: dict[str, list[tuple]]) -> None:
+        async with engine.begin() as conn:
+            for table, count in (await write_rows(conn, rows, writer)).items():
+                totals[table] += count
+
+    new_users = max(round(profile.users * scale) - len(existing_users), 0)
+    for start in range(0, new_users, 10_000):
+        await write(builder.users(min(10_000, new_users - start)))
+    if not builder.user_ids:
+        return totals
+
+    new_sessions = max(round(profile.sessions * scale) - existing_sessions, 0)
+    for start in range(0, new_sessions, sessions_per_batch):
+        await write(builder.sessions(min(sessions_per_batch, new_sessions - start)))
+        print(f"  {min(start + sessions_per_batch, new_sessions)}/{new_sessions} sessions", flush=True)
+
+    async with engine.begin() as conn:
+        for table in ID_TABLES:
+            await conn.execute(
+                text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))")
+            )
+        # Planner statistics must reflect the new volume before benchmarking
+        await conn.execute(text(f"ANALYZE {', '.join(TABLE_COLUMNS)}"))
+    return totals
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Generate the dataset and print what was written."""
+    await db_manager.connect()
+    try:
+        started = time.perf_counter()
+        written = await generate_dataset(db_manager.engine, args.scale, method=args.method, seed=args.seed)
+        elapsed = time.perf_counter() - started
+        rows = sum(written.values())
+        print(f"Wrote {rows} rows in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:.0f} rows/s) with {args.method}")
+        for table, count in written.items():
+            print(f"  {table:<16} {count:>10}")
+        async with db_manager.engine.connect() as conn:
+            print("Table sizes:", await table_counts(conn))
+    finally:
+        await db_manager.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a large synthetic dataset")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiple of the base profile to reach")
+    parser.add_argument("--method", choices=sorted(WRITERS), default="copy", help="bulk write method")
+    parser.add_argument("--seed", type=int, help="random seed")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,4 @@
+"""End-to-end load test with stand-in Kapso and LLM services.
+
+See ``scripts.loadtest.__main__`` for usage.
+"""
@@ -0,0 +1,373 @@
+"""Drive the Kapso webhook at a target rate and report latency percentiles.
+
+Starts a fake Kapso API (records sends, serves media, optional latency and
+error injection) and a fake OpenAI API (canned schema-valid structured
+outputs, optional latency) in this process, starts the app with uvicorn
+pointed at them and at the database in ``DATABASE_URL``, then:
+
+1. Warm-up: every simulated user creates a session and uploads a receipt, so
+   transfers and item assignments have something to work on.
+2. Load: webhook messages are sent open-loop at ``--rps`` for ``--duration``
+   seconds, each a random scenario of ``--mix`` from a random user.
+
+The report lists p50/p95/p99/max latency and errors per scenario, the fake
+services' counters, and can be saved as JSON to compare runs.
+
+With ``--llm-fixtures`` the app records or replays LLM outputs
+(``app/services/llm_fixtures.py``): a run with ``--llm-fixtures-mode auto``
+records the fake LLM's answers, and later runs replay them with no LLM
+latency at all, which isolates the app's own overhead. Prompts only contain
+run-independent text (user names, commands, item descriptions), so record
+and replay with the same ``--users`` and ``--seed`` to send the same
+messages; a replay run that still misses a fixture shows up as errors.
+
+The database must be migrated (``alembic upgrade head``). Users are created
+with random phone numbers on every run, so runs don't interfere.
+
+Usage:
+    python -m scripts.loadtest --rps 20 --duration 60
+    python -m scripts.loadtest --rps 50 --llm-latency-ms 800 --llm-jitter-ms 400 --kapso-error-rate 0.01
+    python -m scripts.loadtest --mix text=1,voice=1 --workers 4 --json baseline.json
+    python -m scripts.loadtest --llm-fixtures /tmp/llm-fixtures --llm-fixtures-mode auto
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from scripts.loadtest.fake_kapso import KapsoRecorder, create_fake_kapso_app
+from scripts.loadtest.fake_llm import LLMRecorder, create_fake_llm_app
+from scripts.loadtest.scenarios import DEFAULT_MIX, SCENARIOS, SimulatedUser, parse_mix, text_message
+
+WEBHOOK_PATH = "/webhooks/kapso/received"
+PHONE_NUMBER_ID = "loadtest"
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile.
+
+    Args:
+        sorted_values: Values in ascending order
+        q: Percentile between 0 and 100
+
+    Returns:
+        The percentile, 0 when there are no values
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class LoadResults:
+    """Outcome of every webhook request sent during the load phase."""
+
+    def __init__(self) -> None:
+        """Initialize empty results."""
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, Counter[str]] = defaultdict(Counter)
+
+    def record(self, scenario: str, seconds: float, error: str | None) -> None:
+        """Record a request.
+
+        Args:
+            scenario: Scenario name
+            seconds: Time until the response (or the failure)
+            error: HTTP status or exception name, None on success
+        """
+        self.latencies[scenario].append(seconds)
+        if error is not None:
+            self.errors[scenario][error] += 1
+
+    def summary(self, elapsed: float) -> dict[str, Any]:
+        """Latency percentiles in milliseconds and errors, per scenario and overall.
+
+        Args:
+            elapsed: Duration of the load phase in seconds
+        """
+
+        def stats(latencies: list[float], errors: Counter[str]) -> dict[str, Any]:
+            ordered = sorted(latencies)
+            return {
+                "requests": len(ordered),
+                "errors": sum(errors.values()),
+                "error_kinds": dict(errors),
+                **{f"p{q}_ms": round(percentile(ordered, q) * 1000, 1) for q in (50, 95, 99)},
+                "max_ms": round(ordered[-1] * 1000, 1) if ordered else 0.0,
+            }
+
+        all_latencies = [value for values in self.latencies.values() for value in values]
+        all_errors: Counter[str] = sum(self.errors.values(), Counter())
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "achieved_rps": round(len(all_latencies) / elapsed, 2) if elapsed else 0.0,
+            "total": stats(all_latencies, all_errors),
+            "scenarios": {name: stats(values, self.errors[name]) for name, values in sorted(self.latencies.items())},
+        }
+
+
+def free_port() -> int:
+    """A TCP port free on localhost right now."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def serve(app: FastAPI, port: int) -> tuple[uvicorn.Server, asyncio.Task]:
+    """Run an ASGI app in this event loop until ``server.should_exit`` is set.
+
+    Args:
+        app: Application to serve
+        port: Port on 127.0.0.1
+
+    Returns:
+        The started server and the task running it
+    """
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.05)
+    return server, task
+
+
+async def start_app(port: int, env: dict[str, str], workers: int, log_path: str | None) -> asyncio.subprocess.Process:
+    """Start the application under uvicorn in a child process.
+
+    Args:
+        port: Port on 127.0.0.1
+        env: Environment of the process
+        workers: Number of uvicorn workers
+        log_path: File receiving the app's output, discarded when None
+
+    Returns:
+        The running process
+    """
+    output = open(log_path, "ab") if log_path else asyncio.subprocess.DEVNULL  # noqa: SIM115
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)]
+    command += ["--workers", str(workers), "--log-level", "warning", "--no-access-log"]
+    return await asyncio.create_subprocess_exec(*command, env=env, stdout=output, stderr=output)
+
+
+async def wait_until_ready(
+    client: httpx.AsyncClient, url: str, process: asyncio.subprocess.Process, timeout: float
+) -> None:
+    """Wait until the app answers HTTP requests.
+
+    Raises:
+        RuntimeError: If the app process exits
+        TimeoutError: If it does not answer within ``timeout`` seconds
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.returncode is not None:
+            raise RuntimeError(f"The app exited with code {process.returncode}, see --app-log for its output")
+        try:
+            await client.get(f"{url}/openapi.json")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+    raise TimeoutError(f"The app at {url} did not start within {timeout:.0f}s")
+
+
+async def send(client: httpx.AsyncClient, url: str, payload: dict[str, Any]) -> str | None:
+    """Post a webhook payload.
+
+    Returns:
+        HTTP status or exception name on failure, None on success
+    """
+    try:
+        response = await client.post(f"{url}{WEBHOOK_PATH}", json=payload)
+    except httpx.HTTPError as e:
+        return type(e).__name__
+    return None if response.is_success else str(response.status_code)
+
+
+async def warm_up(client: httpx.AsyncClient, url: str, users: list[SimulatedUser], media_url: str) -> int:
+    """Give every user an active session with a receipt.
+
+    Returns:
+        Number of failed warm-up requests
+    """
+
+    async def prepare(user: SimulatedUser) -> int:
+        failures = 0
+        for payload in (
+            text_message(user, media_url, body=f"crear sesión cena de {user.name}"),
+            SCENARIOS["receipt"](user, media_url),
+        ):
+            failures += await send(client, url, payload) is not None
+        return failures
+
+    return sum(await asyncio.gather(*(prepare(user) for user in users)))
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    url: str,
+    users: list[SimulatedUser],
+    media_url: str,
+    rps: float,
+    duration: float,
+    mix: dict[str, float],
+) -> dict[str, Any]:
+    """Send webhooks open-loop at a fixed rate and wait for all of them.
+
+    Requests are started on schedule whether or not earlier ones finished, so
+    a slow app shows up as higher latency instead of a lower request rate.
+
+    Returns:
+        Summary of ``LoadResults``
+    """
+    results = LoadResults()
+    names, weights = list(mix), list(mix.values())
+
+    async def one(scenario: str) -> None:
+        payload = SCENARIOS[scenario](random.choice(users), media_url)
+        started = time.perf_counter()
+        error = await send(client, url, payload)
+        results.record(scenario, time.perf_counter() - started, error)
+
+    tasks = []
+    started = time.perf_counter()
+    for index in range(int(rps * duration)):
+        delay = started + index / rps - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(random.choices(names, weights)[0])))
+    await asyncio.gather(*tasks)
+    return results.summary(time.perf_counter() - started)
+
+
+def print_report(report: dict[str, Any]) -> None:
+    """Print the load test results as a table."""
+    load = report["load"]
+    print(f"\n{load['total']['requests']} requests in {load['elapsed_s']}s ({load['achieved_rps']} req/s)")
+    print(f"{'scenario':<10} {'requests':>8} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, stats in [*load["scenarios"].items(), ("total", load["total"])]:
+        print(
+            f"{name:<10} {stats['requests']:>8} {stats['errors']:>7} {stats['p50_ms']:>9} "
+            f"{stats['p95_ms']:>9} {stats['p99_ms']:>9} {stats['max_ms']:>9}"
+        )
+    errors = {name: stats["error_kinds"] for name, stats in load["scenarios"].items() if stats["error_kinds"]}
+    if errors:
+        print(f"errors: {errors}")
+    print(f"warm-up failures: {report['warm_up_failures']}")
+    print(f"kapso: {report['kapso']}")
+    print(f"llm: {report['llm']}")
+
+
+async def main(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the load test.
+
+    Returns:
+        Report with the configuration, load results and fake service counters
+    """
+    kapso = KapsoRecorder(args.kapso_latency_ms, args.kapso_jitter_ms, args.kapso_error_rate)
+    llm = LLMRecorder(args.llm_latency_ms, args.llm_jitter_ms)
+    kapso_port, llm_port, app_port = free_port(), free_port(), args.app_port or free_port()
+    kapso_server, kapso_task = await serve(create_fake_kapso_app(kapso), kapso_port)
+    llm_server, llm_task = await serve(create_fake_llm_app(llm), llm_port)
+    kapso_url = f"http://127.0.0.1:{kapso_port}"
+    app_url = f"http://127.0.0.1:{app_port}"
+
+    env = {
+        **os.environ,
+        "KAPSO_URL": kapso_url,
+        "KAPSO_PHONE_NUMBER_ID": PHONE_NUMBER_ID,
+        "KAPSO_API_KEY": "loadtest",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{llm_port}/v1",
+        "OPENAI_API_KEY": "loadtest",
+    }
+    if args.database_url:
+        env["DATABASE_URL"] = args.database_url
+    if args.llm_fixtures:
+        env["LLM_FIXTURES_MODE"] = args.llm_fixtures_mode
+        env["LLM_FIXTURES_DIR"] = str(args.llm_fixtures)
+    process = await start_app(app_port, env, args.workers, args.app_log)
+
+    # Fresh phone numbers (not drawn from the seeded generator) keep runs apart in the
+    # database; names are the same every run, as they end up in LLM prompts
+    run_id = random.Random().randrange(10_000)
+    users = [SimulatedUser(f"+569{run_id:04d}{index:04d}", f"Carga {index}") for index in range(args.users)]
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=100)
+    try:
+        async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+            await wait_until_ready(client, app_url, process, args.startup_timeout)
+            print(f"Warming up {len(users)} users...")
+            warm_up_failures = await warm_up(client, app_url, users, f"{kapso_url}/media")
+            print(f"Sending {args.rps} req/s for {args.duration}s...")
+            load = await run_load(client, app_url, users, f"{kapso_url}/media", args.rps, args.duration, args.mix)
+    finally:
+        if process.returncode is None:
+            process.terminate()
+            await process.wait()
+        kapso_server.should_exit = llm_server.should_exit = True
+        await asyncio.gather(kapso_task, llm_task)
+
+    return {
+        "config": {key: value for key, value in vars(args).items() if key not in ("json", "database_url")},
+        "load": load,
+        "warm_up_failures": warm_up_failures,
+        "kapso": kapso.stats(),
+        "llm": llm.stats(),
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--rps", type=float, default=10.0, help="webhook messages per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load after the warm-up")
+    parser.add_argument("--users", type=int, default=20, help="simulated WhatsApp users")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=DEFAULT_MIX,
+        help="scenario weights, e.g. text=5,receipt=1,transfer=2,voice=2",
+    )
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0, help="mean fake LLM response time")
+    parser.add_argument("--llm-jitter-ms", type=float, default=100.0, help="maximum deviation from the mean")
+    parser.add_argument("--llm-fixtures", type=Path, help="serve LLM outputs from this fixture directory")
+    parser.add_argument(
+        "--llm-fixtures-mode",
+        choices=["record", "replay", "auto"],
+        default="replay",
+        help="fixture mode of the app when --llm-fixtures is given",
+    )
+    parser.add_argument("--kapso-latency-ms", type=float, default=50.0, help="mean fake Kapso response time")
+    parser.add_argument("--kapso-jitter-ms", type=float, default=20.0, help="maximum deviation from the mean")
+    parser.add_argument("--kapso-error-rate", type=float, default=0.0, help="fraction of Kapso sends failing with 500")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers of the app")
+    parser.add_argument("--app-port", type=int, default=0, help="app port, a free one by default")
+    parser.add_argument("--app-log", help="file receiving the app's output")
+    parser.add_argument("--database-url", help="database of the app, DATABASE_URL by default")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds before a webhook request fails")
+    parser.add_argument("--startup-timeout", type=float, default=30.0, help="seconds to wait for the app to start")
+    parser.add_argument("--seed", type=int, help="random seed for the traffic")
+    parser.add_argument("--json", type=Path, help="also write the report to this file")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    if arguments.seed is not None:
+        random.seed(arguments.seed)
+    report = asyncio.run(main(arguments))
+    print_report(report)
+    if arguments.json:
+        arguments.json.write_text(json.dumps(report, indent=2, default=str))
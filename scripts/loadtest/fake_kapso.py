@@ -0,0 +1,122 @@
+"""Stand-in for the Kapso WhatsApp API.
+
+Records every message the app sends, with configurable latency and error
+injection, and serves the media linked from webhook payloads: a receipt
+image, a transfer receipt image and a voice note. The two images are tiny
+PNGs whose text chunk tells the fake LLM server which document they are.
+"""
+
+import asyncio
+import random
+import struct
+import zlib
+from collections import Counter, deque
+from typing import Any
+
+from fastapi import FastAPI, Request, Response
+
+# Marker read back by the fake LLM server when classifying an image
+DOCUMENT_MARKER = b"loadtest-document:"
+
+
+def make_png(document_type: str) -> bytes:
+    """Build a 1x1 PNG tagged with the document type it stands for.
+
+    Args:
+        document_type: ``receipt`` or ``transfer``
+
+    Returns:
+        PNG file content
+    """
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 0, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"tEXt", b"Comment\x00" + DOCUMENT_MARKER + document_type.encode())
+        + chunk(b"IDAT", zlib.compress(b"\x00\xff"))
+        + chunk(b"IEND", b"")
+    )
+
+
+MEDIA = {
+    "receipt.png": (make_png("receipt"), "image/png"),
+    "transfer.png": (make_png("transfer"), "image/png"),
+    "voice.ogg": (b"OggS" + bytes(60), "audio/ogg"),
+}
+
+
+class KapsoRecorder:
+    """Messages received by the fake Kapso server.
+
+    Args:
+        latency_ms: Mean delay before answering a send
+        jitter_ms: Maximum deviation from the mean delay
+        error_rate: Fraction of sends answered with HTTP 500
+        keep: Number of recent sends kept for inspection
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0, keep: int = 1000):
+        """Initialize an empty recorder.
+
+        Args:
+            latency_ms: Mean delay before answering a send
+            jitter_ms: Maximum deviation from the mean delay
+            error_rate: Fraction of sends answered with HTTP 500
+            keep: Number of recent sends kept for inspection
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.sends = 0
+        self.errors = 0
+        self.recipients: Counter[str] = Counter()
+        self.recent: deque[dict[str, Any]] = deque(maxlen=keep)
+
+    def delay(self) -> float:
+        """Seconds to wait before answering."""
+        return max(self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms), 0.0) / 1000
+
+    def stats(self) -> dict[str, Any]:
+        """Summary for the load test report."""
+        return {"sends": self.sends, "injected_errors": self.errors, "recipients": len(self.recipients)}
+
+
+def create_fake_kapso_app(recorder: KapsoRecorder) -> FastAPI:
+    """Build the fake Kapso API.
+
+    Args:
+        recorder: Where sends are recorded
+
+    Returns:
+        ASGI application serving ``POST /{phone_number_id}/messages`` and ``GET /media/{name}``
+    """
+    app = FastAPI(openapi_url=None)
+
+    @app.post("/{phone_number_id}/messages")
+    async def send_message(phone_number_id: str, request: Request) -> Response:
+        body = await request.json()
+        await asyncio.sleep(recorder.delay())
+        if recorder.error_rate and random.random() < recorder.error_rate:
+            recorder.errors += 1
+            return Response(status_code=500)
+        recorder.sends += 1
+        recorder.recipients[body.get("to", "")] += 1
+        recorder.recent.append(body)
+        return Response(content=b'{"messages": [{"id": "wamid.fake"}]}', media_type="application/json")
+
+    @app.get("/media/{name}")
+    async def media(name: str) -> Response:
+        if name not in MEDIA:
+            return Response(status_code=404)
+        content, media_type = MEDIA[name]
+        return Response(content=content, media_type=media_type)
+
+    @app.get("/_stats")
+    async def stats() -> dict[str, Any]:
+        return recorder.stats()
+
+    return app
@@ -0,0 +1,288 @@
+"""Stand-in for the OpenAI chat completions API.
+
+Answers ``POST /v1/chat/completions`` with canned structured outputs that
+validate against the schema requested by ``with_structured_output``, picked
+from the prompt the way the real model would: images tagged by
+``fake_kapso.make_png`` are classified by their tag, agent commands by
+keywords, item matching against the items listed in the prompt. Both the
+``json_schema`` response format (the LangChain default) and function calling
+are supported. Token usage is a rough estimate from the prompt length.
+"""
+
+import asyncio
+import base64
+import json
+import random
+import re
+import time
+import unicodedata
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from datetime import date
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from scripts.loadtest.fake_kapso import DOCUMENT_MARKER
+
+# Items on the canned receipt, also referenced by the load test's commands
+MENU = {"pizza": 12000.0, "cerveza": 4500.0, "bebida": 2500.0, "papas fritas": 5000.0}
+TRANSFER_AMOUNT = 12000.0
+
+# Tokens billed per image, roughly OpenAI's low-detail cost
+IMAGE_TOKENS = 85
+
+
+class Prompt:
+    """Text and images sent in a chat completion request.
+
+    Args:
+        messages: OpenAI ``messages`` of the request
+    """
+
+    def __init__(self, messages: list[dict[str, Any]]) -> None:
+        """Collect the text and decoded images of the messages.
+
+        Args:
+            messages: OpenAI ``messages`` of the request
+        """
+        self.texts: list[str] = []
+        self.images: list[bytes] = []
+        for message in messages:
+            content = message.get("content")
+            parts = content if isinstance(content, list) else [{"type": "text", "text": content or ""}]
+            for part in parts:
+                if part.get("type") == "text":
+                    self.texts.append(part["text"])
+                elif part.get("type") == "image_url":
+                    url = part["image_url"]["url"]
+                    self.images.append(base64.b64decode(url.split(",", 1)[1]) if url.startswith("data:") else b"")
+
+    @property
+    def text(self) -> str:
+        """All the text of the prompt."""
+        return "\n".join(self.texts)
+
+    @property
+    def user_text(self) -> str:
+        """What the WhatsApp user wrote: the last text, after the agent's system prompt."""
+        return self.texts[-1] if self.texts else ""
+
+    def document_type(self) -> str:
+        """Document type tagged in the first image, ``receipt`` by default."""
+        for image in self.images:
+            index = image.find(DOCUMENT_MARKER)
+            if index != -1:
+                return image[index + len(DOCUMENT_MARKER) :].split(b"\x00", 1)[0][:8].decode(errors="ignore")
+        return "receipt"
+
+    def tokens(self) -> int:
+        """Rough prompt token count."""
+        return len(self.text) // 4 + IMAGE_TOKENS * len(self.images)
+
+
+def _fold(text: str) -> str:
+    return unicodedata.normalize("NFKD", text.lower()).encode("ascii", "ignore").decode()
+
+
+def _menu_items(text: str) -> list[str]:
+    folded = _fold(text)
+    return [item for item in MENU if item.split()[0] in folded]
+
+
+def classification(prompt: Prompt) -> dict[str, Any]:
+    """Output of ``ClassificationSchema``."""
+    return {"document_type": "transfer" if prompt.document_type().startswith("transfer") else "receipt"}
+
+
+def receipt(prompt: Prompt) -> dict[str, Any]:
+    """Output of ``ReceiptLLMSchema``."""
+    total = sum(MENU.values())
+    return {
+        "merchant": "Restaurante Carga",
+        "date": date.today().isoformat(),
+        "total_amount": round(total * 1.1, 2),
+        "tip": 0.1,
+        "items": [{"description": name.title(), "amount": price, "count": 1} for name, price in MENU.items()],
+    }
+
+
+def transfer(prompt: Prompt) -> dict[str, Any]:
+    """Output of ``TransferLLMSchema``."""
+    return {"recipient": "Restaurante Carga", "amount": TRANSFER_AMOUNT, "description": "Transferencia"}
+
+
+def agent_action(prompt: Prompt) -> dict[str, Any]:
+    """Output of ``AgentActionSchema``, chosen by keywords in the user text."""
+    text = _fold(prompt.user_text)
+    if "crear" in text or "nueva sesion" in text:
+        return {"action": "create_session", "create_session_data": {"description": text[:60] or "Carga"}}
+    if "cerrar" in text:
+        return {"action": "close_session", "close_session_data": {}}
+    if "cobrar" in text or "recaudar" in text:
+        return {"action": "trigger_collect"}
+    if "asigna" in text or "consumi" in text:
+        items = _menu_items(text)
+        return {
+            "action": "assign_item_to_user",
+            "assign_item_to_user_data": {"item_description": items[0] if items else "pizza"},
+        }
+    if "debo" in text or "deuda" in text:
+        return {"action": "query_debt_status"}
+    return {"action": "unknown", "unknown_data": {"reason": "Mensaje sin instrucción reconocible"}}
+
+
+def payment_intent(prompt: Prompt) -> dict[str, Any]:
+    """Output of ``PaymentIntent``, with the menu items mentioned by the user."""
+    items = _menu_items(prompt.user_text)
+    if not items:
+        return {"items_paid": [{"item_description": "pago"}], "is_payment": False}
+    return {"items_paid": [{"item_description": item, "quantity": 1, "confidence": 0.9} for item in items]}
+
+
+def payment_method(prompt: Prompt) -> dict[str, Any]:
+    """Output of ``PaymentMethodInfo``, positive only for messages with bank details."""
+    text = _fold(prompt.user_text)
+    is_payment_method = "banco" in text or "cuenta" in text
+    return {
+        "bank_name": "Banco Carga" if is_payment_method else "",
+        "description": prompt.user_text[:200] if is_payment_method else "",
+        "is_payment_method": is_payment_method,
+    }
+
+
+_INTENT_LINE = re.compile(r"^- (.+?) \(cantidad: \d+\)$", re.MULTILINE)
+_ITEM_LINE = re.compile(r"^- (\d+): Descripción: '(.*?)'.*Pagado: (True|False)$", re.MULTILINE)
+
+
+def item_matching(prompt: Prompt) -> dict[str, Any]:
+    """Output of ``ItemMatchingResult``, matching intents to unpaid items listed in the prompt."""
+    available = [
+        (int(number), _fold(description))
+        for number, description, paid in _ITEM_LINE.findall(prompt.text)
+        if paid == "False"
+    ]
+    matches = []
+    for intent in _INTENT_LINE.findall(prompt.text):
+        word = _fold(intent).split()[0] if intent.strip() else ""
+        number = next((number for number, description in available if word and word in description), None)
+        if number is not None:
+            available = [item for item in available if item[0] != number]
+        matches.append(
+            {
+                "intent_description": intent,
+                "matched_item_number": number,
+                "match_confidence": 0.9 if number is not None else 0.0,
+                "reasoning": "Coincidencia por descripción",
+            }
+        )
+    return {"matches": matches}
+
+
+# Canned output builders by schema name (the Pydantic class name)
+RESPONDERS: dict[str, Callable[[Prompt], dict[str, Any]]] = {
+    "ClassificationSchema": classification,
+    "ReceiptLLMSchema": receipt,
+    "TransferLLMSchema": transfer,
+    "AgentActionSchema": agent_action,
+    "PaymentIntent": payment_intent,
+    "PaymentMethodInfo": payment_method,
+    "ItemMatchingResult": item_matching,
+}
+
+
+class LLMRecorder:
+    """Calls answered by the fake LLM server.
+
+    Args:
+        latency_ms: Mean delay before answering
+        jitter_ms: Maximum deviation from the mean delay
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0) -> None:
+        """Initialize an empty recorder.
+
+        Args:
+            latency_ms: Mean delay before answering
+            jitter_ms: Maximum deviation from the mean delay
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.calls: Counter[str] = Counter()
+
+    def delay(self) -> float:
+        """Seconds to wait before answering."""
+        return max(self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms), 0.0) / 1000
+
+    def stats(self) -> dict[str, Any]:
+        """Summary for the load test report."""
+        return {"calls": sum(self.calls.values()), "by_schema": dict(self.calls)}
+
+
+def _requested_schema(body: dict[str, Any]) -> tuple[str | None, bool]:
+    """Schema name requested by a chat completion, and whether it is a function call."""
+    response_format = body.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        return response_format["json_schema"]["name"], False
+    for tool in body.get("tools") or []:
+        return tool["function"]["name"], True
+    return None, False
+
+
+def _completion(body: dict[str, Any], output: dict[str, Any], tool_call: bool, prompt: Prompt) -> dict[str, Any]:
+    content = json.dumps(output, ensure_ascii=False)
+    message: dict[str, Any] = {"role": "assistant", "content": content, "refusal": None}
+    if tool_call:
+        name = body["tools"][0]["function"]["name"]
+        message["content"] = None
+        function = {"name": name, "arguments": content}
+        message["tool_calls"] = [{"id": f"call_{uuid.uuid4().hex[:24]}", "type": "function", "function": function}]
+    prompt_tokens = prompt.tokens()
+    completion_tokens = len(content) // 4
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o-mini"),
+        "choices": [
+            {"index": 0, "message": message, "finish_reason": "tool_calls" if tool_call else "stop", "logprobs": None}
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def create_fake_llm_app(recorder: LLMRecorder) -> FastAPI:
+    """Build the fake OpenAI API.
+
+    Args:
+        recorder: Where calls are counted
+
+    Returns:
+        ASGI application serving ``POST /v1/chat/completions``
+    """
+    app = FastAPI(openapi_url=None)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request) -> JSONResponse:
+        body = await request.json()
+        schema, tool_call = _requested_schema(body)
+        responder = RESPONDERS.get(schema or "")
+        if responder is None:
+            error = {"message": f"No canned output for schema {schema!r}", "type": "invalid_request_error"}
+            return JSONResponse({"error": error}, status_code=400)
+        recorder.calls[schema] += 1
+        prompt = Prompt(body.get("messages", []))
+        await asyncio.sleep(recorder.delay())
+        return JSONResponse(_completion(body, responder(prompt), tool_call, prompt))
+
+    @app.get("/_stats")
+    async def stats() -> dict[str, Any]:
+        return recorder.stats()
+
+    return app
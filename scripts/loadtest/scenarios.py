@@ -0,0 +1,124 @@
+"""Webhook payloads sent by the load test.
+
+Each scenario builds a Kapso ``message.received`` payload for a simulated
+user, mirroring what WhatsApp users send: agent commands as text, receipt
+photos, transfer receipts with a caption-like context message, and voice
+notes whose transcript Kapso puts in ``last_message_text``.
+"""
+
+import random
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+TEXT_COMMANDS = (
+    "¿Cuánto debo?",
+    "cuánto es mi deuda",
+    "asigna la pizza a mí",
+    "yo consumí la cerveza",
+    "hola, ¿qué tal?",
+)
+TRANSFER_CONTEXTS = ("pagué la pizza", "te transferí la cerveza y la bebida", "pago papas fritas")
+VOICE_TRANSCRIPTS = ("cuánto debo en la sesión", "asigna la bebida a mí", "hola")
+
+# Default share of each scenario in the traffic
+DEFAULT_MIX = {"text": 5.0, "receipt": 1.0, "transfer": 2.0, "voice": 2.0}
+
+
+class SimulatedUser:
+    """A WhatsApp user of the load test.
+
+    Args:
+        phone_number: Sender phone number
+        name: Contact name
+    """
+
+    def __init__(self, phone_number: str, name: str) -> None:
+        """Initialize the user.
+
+        Args:
+            phone_number: Sender phone number
+            name: Contact name
+        """
+        self.phone_number = phone_number
+        self.name = name
+
+
+def build_payload(
+    user: SimulatedUser, message: dict[str, Any], last_message_text: str | None = None
+) -> dict[str, Any]:
+    """Wrap a message in a Kapso webhook payload.
+
+    Args:
+        user: Sender
+        message: ``text``, ``image`` or ``audio`` part of the message
+        last_message_text: Conversation's last message text, used for context and transcripts
+
+    Returns:
+        JSON body for ``POST /webhooks/kapso/received``
+    """
+    return {
+        "message": {"id": f"wamid.loadtest.{uuid.uuid4().hex}", "from": user.phone_number, **message},
+        "conversation": {
+            "contact_name": user.name,
+            "phone_number": user.phone_number,
+            "kapso": {"last_message_text": last_message_text},
+        },
+    }
+
+
+def text_message(user: SimulatedUser, media_url: str, body: str | None = None) -> dict[str, Any]:
+    """Agent command typed by the user."""
+    return build_payload(user, {"text": {"body": body or random.choice(TEXT_COMMANDS)}})
+
+
+def receipt_image(user: SimulatedUser, media_url: str) -> dict[str, Any]:
+    """Photo of a restaurant receipt."""
+    return build_payload(user, {"image": {"link": f"{media_url}/receipt.png"}})
+
+
+def transfer_with_context(user: SimulatedUser, media_url: str) -> dict[str, Any]:
+    """Transfer receipt sent right after saying what it pays for."""
+    return build_payload(
+        user, {"image": {"link": f"{media_url}/transfer.png"}}, last_message_text=random.choice(TRANSFER_CONTEXTS)
+    )
+
+
+def voice_note(user: SimulatedUser, media_url: str) -> dict[str, Any]:
+    """Voice note, transcribed by Kapso."""
+    audio = {"id": uuid.uuid4().hex, "link": f"{media_url}/voice.ogg", "voice": True, "mime_type": "audio/ogg"}
+    return build_payload(user, {"audio": audio}, last_message_text=f"Transcript: {random.choice(VOICE_TRANSCRIPTS)}")
+
+
+SCENARIOS: dict[str, Callable[[SimulatedUser, str], dict[str, Any]]] = {
+    "text": text_message,
+    "receipt": receipt_image,
+    "transfer": transfer_with_context,
+    "voice": voice_note,
+}
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """Parse a ``name=weight,...`` traffic mix.
+
+    Args:
+        value: Mix such as ``text=5,receipt=1,transfer=2,voice=2``
+
+    Returns:
+        Weight of each scenario
+
+    Raises:
+        ValueError: If a scenario is unknown or a weight is not a positive number
+    """
+    mix = {}
+    for entry in value.split(","):
+        name, _, weight = entry.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}, expected one of {', '.join(SCENARIOS)}")
+        mix[name] = float(weight)
+        if mix[name] < 0:
+            raise ValueError(f"Negative weight for scenario {name!r}")
+    if not any(mix.values()):
+        raise ValueError("The mix needs at least one scenario with a positive weight")
+    return mix
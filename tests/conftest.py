@@ -101,12 +101,13 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient]:
     Yields:
         AsyncClient: Test HTTP client
     """
-    from app.routers.deps import get_db
+    from app.routers.deps import get_db, get_read_db
 
     async def override_get_db() -> AsyncGenerator[AsyncSession]:
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     async with AsyncClient(app=app, base_url="http://test") as test_client:
         yield test_client
@@ -0,0 +1,65 @@
+"""Tests for the agent command processor's decision cache."""
+
+from collections.abc import Iterator
+
+import pytest
+from langchain_core.messages import BaseMessage
+
+from app.config import settings
+from app.models.text_agent import ActionType, AgentActionSchema
+from app.services.agent import processor
+from app.services.agent.prompt import get_agent_prompt
+
+
+@pytest.fixture
+def llm_calls(monkeypatch: pytest.MonkeyPatch) -> Iterator[list[list[BaseMessage]]]:
+    """Replace the LLM with one answering every command with QUERY_DEBT_STATUS, recording the prompts."""
+    calls: list[list[BaseMessage]] = []
+
+    async def ainvoke_llm(_, messages, schema):
+        calls.append(messages)
+        return AgentActionSchema(action=ActionType.QUERY_DEBT_STATUS)
+
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test")
+    monkeypatch.setattr(processor, "ainvoke_llm", ainvoke_llm)
+    processor.clear_command_cache()
+    yield calls
+    processor.clear_command_cache()
+
+
+async def test_prompt_is_static_system_message_and_user_turn(llm_calls: list[list[BaseMessage]]) -> None:
+    await processor.process_user_command("Juan paga la cerveza")
+
+    (messages,) = llm_calls
+    assert [message.type for message in messages] == ["system", "human"]
+    assert messages[0].content == get_agent_prompt()
+    assert messages[1].content == "Juan paga la cerveza"
+
+
+def test_normalize_command_folds_case_accents_and_punctuation() -> None:
+    assert processor.normalize_command("¿Cuánto  DEBO?") == "cuanto debo"
+    assert processor.normalize_command(" cerrar la sesión!! ") == "cerrar la sesion"
+    assert processor.normalize_command("?!") == ""
+
+
+async def test_repeated_commands_skip_the_llm(llm_calls: list[list[BaseMessage]]) -> None:
+    first = await processor.process_user_command("¿Cuánto debo?")
+    first.action = ActionType.CREATE_SESSION  # callers mutating a result don't corrupt the cache
+    second = await processor.process_user_command("cuanto debo")
+
+    assert len(llm_calls) == 1
+    assert second.action == ActionType.QUERY_DEBT_STATUS
+
+    await processor.process_user_command("cobrar")
+    assert len(llm_calls) == 2
+
+
+async def test_prompt_change_invalidates_cached_decisions(
+    llm_calls: list[list[BaseMessage]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await processor.process_user_command("cobrar")
+    monkeypatch.setattr(processor, "get_agent_prompt_version", lambda: "edited")
+    await processor.process_user_command("cobrar")
+    await processor.process_user_command("cobrar")
+
+    assert len(llm_calls) == 2
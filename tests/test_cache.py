@@ -0,0 +1,33 @@
+"""Tests for in-process caching helpers."""
+
+import time
+
+from app.utils.cache import TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    """Test that the least recently used entry is evicted when the cache is full."""
+    cache: TTLCache[int] = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_and_invalidates() -> None:
+    """Test entry expiry and explicit invalidation."""
+    cache: TTLCache[str] = TTLCache(maxsize=10, ttl=0.01)
+    cache.set("session", "roster")
+    time.sleep(0.02)
+    assert cache.get("session") is None
+
+    cache.ttl = 60
+    cache.set("session", "roster")
+    cache.invalidate("session")
+    assert cache.get("session") is None
+    assert len(cache) == 0
@@ -0,0 +1,36 @@
+"""Tests for collection message rendering."""
+
+from app.database.models.item import Item
+from app.database.models.payment_method import PaymentMethod
+from app.logic.collection_logic import build_collection_message
+
+
+def test_build_collection_message_groups_by_invoice() -> None:
+    """Test that a debtor's items are grouped by invoice with per-invoice totals."""
+    items = [
+        Item(id=1, invoice_id=10, description="Pizza", total=12.5),
+        Item(id=2, invoice_id=10, description="Bebida", total=2.5),
+        Item(id=3, invoice_id=11, description=None, total=4.0),
+    ]
+    payment_methods = [PaymentMethod(name="Banco de Chile", description="Cuenta Corriente\n00-801-65885-03")]
+
+    message = build_collection_message(items, "Alice", payment_methods)
+
+    assert message.splitlines() == [
+        "Le debes a Alice 15.00:",
+        "  • Pizza: 12.50",
+        "  • Bebida: 2.50",
+        "",
+        "Le debes a Alice 4.00:",
+        "  • Sin descripción: 4.00",
+        "",
+        "Puedes pagar a:",
+        "• Banco de Chile:",
+        "  Cuenta Corriente",
+        "  00-801-65885-03",
+    ]
+
+
+def test_build_collection_message_without_items() -> None:
+    """Test collection message when the debtor owes nothing."""
+    assert build_collection_message([], "Alice", []) == "No tienes deudas pendientes con esta persona."
@@ -0,0 +1,35 @@
+"""Test response compression middleware."""
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.compression import CompressionMiddleware
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/large")
+    async def large() -> PlainTextResponse:
+        return PlainTextResponse("x" * 1000)
+
+    @app.get("/small")
+    async def small() -> PlainTextResponse:
+        return PlainTextResponse("x")
+
+    return TestClient(app)
+
+
+def test_large_responses_are_gzipped() -> None:
+    """Test that responses above the threshold are compressed."""
+    response = _client().get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.text == "x" * 1000
+
+
+def test_small_responses_are_not_compressed() -> None:
+    """Test that responses below the threshold are sent as is."""
+    response = _client().get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
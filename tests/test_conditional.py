@@ -0,0 +1,21 @@
+"""Test conditional GET helpers."""
+
+import uuid
+
+from app.api.v1.conditional import _etag_matches, session_etag
+
+
+def test_etag_changes_with_version() -> None:
+    """Test that each session version gets its own ETag."""
+    session_id = uuid.uuid4()
+    assert session_etag(session_id, 1) != session_etag(session_id, 2)
+
+
+def test_etag_matches_if_none_match_lists() -> None:
+    """Test weak comparison against If-None-Match header values."""
+    etag = session_etag(uuid.uuid4(), 3)
+    assert _etag_matches(etag, etag)
+    assert _etag_matches(f'"other", {etag}', etag)
+    assert _etag_matches(etag.removeprefix("W/"), etag)
+    assert _etag_matches("*", etag)
+    assert not _etag_matches('W/"stale"', etag)
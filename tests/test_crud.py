@@ -5,6 +5,7 @@ import uuid
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database import db_manager
 from app.database.crud import (
     user_crud,
     session_crud,
@@ -13,6 +14,7 @@ from app.database.crud import (
     payment_crud,
 )
 from app.database.models.session import SessionStatus
+from app.database.versioning import get_session_version
 
 
 @pytest.mark.asyncio
@@ -50,6 +52,12 @@ async def test_user_crud(db_session: AsyncSession) -> None:
     users = await user_crud.get_multi(db_session, skip=0, limit=10)
     assert len(users) > 0
 
+    # Get page
+    users_page = await user_crud.get_page(db_session, limit=10, total="exact")
+    assert len(users_page) > 0
+    assert users_page.total == len(users_page)
+    assert users_page.next_cursor is None
+
     # Delete
     deleted_user = await user_crud.delete(db_session, id=user.id)
     assert deleted_user is not None
@@ -399,3 +407,67 @@ async def test_relationships(db_session: AsyncSession) -> None:
     assert updated_item.payment_id == payment.id
     assert updated_item.is_paid is True
 
+
+
+@pytest.mark.asyncio
+async def test_keyset_pagination(db_session: AsyncSession) -> None:
+    """Test that cursors walk through all records exactly once."""
+    for i in range(5):
+        await user_crud.create(
+            db_session, obj_in={"name": f"Page User {i}", "phone_number": f"+56900000{i}"}
+        )
+
+    seen = []
+    cursor = None
+    while True:
+        page = await user_crud.get_by_name(db_session, "Page User", cursor=cursor, limit=2)
+        seen.extend(user.id for user in page)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert len(seen) == 5
+    assert seen == sorted(seen)
+
+    with pytest.raises(ValueError):
+        await user_crud.get_page(db_session, cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_session_version_bumps_on_writes(db_session: AsyncSession) -> None:
+    """Test that invoice and item writes increment the session change version."""
+    owner = await user_crud.create(
+        db_session, obj_in={"name": "Version Owner", "phone_number": "+56911111111"}
+    )
+    session_data = {
+        "id": uuid.uuid4(),
+        "description": "Versioned",
+        "owner_id": owner.id,
+        "status": SessionStatus.ACTIVE,
+    }
+    session = await session_crud.create(db_session, obj_in=session_data)
+    initial = await get_session_version(db_session, session.id)
+
+    invoice_data = {
+        "description": "Dinner",
+        "total": 10,
+        "pending_amount": 10,
+        "payer_id": owner.id,
+        "session_id": session.id,
+    }
+    invoice = await invoice_crud.create(db_session, obj_in=invoice_data)
+    after_invoice = await get_session_version(db_session, session.id)
+    assert after_invoice > initial
+
+    item_data = {
+        "invoice_id": invoice.id,
+        "debtor_id": owner.id,
+        "unit_price": 10,
+        "total": 10,
+        "description": "Pasta",
+    }
+    item = await item_crud.create(db_session, obj_in=item_data)
+    await item_crud.update(db_session, db_obj=item, obj_in={"is_paid": True})
+    assert await get_session_version(db_session, session.id) > after_invoice + 1
+    # Committed writes keep reads about the session on the primary
+    assert db_manager._recent_writers.get(f"session:{session.id}")
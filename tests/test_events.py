@@ -0,0 +1,97 @@
+"""Test the live session event broker."""
+
+import uuid
+
+import pytest
+
+from app.core.events import EventBroker, Subscription
+from app.models.events import SessionEvent, SessionEventType
+
+
+@pytest.mark.asyncio
+async def test_broker_delivers_only_to_session_subscribers() -> None:
+    """Test that events reach subscribers of their own session only."""
+    broker = EventBroker()
+    session_id = uuid.uuid4()
+    subscription = broker.subscribe(session_id)
+    other = broker.subscribe(uuid.uuid4())
+
+    await broker.publish(SessionEvent(type=SessionEventType.INVOICE_CREATED, session_id=session_id))
+
+    event = await subscription.get(timeout=1)
+    assert event is not None
+    assert event.type == SessionEventType.INVOICE_CREATED
+    assert await other.get(timeout=0.01) is None
+
+    broker.unsubscribe(subscription)
+    broker.unsubscribe(other)
+    assert broker.subscriber_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_gets_resync() -> None:
+    """Test that a full subscription is replaced with a single resync event."""
+    session_id = uuid.uuid4()
+    subscription = Subscription(session_id, maxsize=2)
+    for _ in range(3):
+        subscription.deliver(SessionEvent(type=SessionEventType.ITEM_ASSIGNED, session_id=session_id))
+
+    event = await subscription.get(timeout=1)
+    assert event is not None
+    assert event.type == SessionEventType.RESYNC
+    assert subscription.dropped == 3
+    assert await subscription.get(timeout=0.01) is None
+
+
+class FakeConnection:
+    """asyncpg connection stand-in recording its listeners."""
+
+    def __init__(self) -> None:
+        self.on_terminate = None
+        self.closed = False
+
+    async def add_listener(self, channel: str, callback: object) -> None:
+        pass
+
+    def add_termination_listener(self, callback: object) -> None:
+        self.on_terminate = callback
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_lost_listener_connection_reconnects_and_resyncs(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a dropped LISTEN connection is re-established and subscribers are asked to resync."""
+    from app.core import events
+
+    connections: list[FakeConnection] = []
+    attempts = 0
+
+    async def connect(*args: object, **kwargs: object) -> FakeConnection:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 2:
+            raise OSError("connection refused")
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    monkeypatch.setattr(events.asyncpg, "connect", connect)
+    monkeypatch.setattr(events.settings, "EVENTS_BACKEND", "postgres")
+    monkeypatch.setattr(events.settings, "EVENTS_RECONNECT_MIN_SECONDS", 0.01)
+    broker = EventBroker()
+    await broker.start()
+    session_id = uuid.uuid4()
+    subscription = broker.subscribe(session_id)
+
+    connections[0].on_terminate(connections[0])
+    assert broker._connection is None
+
+    event = await subscription.get(timeout=1)
+    assert event is not None
+    assert event.type == SessionEventType.RESYNC
+    assert attempts == 3
+    assert broker._connection is connections[1]
+
+    await broker.stop()
+    assert connections[1].closed
@@ -0,0 +1,50 @@
+"""Tests for the CPU worker pool."""
+
+import asyncio
+import threading
+from collections.abc import Iterator
+
+import pytest
+
+from app.core.executor import WorkerPool, WorkerPoolBusyError
+from app.core.metrics import WORKER_POOL_REJECTIONS, WORKER_POOL_TASK_DURATION
+
+
+@pytest.fixture
+def pool() -> Iterator[WorkerPool]:
+    pool = WorkerPool("test", "thread", max_workers=1, max_queue=0, queue_timeout=0.05)
+    yield pool
+    pool.stop()
+
+
+async def test_runs_tasks_and_times_them(pool: WorkerPool) -> None:
+    assert await pool.run("test.sum", sum, [1, 2, 3]) == 6
+
+    assert WORKER_POOL_TASK_DURATION.child("test", "test.sum", "queue").count >= 1
+    assert WORKER_POOL_TASK_DURATION.child("test", "test.sum", "run").count >= 1
+    assert pool.in_flight == 0
+
+
+async def test_full_queue_rejects_until_the_worker_is_done(pool: WorkerPool) -> None:
+    release = threading.Event()
+    rejections = WORKER_POOL_REJECTIONS.value("test", "test.wait")
+
+    # The caller gives up, but the task keeps its slot while the worker runs it
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(pool.run("test.wait", release.wait), 0.01)
+    assert pool.in_flight == 1
+    with pytest.raises(WorkerPoolBusyError):
+        await pool.run("test.wait", release.wait)
+    assert WORKER_POOL_REJECTIONS.value("test", "test.wait") == rejections + 1
+
+    release.set()
+    assert await pool.run("test.wait", release.wait)
+    assert pool.in_flight == 0
+
+
+async def test_process_workers() -> None:
+    pool = WorkerPool("test", "process", max_workers=1, max_queue=1, queue_timeout=1.0)
+    try:
+        assert await pool.run("test.pow", pow, 2, 10) == 1024
+    finally:
+        pool.stop()
@@ -0,0 +1,32 @@
+"""Test streaming export encoders."""
+
+import csv
+import io
+import json
+import uuid
+from decimal import Decimal
+
+from app.api.v1.export import _csv_encoder, _encode_ndjson
+from app.database.sql.export import EXPORT_COLUMNS
+
+
+def _row(item_id: int) -> dict:
+    row = dict.fromkeys(EXPORT_COLUMNS)
+    row.update(session_id=uuid.uuid4(), item_id=item_id, total=Decimal("12.50"), is_paid=False)
+    return row
+
+
+def test_ndjson_encodes_one_object_per_line() -> None:
+    """Test that each row becomes a JSON line with numeric amounts."""
+    lines = _encode_ndjson([_row(1), _row(2)]).splitlines()
+    assert [json.loads(line)["item_id"] for line in lines] == [1, 2]
+    assert json.loads(lines[0])["total"] == 12.5
+
+
+def test_csv_encoder_reuses_buffer_between_batches() -> None:
+    """Test that each batch only contains its own rows."""
+    encode = _csv_encoder()
+    encode([_row(1), _row(2)])
+    rows = list(csv.reader(io.StringIO(encode([_row(3)]))))
+    assert len(rows) == 1
+    assert rows[0][EXPORT_COLUMNS.index("item_id")] == "3"
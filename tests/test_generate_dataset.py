@@ -0,0 +1,60 @@
+"""Tests for the synthetic dataset generator."""
+
+from collections import Counter, defaultdict
+
+from scripts.generate_dataset import ID_TABLES, TABLE_COLUMNS, DatasetBuilder, DatasetProfile
+
+
+def _build(sessions: int = 300, **profile: float) -> dict[str, list[dict]]:
+    builder = DatasetBuilder(DatasetProfile(users=500, **profile), dict.fromkeys(ID_TABLES, 1), set(), seed=7)
+    rows = {**builder.users(500), **builder.sessions(sessions)}
+    return {table: [dict(zip(TABLE_COLUMNS[table], row)) for row in rows[table]] for table in rows}
+
+
+def test_rows_match_table_columns() -> None:
+    builder = DatasetBuilder(DatasetProfile(), dict.fromkeys(ID_TABLES, 100), set(), seed=1)
+    rows = {**builder.users(50), **builder.sessions(20)}
+
+    for table, table_rows in rows.items():
+        assert all(len(row) == len(TABLE_COLUMNS[table]) for row in table_rows), table
+    assert rows["users"][0][0] == 100
+
+
+def test_invoice_totals_match_items_and_payments() -> None:
+    data = _build()
+    items_by_invoice = defaultdict(list)
+    for item in data["items"]:
+        items_by_invoice[item["invoice_id"]].append(item)
+    payments = {payment["id"]: payment for payment in data["payments"]}
+
+    for invoice in data["invoices"]:
+        items = items_by_invoice[invoice["id"]]
+        assert invoice["total"] == sum(item["total"] for item in items)
+        assert invoice["pending_amount"] == sum(item["total"] for item in items if not item["is_paid"])
+
+    paid_by_payment = Counter()
+    for item in data["items"]:
+        if item["is_paid"]:
+            payment = payments[item["payment_id"]]
+            assert payment["payer_id"] == item["debtor_id"]
+            paid_by_payment[item["payment_id"]] += item["total"]
+    assert all(payments[payment_id]["amount"] == amount for payment_id, amount in paid_by_payment.items())
+
+
+def test_users_are_in_one_active_session_at_most() -> None:
+    data = _build(active_fraction=0.5)
+    active = {session["id"]: session["owner_id"] for session in data["sessions"] if session["status"] == "ACTIVE"}
+    members = Counter(active.values())
+    members.update(row["user_id"] for row in data["session_users"] if row["session_id"] in active)
+
+    assert active
+    assert max(members.values()) == 1
+
+
+def test_participation_is_skewed() -> None:
+    data = _build(sessions=1000)
+    participation = Counter(row["user_id"] for row in data["session_users"])
+    counts = sorted(participation.values(), reverse=True)
+
+    # The busiest 10% of users take part in a disproportionate share of sessions
+    assert sum(counts[: len(counts) // 10]) > 0.3 * sum(counts)
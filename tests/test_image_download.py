@@ -0,0 +1,73 @@
+"""Tests for streaming image downloads."""
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.core.http_client import http_client
+from app.services.ocr_service import download_image_from_url, sniff_image_mime_type
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100
+JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 100
+
+
+@pytest.fixture
+def serve(monkeypatch: pytest.MonkeyPatch):
+    """Serve the given responses from the shared HTTP client, by URL path."""
+
+    def install(responses: dict[str, httpx.Response]) -> list[str]:
+        requested: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url.path)
+            return responses[request.url.path]
+
+        monkeypatch.setattr(http_client, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        return requested
+
+    return install
+
+
+def test_sniff_image_mime_type() -> None:
+    assert sniff_image_mime_type(PNG) == "image/png"
+    assert sniff_image_mime_type(JPEG) == "image/jpeg"
+    assert sniff_image_mime_type(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "image/webp"
+    assert sniff_image_mime_type(b"GIF89a") == "image/gif"
+    assert sniff_image_mime_type(b"<html>") is None
+
+
+async def test_mime_type_comes_from_content_not_headers(serve) -> None:
+    serve(
+        {
+            "/receipt.png": httpx.Response(200, content=JPEG, headers={"content-type": "image/png"}),
+            "/media": httpx.Response(200, content=PNG, headers={"content-type": "application/octet-stream"}),
+        }
+    )
+
+    assert await download_image_from_url("http://kapso/receipt.png") == (JPEG, "image/jpeg")
+    assert await download_image_from_url("http://kapso/media") == (PNG, "image/png")
+
+
+async def test_rejects_large_and_non_image_responses(serve, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "IMAGE_MAX_BYTES", 64)
+
+    async def stream():
+        yield PNG  # no Content-Length: the cap applies while streaming
+
+    serve(
+        {
+            "/declared": httpx.Response(200, content=PNG, headers={"content-type": "image/png"}),
+            "/streamed": httpx.Response(200, content=stream(), headers={"content-type": "image/png"}),
+            "/page": httpx.Response(200, content=b"<html>", headers={"content-type": "text/html"}),
+            "/fake": httpx.Response(200, content=b"<html>", headers={"content-type": "image/png"}),
+        }
+    )
+
+    for path, message in [
+        ("/declared", "too large"),
+        ("/streamed", "too large"),
+        ("/page", "not point to an image"),
+        ("/fake", "Unsupported image format"),
+    ]:
+        with pytest.raises(RuntimeError, match=message):
+            await download_image_from_url(f"http://kapso{path}")
@@ -0,0 +1,89 @@
+"""Tests for LLM call record and replay."""
+
+from pathlib import Path
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
+
+from app.models.payment_matching import ItemMatch, PaymentIntent
+from app.services.llm_fixtures import (
+    LLMFixtureNotFoundError,
+    ainvoke_llm,
+    fixture_key,
+    prompt_messages,
+    use_llm_fixtures,
+)
+
+
+class FakeModel:
+    """Counts calls and answers every prompt with the same payment intent."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, _: object) -> PaymentIntent:
+        self.calls += 1
+        return PaymentIntent(items_paid=[ItemMatch(item_description="pizza")], payment_description="call")
+
+
+def _chain(model: FakeModel):
+    prompt = ChatPromptTemplate.from_messages([("system", "Extrae el pago."), ("human", "{user_message}")])
+    return prompt | RunnableLambda(model)
+
+
+async def test_record_then_replay_without_calling_the_model(tmp_path: Path) -> None:
+    model = FakeModel()
+
+    with use_llm_fixtures("record", tmp_path):
+        recorded = await ainvoke_llm(_chain(model), {"user_message": "pagué la pizza"}, "payment_intent")
+    with use_llm_fixtures("replay", tmp_path):
+        replayed = await ainvoke_llm(_chain(model), {"user_message": "  pagué   la pizza\n"}, "payment_intent")
+
+    assert model.calls == 1
+    assert replayed == recorded
+    assert isinstance(replayed, PaymentIntent)
+    assert len(list((tmp_path / "payment_intent").glob("*.json"))) == 1
+
+
+async def test_replay_raises_for_unrecorded_calls(tmp_path: Path) -> None:
+    model = FakeModel()
+
+    with use_llm_fixtures("replay", tmp_path), pytest.raises(LLMFixtureNotFoundError):
+        await ainvoke_llm(_chain(model), {"user_message": "pagué el sushi"}, "payment_intent")
+    assert model.calls == 0
+
+
+async def test_auto_records_only_missing_calls(tmp_path: Path) -> None:
+    model = FakeModel()
+
+    with use_llm_fixtures("auto", tmp_path):
+        for message in ["pagué la pizza", "pagué el sushi", "pagué la pizza"]:
+            await ainvoke_llm(_chain(model), {"user_message": message}, "payment_intent")
+
+    assert model.calls == 2
+
+
+async def test_off_mode_calls_the_model(tmp_path: Path) -> None:
+    model = FakeModel()
+
+    with use_llm_fixtures("off", tmp_path):
+        await ainvoke_llm(RunnableLambda(model), [HumanMessage(content="hola")], "payment_intent")
+
+    assert model.calls == 1
+    assert not any(tmp_path.iterdir())
+
+
+def test_key_depends_on_schema_prompt_and_image_content() -> None:
+    def image(data: str) -> list[HumanMessage]:
+        url = f"data:image/png;base64,{data}"
+        content = [{"type": "text", "text": "Analiza"}, {"type": "image_url", "image_url": {"url": url}}]
+        return [HumanMessage(content=content)]
+
+    rendered = prompt_messages(_chain(FakeModel()), {"user_message": "pagué la pizza"})
+
+    assert [message.type for message in rendered] == ["system", "human"]
+    assert fixture_key("receipt", image("AAAA")) == fixture_key("receipt", image("AAAA"))
+    assert fixture_key("receipt", image("AAAA")) != fixture_key("receipt", image("BBBB"))
+    assert fixture_key("receipt", image("AAAA")) != fixture_key("transfer", image("AAAA"))
@@ -0,0 +1,123 @@
+"""Tests for the LLM call gate."""
+
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_openai import ChatOpenAI
+
+from app.core.metrics import LLM_GATE_REJECTIONS
+from app.models.payment_matching import PaymentIntent
+from app.services.llm_gate import CircuitBreaker, LLMUnavailableError, ModelGate, TokenBucket, model_name
+
+
+def _gate(max_concurrent_calls: int = 0, queue_timeout: float = 1.0, rpm: float | None = None) -> ModelGate:
+    breaker = CircuitBreaker(failure_ratio=0.5, min_calls=4, window=60, cooldown=0.05)
+    return ModelGate("test-model", max_concurrent_calls, queue_timeout, rpm, breaker)
+
+
+def _connection_error() -> openai.APIConnectionError:
+    return openai.APIConnectionError(request=httpx.Request("POST", "http://llm"))
+
+
+async def test_concurrency_limit_rejects_calls_waiting_too_long() -> None:
+    gate = _gate(max_concurrent_calls=1, queue_timeout=0.05)
+    rejections = LLM_GATE_REJECTIONS.value("test-model", "queue_timeout")
+    release = asyncio.Event()
+
+    async def hold_slot() -> None:
+        async with gate.slot():
+            await release.wait()
+
+    holder = asyncio.create_task(hold_slot())
+    await asyncio.sleep(0)
+    with pytest.raises(LLMUnavailableError) as error:
+        async with gate.slot():
+            pass
+    release.set()
+    await holder
+
+    assert error.value.reason == "queue_timeout"
+    assert LLM_GATE_REJECTIONS.value("test-model", "queue_timeout") == rejections + 1
+    assert (gate.in_flight, gate.waiting) == (0, 0)
+    async with gate.slot():  # the slot was released
+        pass
+
+
+async def test_token_bucket_spaces_calls_and_respects_deadline() -> None:
+    bucket = TokenBucket(rate=50, capacity=1)
+    started_at = time.monotonic()
+
+    for _ in range(3):
+        assert await bucket.acquire(deadline=started_at + 1)
+
+    assert time.monotonic() - started_at >= 0.035  # 2 waits of 20 ms after the burst of 1
+    assert not await bucket.acquire(deadline=time.monotonic())
+
+
+async def test_circuit_opens_on_provider_failures_and_closes_after_probe() -> None:
+    gate = _gate()
+    for _ in range(4):
+        with pytest.raises(openai.APIConnectionError):
+            async with gate.slot():
+                raise _connection_error()
+
+    with pytest.raises(LLMUnavailableError) as error:
+        async with gate.slot():
+            pass
+    assert error.value.reason == "circuit_open"
+
+    await asyncio.sleep(0.06)
+    async with gate.slot():  # probe call succeeds
+        pass
+    assert not gate.breaker.is_open
+
+
+async def test_late_outcomes_do_not_change_an_open_circuit() -> None:
+    gate = _gate()
+    finish_late_calls = asyncio.Event()
+
+    async def late_call(fail: bool) -> None:
+        async with gate.slot():
+            await finish_late_calls.wait()
+            if fail:
+                raise _connection_error()
+
+    # Admitted while the circuit was closed, still in flight when it opens
+    late_calls = [asyncio.create_task(late_call(fail)) for fail in (False, True)]
+    await asyncio.sleep(0)
+    for _ in range(4):
+        with pytest.raises(openai.APIConnectionError):
+            async with gate.slot():
+                raise _connection_error()
+    opened_at = gate.breaker.opened_at
+
+    finish_late_calls.set()
+    await asyncio.gather(*late_calls, return_exceptions=True)
+
+    assert gate.breaker.is_open
+    assert gate.breaker.opened_at == opened_at
+    with pytest.raises(LLMUnavailableError):
+        async with gate.slot():
+            pass
+
+
+async def test_bad_outputs_do_not_open_the_circuit() -> None:
+    gate = _gate()
+    for _ in range(6):
+        with pytest.raises(ValueError):
+            async with gate.slot():
+                raise ValueError("invalid structured output")
+
+    assert not gate.breaker.is_open
+
+
+def test_model_name_looks_inside_chains() -> None:
+    llm = ChatOpenAI(model="gpt-4o-mini", api_key="test")
+    chain = ChatPromptTemplate.from_messages([("human", "{user_message}")]) | llm.with_structured_output(PaymentIntent)
+
+    assert model_name(chain) == "gpt-4o-mini"
+    assert model_name(llm.with_structured_output(PaymentIntent)) == "gpt-4o-mini"
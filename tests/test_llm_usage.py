@@ -0,0 +1,68 @@
+"""Test LLM token and cost accounting."""
+
+import uuid
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from app.services import llm_usage
+from app.services.llm_callbacks import LLMMetricsCallback
+from app.services.llm_usage import MessageUsage, attribute_llm_usage, estimate_cost, track_llm_usage
+
+
+def test_estimate_cost_discounts_cached_tokens() -> None:
+    """Test cost estimation from per-million token prices."""
+    assert estimate_cost("gpt-4o-mini", 1_000_000, 0) == pytest.approx(0.15)
+    assert estimate_cost("gpt-4o-mini", 1_000_000, 1_000_000, cached_tokens=1_000_000) == pytest.approx(0.675)
+    assert estimate_cost("unknown-model", 1000, 1000) == 0
+
+
+def test_message_usage_aggregates_per_schema_and_model() -> None:
+    """Test that calls of the same schema and model are summed into one row."""
+    usage = MessageUsage("wamid.1", "+56900000000")
+    usage.add("receipt", "gpt-4o-mini", input_tokens=1000, output_tokens=100, images=1, latency_ms=800)
+    usage.add("receipt", "gpt-4o-mini", input_tokens=500, output_tokens=50, latency_ms=400)
+    usage.add("classification", "gpt-4o-mini", input_tokens=300, output_tokens=5, latency_ms=200)
+
+    rows = {row["schema"]: row for row in usage.rows()}
+
+    assert rows["receipt"]["calls"] == 2
+    assert rows["receipt"]["input_tokens"] == 1500
+    assert rows["receipt"]["images"] == 1
+    assert rows["receipt"]["latency_ms"] == 1200
+    assert rows["receipt"]["cost_usd"] == pytest.approx(estimate_cost("gpt-4o-mini", 1500, 150))
+    assert rows["classification"]["message_id"] == "wamid.1"
+
+
+@pytest.mark.asyncio
+async def test_callback_attributes_calls_to_current_message(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that LLM calls made while handling a message are saved with it."""
+    saved: list[MessageUsage] = []
+
+    async def save(usage: MessageUsage) -> None:
+        saved.append(usage)
+
+    monkeypatch.setattr(llm_usage, "save_message_usage", save)
+    callback = LLMMetricsCallback("transfer")
+    run_id = uuid.uuid4()
+    prompt = HumanMessage(content=[{"type": "text", "text": "?"}, {"type": "image_url", "image_url": {"url": "x"}}])
+    message = AIMessage(
+        content="",
+        usage_metadata={
+            "input_tokens": 900,
+            "output_tokens": 40,
+            "total_tokens": 940,
+            "input_token_details": {"cache_read": 128},
+        },
+    )
+    session_id = uuid.uuid4()
+
+    async with track_llm_usage("wamid.2", "+56900000000"):
+        callback.on_chat_model_start({}, [[prompt]], run_id=run_id, metadata={"ls_model_name": "gpt-4o-mini"})
+        callback.on_llm_end(LLMResult(generations=[[ChatGeneration(message=message)]]), run_id=run_id)
+        attribute_llm_usage(session_id)
+
+    [row] = saved[0].rows()
+    assert row["session_id"] == session_id
+    assert (row["input_tokens"], row["output_tokens"], row["cached_tokens"], row["images"]) == (900, 40, 128, 1)
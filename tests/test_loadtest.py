@@ -0,0 +1,120 @@
+"""Tests for the load test's fake services and reporting."""
+
+import base64
+
+import httpx
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_openai import ChatOpenAI
+
+from app.models.kapso import KapsoWebhookMessageReceived
+from app.models.payment_matching import PaymentIntent
+from app.models.payment_method_parsing import PaymentMethodInfo
+from app.models.text_agent import ActionType, AgentActionSchema
+from app.services.ocr_service import ClassificationSchema, DocumentType, ReceiptLLMSchema, TransferLLMSchema
+from scripts.loadtest.__main__ import LoadResults, percentile
+from scripts.loadtest.fake_kapso import KapsoRecorder, create_fake_kapso_app, make_png
+from scripts.loadtest.fake_llm import RESPONDERS, LLMRecorder, Prompt, create_fake_llm_app, item_matching
+from scripts.loadtest.scenarios import SCENARIOS, SimulatedUser, parse_mix
+
+
+def _fake_llm(recorder: LLMRecorder) -> ChatOpenAI:
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(create_fake_llm_app(recorder)))
+    return ChatOpenAI(model="gpt-4o-mini", api_key="test", base_url="http://fake-llm/v1", http_async_client=client)
+
+
+def _image_message(document_type: str) -> HumanMessage:
+    url = "data:image/png;base64," + base64.b64encode(make_png(document_type)).decode()
+    return HumanMessage(content=[{"type": "text", "text": "Analiza"}, {"type": "image_url", "image_url": {"url": url}}])
+
+
+async def test_fake_llm_classifies_tagged_images() -> None:
+    model = _fake_llm(LLMRecorder()).with_structured_output(ClassificationSchema)
+
+    assert (await model.ainvoke([_image_message("receipt")])).document_type == DocumentType.RECEIPT
+    assert (await model.ainvoke([_image_message("transfer")])).document_type == DocumentType.TRANSFER
+
+
+@pytest.mark.parametrize("method", ["json_schema", "function_calling"])
+async def test_fake_llm_outputs_are_schema_valid(method: str) -> None:
+    recorder = LLMRecorder()
+    llm = _fake_llm(recorder)
+    cases = [
+        (ReceiptLLMSchema, [_image_message("receipt")]),
+        (TransferLLMSchema, [_image_message("transfer")]),
+        (AgentActionSchema, [SystemMessage(content="prompt"), HumanMessage(content="crear sesión cena")]),
+        (PaymentIntent, "pagué la pizza"),
+        (PaymentMethodInfo, "Banco Estado, cuenta RUT 12345678"),
+    ]
+
+    results = [await llm.with_structured_output(schema, method=method).ainvoke(prompt) for schema, prompt in cases]
+
+    assert results[2].action == ActionType.CREATE_SESSION
+    assert results[3].is_payment and results[3].items_paid[0].item_description == "pizza"
+    assert results[4].is_payment_method
+    assert sum(recorder.calls.values()) == len(cases)
+    assert set(recorder.calls) < set(RESPONDERS)
+
+
+def test_fake_llm_matches_intents_to_unpaid_items() -> None:
+    prompt = Prompt(
+        [
+            {
+                "role": "user",
+                "content": "- pizza (cantidad: 1)\n- sushi (cantidad: 1)\n"
+                "- 1: Descripción: 'Pizza', Precio: $12000.00, Total: $13200.00, Pagado: True\n"
+                "- 2: Descripción: 'Pizza', Precio: $12000.00, Total: $13200.00, Pagado: False",
+            }
+        ]
+    )
+
+    matches = item_matching(prompt)["matches"]
+
+    assert [match["matched_item_number"] for match in matches] == [2, None]
+
+
+async def test_fake_llm_rejects_unknown_schema() -> None:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(create_fake_llm_app(LLMRecorder()))) as client:
+        response_format = {"type": "json_schema", "json_schema": {"name": "Nope"}}
+        body = {"model": "gpt-4o-mini", "messages": [], "response_format": response_format}
+        response = await client.post("http://fake-llm/v1/chat/completions", json=body)
+
+    assert response.status_code == 400
+
+
+async def test_fake_kapso_records_sends_and_injects_errors() -> None:
+    recorder = KapsoRecorder()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(create_fake_kapso_app(recorder))) as client:
+        ok = await client.post("http://kapso/123/messages", json={"to": "+56911111111", "type": "text"})
+        recorder.error_rate = 1.0
+        failed = await client.post("http://kapso/123/messages", json={"to": "+56911111111", "type": "text"})
+        media = await client.get("http://kapso/media/receipt.png")
+
+    assert (ok.status_code, failed.status_code) == (200, 500)
+    assert recorder.stats() == {"sends": 1, "injected_errors": 1, "recipients": 1}
+    assert media.headers["content-type"] == "image/png"
+
+
+def test_scenarios_build_valid_webhook_payloads() -> None:
+    user = SimulatedUser("+56900000001", "Carga")
+    for name, scenario in SCENARIOS.items():
+        payload = KapsoWebhookMessageReceived.model_validate(scenario(user, "http://kapso/media"))
+        assert payload.message.sender == user.phone_number, name
+
+    assert parse_mix("text=3,voice=1") == {"text": 3.0, "voice": 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("fax=1")
+
+
+def test_load_results_percentiles() -> None:
+    results = LoadResults()
+    for index in range(1, 101):
+        results.record("text", index / 1000, "500" if index == 100 else None)
+
+    summary = results.summary(elapsed=10.0)
+
+    assert percentile([], 50) == 0.0
+    assert summary["achieved_rps"] == 10.0
+    assert summary["total"]["p50_ms"] == 50.0
+    assert summary["total"]["p99_ms"] == 99.0
+    assert summary["scenarios"]["text"]["error_kinds"] == {"500": 1}
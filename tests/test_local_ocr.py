@@ -0,0 +1,61 @@
+"""Tests for the local OCR pre-pass rules."""
+
+from app.models.receipt import ReceiptDocumentType
+from app.services.local_ocr import LocalOCRResult, analyze_text, parse_amount
+
+TRANSFER_TEXT = """Transferencia exitosa
+Comprobante de transferencia
+Destinatario: Ana Pérez
+Banco Estado
+Monto transferido: $13.200
+Número de operación 123456789
+"""
+
+RECEIPT_TEXT = """Restaurante La Esquina
+Mesa 4   Garzón: Pedro
+Pizza napolitana      $12.900
+Cerveza artesanal      $4.500
+Cerveza artesanal      $4.500
+Tiramisú               $5.200
+Subtotal              $27.100
+Propina 10%            $2.710
+Total                 $29.810
+"""
+
+
+def test_parse_amount() -> None:
+    assert parse_amount("12.500") == 12500
+    assert parse_amount("12.500,50") == 12500.5
+    assert parse_amount("990") == 990
+
+
+def test_transfer_is_read_without_the_vision_model() -> None:
+    result = analyze_text(TRANSFER_TEXT)
+
+    assert result.document_type == ReceiptDocumentType.TRANSFER
+    assert result.amounts == [13200]
+    transfer = result.transfer_extraction()
+    assert transfer is not None
+    assert (transfer.recipient, transfer.amount) == ("Ana Pérez", 13200)
+
+
+def test_receipt_is_classified_but_not_extracted() -> None:
+    result = analyze_text(RECEIPT_TEXT)
+
+    assert result.document_type == ReceiptDocumentType.RECEIPT
+    assert result.transfer_extraction() is None
+
+
+def test_inconclusive_text_escalates() -> None:
+    assert analyze_text("").document_type is None
+    mixed = "Comprobante de transferencia\n$1.000\n$2.000\n$3.000\n$4.000\nPropina $500"
+    assert analyze_text(mixed).document_type is None
+
+
+def test_transfer_needs_one_amount_and_a_recipient() -> None:
+    transfer = ReceiptDocumentType.TRANSFER
+
+    assert LocalOCRResult("", transfer, [13200, 1500], "Ana").transfer_extraction() is None
+    assert LocalOCRResult("", transfer, [13200], None).transfer_extraction() is None
+    assert LocalOCRResult("", transfer, [0], "Ana").transfer_extraction() is None
+    assert LocalOCRResult("", None, [13200], "Ana").transfer_extraction() is None
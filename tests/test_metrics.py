@@ -0,0 +1,101 @@
+"""Test Prometheus metrics."""
+
+import threading
+import uuid
+from types import SimpleNamespace
+
+import pytest
+import requests
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from app.core.metrics import KAPSO_REQUEST_DURATION, KAPSO_REQUESTS, LLM_REQUESTS, LLM_TOKENS, MetricsRegistry
+from app.main import app
+from app.services.agent.prompt import AGENT_PROMPT_VERSION
+from app.services.llm_callbacks import LLMMetricsCallback
+from app.utils.cache import TTLCache
+
+
+def test_registry_renders_text_format() -> None:
+    """Test counters and histograms in the Prometheus text exposition format."""
+    registry = MetricsRegistry()
+    requests = registry.counter("test_requests", "Requests", ("route",))
+    latency = registry.histogram("test_latency_seconds", "Latency", ("route",))
+    requests.inc('/a"b')
+    requests.inc('/a"b')
+    latency.observe(0.2, "/a")
+
+    text = registry.render()
+
+    assert 'test_requests_total{route="/a\\"b"} 2.0' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 0' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="0.25"} 1' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 1' in text
+    assert 'test_latency_seconds_count{route="/a"} 1' in text
+
+
+def test_llm_callback_records_calls_and_tokens() -> None:
+    """Test that LLM calls are counted with their token usage."""
+    callback = LLMMetricsCallback("test_schema")
+    run_id = uuid.uuid4()
+    message = AIMessage(content="", usage_metadata={"input_tokens": 120, "output_tokens": 30, "total_tokens": 150})
+
+    callback.on_chat_model_start({}, [[]], run_id=run_id, metadata={"ls_model_name": "gpt-4o-mini"})
+    callback.on_llm_end(LLMResult(generations=[[ChatGeneration(message=message)]]), run_id=run_id)
+
+    assert LLM_REQUESTS.value("test_schema", "gpt-4o-mini", "ok") == 1
+    assert LLM_TOKENS.value("test_schema", "gpt-4o-mini", "input") == 120
+    assert LLM_TOKENS.value("test_schema", "gpt-4o-mini", "output") == 30
+
+
+async def test_concurrent_kapso_sends_are_counted_on_the_event_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that sends running in worker threads update the Kapso metrics from the event loop thread."""
+    from app.integrations import kapso
+
+    observe_threads: set[int] = set()
+    observe = KAPSO_REQUEST_DURATION.observe
+
+    def request(method: str, url: str, json: dict, **kwargs: object) -> SimpleNamespace:
+        status_code = 500 if json["to"].endswith("0") else 200
+
+        def raise_for_status() -> None:
+            if status_code >= 400:
+                raise requests.HTTPError(f"{status_code} Server Error")
+
+        return SimpleNamespace(status_code=status_code, raise_for_status=raise_for_status)
+
+    def observing(value: float, *labels: str) -> None:
+        observe_threads.add(threading.get_ident())
+        observe(value, *labels)
+
+    monkeypatch.setattr(kapso.settings, "KAPSO_URL", "http://kapso")
+    monkeypatch.setattr(kapso.settings, "KAPSO_PHONE_NUMBER_ID", "123")
+    monkeypatch.setattr(kapso.requests, "request", request)
+    monkeypatch.setattr(KAPSO_REQUEST_DURATION, "observe", observing)
+    ok, failed = KAPSO_REQUESTS.value("messages", "200"), KAPSO_REQUESTS.value("messages", "500")
+
+    await kapso.send_text_messages_concurrently([(f"+5691111111{i}", "hola") for i in range(3)])
+
+    assert KAPSO_REQUESTS.value("messages", "200") == ok + 2
+    assert KAPSO_REQUESTS.value("messages", "500") == failed + 1
+    assert observe_threads == {threading.get_ident()}
+
+
+def test_metrics_endpoint_reports_routes_and_caches() -> None:
+    """Test the /metrics endpoint."""
+    cache: TTLCache[int] = TTLCache(maxsize=10, ttl=60, name="test_cache")
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+    client = TestClient(app)
+    client.get("/metrics")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_request_duration_seconds_count{method="GET",route="/metrics",status="200"}' in response.text
+    assert 'cache_requests_total{cache="test_cache",result="hit"} 1.0' in response.text
+    assert 'cache_requests_total{cache="test_cache",result="miss"} 1.0' in response.text
+    assert f'agent_prompt_info{{version="{AGENT_PROMPT_VERSION}"}} 1.0' in response.text
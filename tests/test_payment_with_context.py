@@ -0,0 +1,98 @@
+"""Tests for the concurrent transfer-with-context flow."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.logic import message_receiver
+from app.models.kapso import KapsoImage
+from app.models.payment_matching import ItemMatch, PaymentIntent
+from app.models.receipt import DocumentExtraction, ReceiptDocumentType, TransferExtraction
+
+STEP_SECONDS = 0.1
+
+
+class FakeFlow:
+    """Records what the flow did, with OCR and intent extraction taking STEP_SECONDS each by default."""
+
+    def __init__(self, document_type: ReceiptDocumentType) -> None:
+        self.document_type = document_type
+        self.events: list[str] = []
+        self.matched_with: list | None = None
+        self.intent_cancelled = False
+        self.intent_seconds = STEP_SECONDS
+
+    async def download(self, link: str) -> tuple[bytes, str]:
+        return b"image", "image/png"
+
+    async def scan(self, content: bytes, mime_type: str) -> DocumentExtraction:
+        await asyncio.sleep(STEP_SECONDS)
+        self.events.append("scanned")
+        if self.document_type == ReceiptDocumentType.TRANSFER:
+            transfer = TransferExtraction(recipient="Ana", amount=13200)
+            return DocumentExtraction(document_type=self.document_type, transfer=transfer)
+        return DocumentExtraction(document_type=self.document_type, receipt=None)
+
+    async def extract_intent(self, message: str) -> PaymentIntent:
+        try:
+            await asyncio.sleep(self.intent_seconds)
+        except asyncio.CancelledError:
+            self.intent_cancelled = True
+            raise
+        self.events.append("intent")
+        return PaymentIntent(items_paid=[ItemMatch(item_description="pizza")])
+
+    async def has_session(self, db_session: object, sender: str) -> bool:
+        self.events.append("prefetch")
+        return True
+
+    async def unpaid_items(self, db_session: object, sender: str) -> list:
+        return ["pizza"]
+
+    async def match(self, db_session, sender, intent, amount, available_items=None):
+        self.matched_with = available_items
+        return SimpleNamespace(matched_items=[])
+
+
+@pytest.fixture
+def flow(monkeypatch: pytest.MonkeyPatch) -> FakeFlow:
+    # The payment services build their OpenAI clients on import
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test")
+    from app.services import payment_agent, payment_matcher
+
+    flow = FakeFlow(ReceiptDocumentType.TRANSFER)
+    monkeypatch.setattr(message_receiver, "download_image_from_url", flow.download)
+    monkeypatch.setattr(message_receiver, "scan_receipt", flow.scan)
+    monkeypatch.setattr(message_receiver, "check_user_has_active_session", flow.has_session)
+    monkeypatch.setattr(message_receiver, "send_text_message", lambda *args: None)
+    monkeypatch.setattr(payment_agent, "extract_payment_intent_from_message", flow.extract_intent)
+    monkeypatch.setattr(payment_matcher, "match_payment_to_items", flow.match)
+    monkeypatch.setattr(payment_matcher.payment_matcher, "get_session_unpaid_items", flow.unpaid_items)
+    return flow
+
+
+async def test_ocr_and_intent_run_concurrently(flow: FakeFlow) -> None:
+    started_at = time.perf_counter()
+    await message_receiver.handle_payment_with_context(None, KapsoImage(link="http://x"), "+569", "pagué la pizza")
+    elapsed = time.perf_counter() - started_at
+
+    assert elapsed < 1.8 * STEP_SECONDS
+    assert flow.events[0] == "prefetch"
+    assert sorted(flow.events[1:]) == ["intent", "scanned"]
+    assert flow.matched_with == ["pizza"]
+
+
+async def test_intent_is_cancelled_for_receipts(flow: FakeFlow, monkeypatch: pytest.MonkeyPatch) -> None:
+    async def handle_receipt(db_session: object, receipt: object, sender: str) -> None:
+        flow.events.append("receipt")
+
+    monkeypatch.setattr(message_receiver, "handle_receipt", handle_receipt)
+    flow.document_type = ReceiptDocumentType.RECEIPT
+    flow.intent_seconds = 10 * STEP_SECONDS
+    await message_receiver.handle_payment_with_context(None, KapsoImage(link="http://x"), "+569", "pagué la pizza")
+
+    assert flow.intent_cancelled
+    assert flow.events == ["prefetch", "scanned", "receipt"]
@@ -0,0 +1,66 @@
+"""Test the opt-in request profiler."""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.core.profiling import create_profile_token, list_profiles, profile_call, should_profile
+from app.routers.admin import router as admin_router
+
+
+def _busy_handler() -> str:
+    deadline = time.perf_counter() + 0.1
+    while time.perf_counter() < deadline:
+        pass
+    return "done"
+
+
+async def _handler() -> str:
+    return _busy_handler()
+
+
+@pytest.fixture
+def profiling_settings(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(settings, "PROFILING_INTERVAL_MS", 1.0)
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILING_MAX_FILES", 2)
+
+
+def test_only_signed_requests_are_profiled(profiling_settings: None) -> None:
+    """Test that profiling needs a valid token when not sampling."""
+    assert should_profile(create_profile_token())
+    assert not should_profile("not-a-token")
+    assert not should_profile(None)
+
+
+@pytest.mark.asyncio
+async def test_profile_call_saves_collapsed_stacks(profiling_settings: None) -> None:
+    """Test that profiles contain the sampled stacks and old ones are pruned."""
+    for _ in range(3):
+        assert await profile_call("GET", "/api/v1/items/", _handler()) == "done"
+        await asyncio.sleep(0.001)  # distinct timestamps
+
+    profiles = list_profiles()
+    assert len(profiles) == 2
+    assert "_GET_api-v1-items_" in profiles[0]["name"]
+
+    client = TestClient(FastAPI())
+    client.app.include_router(admin_router)
+    assert client.get("/admin/profiles").status_code == 401
+    headers = {"X-Profile-Token": create_profile_token()}
+    assert [p["name"] for p in client.get("/admin/profiles", headers=headers).json()] == [
+        p["name"] for p in profiles
+    ]
+    body = client.get(f"/admin/profiles/{profiles[0]['name']}", headers=headers).text
+    assert "_busy_handler" in body
+    assert body.splitlines()[0].rsplit(" ", 1)[1].isdigit()
+    # Names that reach the handler (an encoded "/" would already fail routing) must not escape PROFILING_DIR
+    for name in ["%2E%2E", "..%5Csecret"]:
+        response = client.get(f"/admin/profiles/{name}", headers=headers)
+        assert (response.status_code, response.json()["detail"]) == (404, "Profile not found")
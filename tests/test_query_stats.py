@@ -0,0 +1,51 @@
+"""Test per-request statement counting and slow query logging."""
+
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.config import settings
+from app.core.metrics import DB_QUERY_HEAVY_REQUESTS
+from app.database.query_stats import install_query_hooks, redact_parameters, report_request_queries, track_queries
+
+
+def test_redact_parameters_hides_values() -> None:
+    """Test that logged parameters only show their types."""
+    assert redact_parameters({"phone_number_1": "+56911111111"}) == {"phone_number_1": "<str>"}
+    assert redact_parameters(("+56911111111", 3)) == ("<str>", "<int>")
+    assert redact_parameters([{"a": 1}, {"a": 2}]) == "<2 rows>"
+
+
+def test_statements_are_counted_and_slow_ones_logged(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test that statements run inside track_queries are counted."""
+    engine = create_engine("sqlite://")
+    install_query_hooks(engine)
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 1e-6)
+
+    with caplog.at_level(logging.WARNING, logger="app.database.query_stats"), track_queries() as stats:
+        with engine.connect() as connection:
+            for _ in range(3):
+                connection.execute(text("SELECT :phone"), {"phone": "+56911111111"})
+
+    assert stats.count == 3
+    assert stats.slow == 3
+    assert stats.most_repeated() == ("SELECT ?", 3)
+    assert "Slow query" in caplog.text
+    assert "+56911111111" not in caplog.text
+
+
+def test_query_heavy_requests_are_flagged(monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture) -> None:
+    """Test that requests over DB_QUERY_COUNT_WARNING statements are reported."""
+    monkeypatch.setattr(settings, "DB_QUERY_COUNT_WARNING", 2)
+    with track_queries() as stats:
+        for _ in range(3):
+            stats.record("SELECT users.id FROM users WHERE users.phone_number = $1", 0.001, slow=False)
+
+    with caplog.at_level(logging.WARNING, logger="app.database.query_stats"):
+        report_request_queries(stats, "/test/route")
+
+    assert "Possible N+1: /test/route ran 3 queries (most repeated 3x" in caplog.text
+    assert DB_QUERY_HEAVY_REQUESTS.value("/test/route") == 1
@@ -0,0 +1,74 @@
+"""Tests for read replica routing with read-your-writes."""
+
+import uuid
+from collections.abc import Iterator
+
+import pytest
+from starlette.requests import Request
+
+from app.database import db_manager
+from app.routers.deps import get_read_db
+
+
+class FakeFactory:
+    """Session factory recording which database was used."""
+
+    def __init__(self, name: str, used: list[str]) -> None:
+        self.name = name
+        self.used = used
+
+    def __call__(self) -> "FakeFactory":
+        return self
+
+    async def __aenter__(self) -> str:
+        self.used.append(self.name)
+        return self.name
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+
+@pytest.fixture
+def used(monkeypatch: pytest.MonkeyPatch) -> Iterator[list[str]]:
+    used: list[str] = []
+    monkeypatch.setattr(db_manager, "_sessionmaker", FakeFactory("primary", used))
+    monkeypatch.setattr(db_manager, "_read_sessionmaker", FakeFactory("replica", used))
+    yield used
+    db_manager._recent_writers.clear()
+
+
+async def _read(session_id: uuid.UUID | str, headers: list[tuple[bytes, bytes]] = ()) -> None:
+    request = Request({"type": "http", "headers": list(headers), "path_params": {"session_id": str(session_id)}})
+    async for _ in get_read_db(request):
+        pass
+
+
+async def test_written_sessions_are_read_from_the_primary(used: list[str]) -> None:
+    written, untouched = uuid.uuid4(), uuid.uuid4()
+    db_manager.mark_session_write(written)
+
+    await _read(written)
+    await _read(untouched)
+
+    assert used == ["primary", "replica"]
+
+
+async def test_session_ids_match_in_any_form(used: list[str]) -> None:
+    written = uuid.uuid4()
+    db_manager.mark_session_write(str(written).upper())
+
+    await _read(str(written).upper())
+    await _read(written.hex)
+    await _read("not-a-uuid")
+    assert db_manager.read_sessionmaker(session_id=written.hex.upper()).name == "primary"
+
+    assert used == ["primary", "primary", "replica"]
+
+
+async def test_recent_writers_are_read_from_the_primary(used: list[str]) -> None:
+    db_manager.mark_write("+56911111111")
+
+    await _read(uuid.uuid4(), [(b"x-user-phone", b"+56911111111")])
+    await _read(uuid.uuid4(), [(b"x-user-phone", b"+56922222222")])
+
+    assert used == ["primary", "replica"]
@@ -0,0 +1,108 @@
+"""Regression tests of the WhatsApp message flows, replaying recorded LLM outputs.
+
+The LLM outputs under ``tests/fixtures/llm`` were recorded from the load
+test's fake LLM. After changing a prompt, re-record them against a running
+OpenAI-compatible server:
+
+    LLM_FIXTURES_MODE=record OPENAI_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=x \
+        pytest tests/test_replay_flows.py
+"""
+
+import random
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.logic import message_receiver
+from app.models.kapso import KapsoBody, KapsoImage
+from app.services.llm_fixtures import use_llm_fixtures
+from app.utils.messages import SESSION_CREATED_MESSAGE
+from scripts.loadtest.fake_kapso import make_png
+
+# One event loop for the module: when recording, the OpenAI clients keep connections across tests
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "llm"
+SENDER = "+56900000000"
+
+
+@pytest.fixture
+def replay(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Replay recorded LLM outputs and collect the replies sent to the user."""
+    # The payment services build their OpenAI clients on import
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", settings.OPENAI_API_KEY or "test")
+    from app.services.agent.processor import clear_command_cache
+
+    clear_command_cache()
+    sent: list[str] = []
+    monkeypatch.setattr(message_receiver, "send_text_message", lambda sender, message: sent.append(message))
+    mode = "replay" if settings.LLM_FIXTURES_MODE == "off" else settings.LLM_FIXTURES_MODE
+    with use_llm_fixtures(mode, FIXTURES_DIR):
+        yield sent
+
+
+async def test_text_message_creates_a_session(replay: list[str], monkeypatch: pytest.MonkeyPatch) -> None:
+    created: list[str] = []
+
+    async def create_session(db_session: object, description: str, sender: str) -> SimpleNamespace:
+        created.append(description)
+        return SimpleNamespace(id=uuid.uuid4())
+
+    async def has_session(db_session: object, sender: str) -> bool:
+        return False
+
+    monkeypatch.setattr(message_receiver, "check_user_has_active_session", has_session)
+    monkeypatch.setattr(message_receiver, "create_session", create_session)
+
+    await message_receiver.handle_text_message(None, KapsoBody(body="crear sesión cena de Carga 0"), SENDER)
+
+    assert len(created) == 1
+    assert replay[0] == SESSION_CREATED_MESSAGE
+
+
+async def test_transfer_with_context_pays_the_matched_item(
+    replay: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from app.database.sql import payment_processing
+    from app.services import payment_matcher
+
+    # Database IDs differ from the recording: the item matching prompt must not depend on them
+    first_id = random.randrange(1, 1_000_000)
+    unpaid = [
+        SimpleNamespace(id=first_id + index, description=name, unit_price=price, total=price, is_paid=False)
+        for index, (name, price) in enumerate([("Pizza", 12000.0), ("Cerveza", 4500.0)])
+    ]
+    processed = []
+
+    async def download(link: str) -> tuple[bytes, str]:
+        return make_png("transfer"), "image/png"
+
+    async def has_session(db_session: object, sender: str) -> bool:
+        return True
+
+    async def unpaid_items(db_session: object, sender: str) -> list:
+        return unpaid
+
+    async def process_payment_result(db_session, payment_match, sender, payment_description):
+        processed.append(payment_match)
+        return [], None
+
+    async def get_payment_summary(db_session, paid_items, remainder_item) -> str:
+        return "resumen"
+
+    monkeypatch.setattr(message_receiver, "download_image_from_url", download)
+    monkeypatch.setattr(message_receiver, "check_user_has_active_session", has_session)
+    monkeypatch.setattr(payment_matcher.payment_matcher, "get_session_unpaid_items", unpaid_items)
+    monkeypatch.setattr(payment_processing, "process_payment_result", process_payment_result)
+    monkeypatch.setattr(payment_processing, "get_payment_summary", get_payment_summary)
+
+    image = KapsoImage(link="http://kapso/transfer.png")
+    await message_receiver.handle_payment_with_context(None, image, SENDER, "pagué la pizza")
+
+    assert len(processed) == 1
+    assert [(item.item_id, item.description) for item in processed[0].matched_items] == [(first_id, "Pizza")]
+    assert processed[0].actual_amount == 12000.0
+    assert replay == ["resumen"]
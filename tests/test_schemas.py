@@ -0,0 +1,46 @@
+"""Test API response schemas."""
+
+import json
+from decimal import Decimal
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.api.v1.schemas import ItemOut
+from app.database.models import Item, User
+
+
+def _item(**overrides: object) -> Item:
+    fields = {
+        "id": 1,
+        "invoice_id": 2,
+        "debtor_id": 3,
+        "unit_price": Decimal("1000.00"),
+        "paid_amount": Decimal("0.00"),
+        "tip": Decimal("0.1000"),
+        "total": Decimal("1100.00"),
+        "is_paid": False,
+        "payment_id": None,
+        "description": "Pizza",
+    }
+    fields.update(overrides)
+    return Item(**fields)
+
+
+def test_item_out_serializes_amounts_as_numbers() -> None:
+    """Numeric columns are rendered as JSON numbers, not strings."""
+    data = json.loads(ItemOut.model_validate(_item()).model_dump_json())
+    assert data["unit_price"] == 1000.0
+    assert data["tip"] == 0.1
+    assert data["total"] == 1100.0
+    assert data["debtor"] is None
+
+
+def test_item_out_includes_loaded_debtor_only() -> None:
+    """The debtor is included when eagerly loaded and skipped otherwise."""
+    loaded = _item()
+    set_committed_value(loaded, "debtor", User(id=3, name="Alice", phone_number="+1234567890"))
+    items = TypeAdapter(list[ItemOut]).validate_python([loaded, _item(id=2)])
+    assert items[0].debtor is not None
+    assert items[0].debtor.name == "Alice"
+    assert items[1].debtor is None
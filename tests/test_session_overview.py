@@ -0,0 +1,31 @@
+"""Test session overview aggregation."""
+
+from decimal import Decimal
+
+from app.database.models import Invoice, Item, User
+from app.database.sql.session_overview import compute_session_balances
+
+
+def test_compute_session_balances() -> None:
+    """Unpaid items assigned to others count as debts to the invoice payer."""
+    alice = User(id=1, name="Alice", phone_number="+1")
+    bob = User(id=2, name="Bob", phone_number="+2")
+    carol = User(id=3, name="Carol", phone_number="+3")
+    invoice = Invoice(
+        id=10,
+        payer_id=alice.id,
+        items=[
+            Item(id=1, debtor_id=bob.id, total=Decimal("30.00"), paid_amount=Decimal("0"), is_paid=False),
+            Item(id=2, debtor_id=carol.id, total=Decimal("20.00"), paid_amount=Decimal("20.00"), is_paid=True),
+            Item(id=3, debtor_id=alice.id, total=Decimal("15.00"), paid_amount=Decimal("0"), is_paid=False),
+            Item(id=4, debtor_id=None, total=Decimal("5.00"), paid_amount=Decimal("0"), is_paid=False),
+        ],
+    )
+
+    balances = compute_session_balances([invoice], {1: alice, 2: bob, 3: carol})
+
+    assert balances == [
+        {"user_id": 1, "name": "Alice", "owes": 0.0, "owed": 30.0, "balance": 30.0},
+        {"user_id": 2, "name": "Bob", "owes": 30.0, "owed": 0.0, "balance": -30.0},
+        {"user_id": 3, "name": "Carol", "owes": 0.0, "owed": 0.0, "balance": 0.0},
+    ]
@@ -0,0 +1,95 @@
+"""Test per-stage latency instrumentation."""
+
+import asyncio
+import logging
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import timing
+from app.core.timing import Histogram, message_trace, span, stage_histograms, timed
+
+
+def test_histogram_buckets_and_quantiles() -> None:
+    """Test that observations land in the first bucket at or above them."""
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    assert histogram.cumulative_counts() == [(0.1, 2), (1.0, 3), (float("inf"), 4)]
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.75) == 1.0
+    assert Histogram().quantile(0.5) is None
+
+
+@pytest.mark.asyncio
+async def test_message_trace_collects_stage_breakdown(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that spans and timed functions are attributed to the active message."""
+
+    @timed("test.async_stage")
+    async def async_stage() -> str:
+        await asyncio.sleep(0)
+        return "done"
+
+    @timed("test.sync_stage")
+    def sync_stage() -> None:
+        pass
+
+    with caplog.at_level(logging.INFO, logger="app.core.timing"):
+        with message_trace("text", message_id="wamid.1") as trace:
+            assert await async_stage() == "done"
+            sync_stage()
+            sync_stage()
+            with span("test.block"):
+                pass
+
+    assert set(trace.stages) == {"test.async_stage", "test.sync_stage", "test.block"}
+    assert trace.stage_calls["test.sync_stage"] == 2
+    assert stage_histograms["message.text"].count >= 1
+
+    summary = caplog.records[-1].message_trace
+    assert summary["message_id"] == "wamid.1"
+    assert summary["status"] == "ok"
+    assert summary["stage_calls"] == {"test.sync_stage": 2}
+
+
+def test_span_records_failures() -> None:
+    """Test that a stage is recorded and the trace marked as failed on errors."""
+    before = stage_histograms["test.failing"].count if "test.failing" in stage_histograms else 0
+    with pytest.raises(RuntimeError):
+        with message_trace("image") as trace, span("test.failing"):
+            raise RuntimeError("boom")
+
+    assert stage_histograms["test.failing"].count == before + 1
+    assert "test.failing" in trace.stages
+
+
+@pytest.mark.asyncio
+async def test_concurrent_kapso_sends_are_recorded_on_the_event_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that sends running in worker threads are timed from the event loop thread."""
+    from app.integrations import kapso
+
+    request_threads: set[int] = set()
+    record_threads: set[int] = set()
+    record_stage = timing.record_stage
+
+    def request(method: str, url: str, **kwargs: object) -> SimpleNamespace:
+        request_threads.add(threading.get_ident())
+        return SimpleNamespace(status_code=200, raise_for_status=lambda: None)
+
+    def recording(stage: str, seconds: float) -> None:
+        record_threads.add(threading.get_ident())
+        record_stage(stage, seconds)
+
+    monkeypatch.setattr(kapso.settings, "KAPSO_URL", "http://kapso")
+    monkeypatch.setattr(kapso.settings, "KAPSO_PHONE_NUMBER_ID", "123")
+    monkeypatch.setattr(kapso.requests, "request", request)
+    monkeypatch.setattr(timing, "record_stage", recording)
+
+    with message_trace("text") as trace:
+        await kapso.send_text_messages_concurrently([(f"+5691111111{i}", "hola") for i in range(3)])
+
+    assert trace.stage_calls["kapso.send"] == 3
+    assert threading.get_ident() not in request_threads
+    assert record_threads == {threading.get_ident()}